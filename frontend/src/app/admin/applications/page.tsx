@@ -330,7 +330,8 @@ export default function AdminApplicationsPage() {
                       style={downloadButtonStyle}
                       onClick={() => {
                         if (app.cv) {
-                          window.open(`http://localhost:8000${app.cv}`, '_blank');
+                          // The API's permission-checked download URL (uses the admin session).
+                          window.open(app.cv, '_blank');
                         }
                       }}
                     >
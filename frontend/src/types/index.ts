@@ -59,7 +59,7 @@ export interface Application {
   candidate_email: string;
   phone_number: string;
   candidate_message?: string;
-  cv: string; // File URL
+  cv: string | null; // /api/applications/<id>/cv/ download URL
   status: 'submitted' | 'reviewing' | 'interview' | 'rejected' | 'accepted';
   rating?: number;
   notes?: string;
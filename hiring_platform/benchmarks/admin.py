@@ -0,0 +1,84 @@
+"""
+Admin changelists at volume: the ``ScalableAdmin`` settings against Django's
+defaults (exact ``COUNT(*)``, the extra "N total" count, no joins for the
+foreign keys shown).
+
+Seeds with ``seed_data``, runs ``ANALYZE`` so the database has row
+estimates, then requests each changelist as a superuser.
+
+    python -m benchmarks.admin --jobs 100000 --applications 1000000
+"""
+import argparse
+from unittest import mock
+
+from . import common
+from .api import measure
+
+CHANGELISTS = {
+    'jobs': '/admin/jobs_api/job/',
+    'jobs-page-200': '/admin/jobs_api/job/?p=200',
+    'jobs-open': '/admin/jobs_api/job/?status__exact=open',
+    'applications': '/admin/jobs_api/application/',
+    'applications-rejected': '/admin/jobs_api/application/?status__exact=rejected',
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--companies', type=int, default=2000)
+    parser.add_argument('--jobs', type=int, default=100_000)
+    parser.add_argument('--applications', type=int, default=1_000_000)
+    parser.add_argument('--requests', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--keepdb', action='store_true')
+    args = parser.parse_args()
+
+    common.setup()
+    from django.contrib.admin import ShowFacets
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from django.core.paginator import Paginator
+    from django.db import connection
+    from django.test import Client, override_settings
+
+    from jobs_api.admin import ApplicationAdmin, JobAdmin, ScalableAdmin
+    from jobs_api.models import Job
+
+    with common.test_database(keepdb=args.keepdb), override_settings(DEBUG=False):
+        if not Job.objects.exists():
+            call_command(
+                'seed_data', companies=args.companies, jobs=args.jobs, applications=args.applications,
+                saved_jobs=0, interviews=0, verbosity=0,
+            )
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+        user, _ = User.objects.get_or_create(username='bench', defaults={'is_staff': True, 'is_superuser': True})
+        client = Client()
+        client.force_login(user)
+        # Django's defaults; it then only joins the non-null foreign keys it shows.
+        defaults = [
+            mock.patch.multiple(
+                ScalableAdmin, paginator=Paginator, show_full_result_count=True, show_facets=ShowFacets.ALLOW,
+            ),
+            *(mock.patch.object(admin, 'list_select_related', False) for admin in (JobAdmin, ApplicationAdmin)),
+        ]
+        results = {}
+        for mode, patches in (('default', defaults), ('scalable', [])):
+            for patch in patches:
+                patch.start()
+            try:
+                for name, path in CHANGELISTS.items():
+                    results[name, mode] = measure(client, path, args.requests, args.warmup)
+            finally:
+                for patch in patches:
+                    patch.stop()
+
+    print(f'{args.jobs} jobs, {args.applications} applications')
+    print(f'{"changelist":<24} {"default p50":>12} {"queries":>8} {"scalable p50":>13} {"queries":>8}')
+    for name in CHANGELISTS:
+        old, new = results[name, 'default'], results[name, 'scalable']
+        print(f'{name:<24} {old["p50_ms"]:>12} {old["queries"]:>8} {new["p50_ms"]:>13} {new["queries"]:>8}')
+
+
+if __name__ == '__main__':
+    main()
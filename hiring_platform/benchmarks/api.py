@@ -0,0 +1,214 @@
+"""
+Endpoint benchmark suite: latency percentiles, throughput and query counts.
+
+Seeds a throwaway database with ``seed_data`` (or reuses one with
+``--keepdb``), then requests each endpoint ``--requests`` times through
+Django's test client, in process, so numbers reflect the application rather
+than a server or network. The response cache and throttling are off unless
+``--cache``.
+
+Results are written as JSON (``--output``) with the run's settings, data
+sizes and git revision; ``--compare`` prints the change against an earlier
+file. Same seed and sizes give the same data, so runs are comparable.
+
+    python -m benchmarks.api --output before.json
+    python -m benchmarks.api --output after.json --compare before.json
+    python -m benchmarks.api --jobs 200000 --applications 1000000 --keepdb --only jobs
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from . import common
+
+# name -> path; {job}, {company}, {category} are filled from the seeded data.
+ENDPOINTS = {
+    'jobs-list': '/api/jobs/',
+    'jobs-list-deep-page': '/api/jobs/?page=50',
+    'jobs-filtered': '/api/jobs/?category={category}&status=open&salary_min=60000',
+    'jobs-search': '/api/jobs/?search=senior%20python',
+    'job-detail': '/api/jobs/{job}/',
+    'job-similar': '/api/jobs/{job}/similar/',
+    'recent-jobs': '/api/recent-jobs/',
+    'categories': '/api/categories/',
+    'category-jobs': '/api/categories/{category}/jobs/',
+    'companies': '/api/companies/',
+    'company-stats': '/api/companies/{company}/stats/',
+    'applications-list': '/api/applications/',
+    'applications-by-job': '/api/applications/?job={job}',
+    'applications-stats': '/api/applications/stats/',
+    'async-jobs-list': '/api/async/jobs/',
+}
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def seed(args):
+    from django.core.management import call_command
+
+    from jobs_api.models import Job
+
+    if args.keepdb and Job.objects.exists():
+        return
+    start = time.perf_counter()
+    call_command(
+        'seed_data', companies=args.companies, jobs=args.jobs, applications=args.applications,
+        saved_jobs=args.saved_jobs, interviews=args.interviews, seed=args.seed, verbosity=0,
+    )
+    print(f'seeded in {time.perf_counter() - start:.1f}s')
+
+
+def targets():
+    from django.db.models import Count
+
+    from jobs_api.models import Company, Job, JobCategory
+
+    # The busiest rows, so per-object endpoints see real volumes.
+    job = Job.objects.filter(status='open').order_by('-applications_count').values_list('pk', flat=True).first()
+    company = (
+        Company.objects.annotate(n=Count('jobs')).order_by('-n').values_list('pk', flat=True).first()
+    )
+    category = (
+        JobCategory.objects.annotate(n=Count('jobs')).order_by('-n').values_list('pk', flat=True).first()
+    )
+    return {'job': job, 'company': company, 'category': category}
+
+
+def measure(client, path, requests, warmup):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    for _ in range(warmup):
+        client.get(path)
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(path)
+    # Read now: later requests reset the connection's query log.
+    query_count = len(queries)
+    body = b''.join(response.streaming_content) if response.streaming else response.content
+    samples = []
+    start = time.perf_counter()
+    for _ in range(requests):
+        t = time.perf_counter()
+        client.get(path)
+        samples.append((time.perf_counter() - t) * 1000)
+    elapsed = time.perf_counter() - start
+    return {
+        'path': path,
+        'status': response.status_code,
+        'requests': requests,
+        'requests_per_s': round(requests / elapsed, 1),
+        'mean_ms': round(statistics.fmean(samples), 3),
+        'p50_ms': round(common.percentile(samples, 50), 3),
+        'p95_ms': round(common.percentile(samples, 95), 3),
+        'p99_ms': round(common.percentile(samples, 99), 3),
+        'queries': query_count,
+        'response_bytes': len(body),
+    }
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as handle:
+        baseline = json.load(handle)['results']
+    print(f'\nvs {baseline_path}')
+    print(f'{"endpoint":<24} {"p50 ms":>18} {"p99 ms":>18} {"queries":>10}')
+    for name, row in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+
+        def delta(key):
+            change = (row[key] - old[key]) / old[key] * 100 if old[key] else 0
+            return f'{old[key]:>7} → {row[key]:<7} {change:+.0f}%'
+        print(f'{name:<24} {delta("p50_ms"):>18} {delta("p99_ms"):>18} {old["queries"]:>4} → {row["queries"]}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--companies', type=int, default=1000)
+    parser.add_argument('--jobs', type=int, default=20_000)
+    parser.add_argument('--applications', type=int, default=100_000)
+    parser.add_argument('--saved-jobs', type=int, default=50_000)
+    parser.add_argument('--interviews', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--only', help='Comma-separated substrings of endpoint names to run.')
+    parser.add_argument('--cache', action='store_true', help='Leave the response cache on.')
+    parser.add_argument('--keepdb', action='store_true', help='Reuse bench.sqlite3 between runs.')
+    parser.add_argument('--output', help='Write results to this JSON file.')
+    parser.add_argument('--compare', help='Earlier results file to compare against.')
+    args = parser.parse_args()
+
+    common.setup()
+    from django.conf import settings
+    from django.db import connection
+    from django.test import Client, override_settings
+
+    from jobs_api.counters import view_counter
+
+    overrides = {
+        # DEBUG would log every query and skew the timings.
+        'DEBUG': False,
+        'REST_FRAMEWORK': {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_CLASSES': []},
+    }
+    if not args.cache:
+        overrides['API_CACHE_TIMEOUT'] = 0
+    only = args.only.split(',') if args.only else None
+    with common.test_database(keepdb=args.keepdb), override_settings(**overrides):
+        seed(args)
+        ids = targets()
+        client = Client()
+        results = {}
+        for name, path in ENDPOINTS.items():
+            if only and not any(part in name for part in only):
+                continue
+            results[name] = measure(client, path.format(**ids), args.requests, args.warmup)
+        vendor = connection.vendor
+        # Buffered job views would otherwise flush at exit, after the database is gone.
+        view_counter.flush()
+
+    print(f'{"endpoint":<24} {"req/s":>8} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"queries":>8} {"bytes":>8}')
+    for name, row in results.items():
+        flag = '' if row['status'] == 200 else f'  (HTTP {row["status"]})'
+        print(
+            f'{name:<24} {row["requests_per_s"]:>8} {row["p50_ms"]:>8} {row["p95_ms"]:>8} '
+            f'{row["p99_ms"]:>8} {row["queries"]:>8} {row["response_bytes"]:>8}{flag}'
+        )
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'database': vendor,
+            'response_cache': args.cache,
+            'data': {
+                'companies': args.companies, 'jobs': args.jobs, 'applications': args.applications,
+                'saved_jobs': args.saved_jobs, 'interviews': args.interviews, 'seed': args.seed,
+            },
+            'argv': sys.argv[1:],
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(report, handle, indent=2)
+        print(f'wrote {args.output}')
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
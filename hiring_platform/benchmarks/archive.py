@@ -0,0 +1,100 @@
+"""
+Job archival: hot-table row counts and listing latency before and after
+``archive_jobs``.
+
+Seeds with ``seed_data`` (older postings are more likely to be closed),
+measures the listing endpoints, archives closed jobs not updated for
+``--older-than`` days and measures again. The response cache and throttling
+are off.
+
+    python -m benchmarks.archive --jobs 50000 --applications 500000
+"""
+import argparse
+import time
+from io import StringIO
+
+from . import common
+from .api import measure
+
+ENDPOINTS = {
+    'jobs-list': '/api/jobs/',
+    'jobs-open': '/api/jobs/?status=open',
+    'jobs-search': '/api/jobs/?search=senior%20python',
+    'categories': '/api/categories/',
+    'applications-list': '/api/applications/',
+    'applications-stats': '/api/applications/stats/',
+    'company-stats': '/api/companies/{company}/stats/',
+}
+
+
+def hot_counts():
+    from jobs_api.models import Application, ApplicationDailyStat, Interview, Job, SavedJob
+
+    return {
+        model._meta.model_name: model.objects.count()
+        for model in (Job, Application, Interview, SavedJob, ApplicationDailyStat)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--companies', type=int, default=1000)
+    parser.add_argument('--jobs', type=int, default=20_000)
+    parser.add_argument('--applications', type=int, default=200_000)
+    parser.add_argument('--interviews', type=int, default=20_000)
+    parser.add_argument('--days', type=int, default=3 * 365, help='Spread of seeded posting dates.')
+    parser.add_argument('--older-than', type=int, default=180)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--warmup', type=int, default=5)
+    args = parser.parse_args()
+
+    common.setup()
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db.models import Count
+    from django.test import Client, override_settings
+
+    from jobs_api.counters import view_counter
+    from jobs_api.models import Company
+
+    overrides = {
+        'DEBUG': False,
+        'API_CACHE_TIMEOUT': 0,
+        'REST_FRAMEWORK': {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_CLASSES': []},
+    }
+    with common.test_database(), override_settings(**overrides):
+        call_command(
+            'seed_data', companies=args.companies, jobs=args.jobs, applications=args.applications,
+            interviews=args.interviews, days=args.days, verbosity=0,
+        )
+        company = Company.objects.annotate(n=Count('jobs')).order_by('-n').values_list('pk', flat=True).first()
+        client = Client()
+
+        def run():
+            return {
+                name: measure(client, path.format(company=company), args.requests, args.warmup)
+                for name, path in ENDPOINTS.items()
+            }
+
+        counts_before, before = hot_counts(), run()
+        start = time.perf_counter()
+        call_command(
+            'archive_jobs', older_than=args.older_than, batch_size=args.batch_size, stdout=StringIO(),
+        )
+        elapsed = time.perf_counter() - start
+        counts_after, after = hot_counts(), run()
+        view_counter.flush()
+
+    print(f'archive_jobs --older-than {args.older_than}: {elapsed:.1f}s')
+    print(f'{"table":<24} {"before":>10} {"after":>10}')
+    for name in counts_before:
+        print(f'{name:<24} {counts_before[name]:>10} {counts_after[name]:>10}')
+    print(f'\n{"endpoint":<24} {"p50 before":>12} {"p50 after":>12} {"change":>8}')
+    for name in ENDPOINTS:
+        old, new = before[name]['p50_ms'], after[name]['p50_ms']
+        print(f'{name:<24} {old:>12} {new:>12} {(new - old) / old * 100:>+7.0f}%')
+
+
+if __name__ == '__main__':
+    main()
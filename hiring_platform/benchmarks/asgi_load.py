@@ -0,0 +1,178 @@
+"""
+Read-path load test: WSGI (DRF viewsets) against ASGI (async views).
+
+Seeds a throwaway SQLite database, then for each server drives
+``--connections`` concurrent keep-alive connections for ``--seconds``,
+cycling through job list, job detail, category and recent-jobs reads, and
+reports requests/sec and latency percentiles. The response cache is off so
+every request reaches the database.
+
+Servers:
+
+* ``wsgi`` - Django's threaded WSGI server, DRF viewsets (thread per connection)
+* ``asgi-sync`` - uvicorn, DRF viewsets (each request via sync_to_async)
+* ``asgi-async`` - uvicorn, ``/api/async/`` views
+
+    python -m benchmarks.asgi_load --connections 500 --seconds 20
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from . import common
+from .search import seed
+
+SYNC_PATHS = ('/api/jobs/?page_size=20', '/api/jobs/{id}/', '/api/categories/', '/api/jobs/?status=open&page_size=10')
+ASYNC_PATHS = tuple(path.replace('/api/', '/api/async/', 1) for path in SYNC_PATHS[:3]) + (
+    '/api/async/recent-jobs/',
+)
+SERVERS = {
+    'wsgi': SYNC_PATHS,
+    'asgi-sync': SYNC_PATHS,
+    'asgi-async': ASYNC_PATHS,
+}
+
+
+def serve_wsgi(port):
+    common.setup()
+    from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+    from django.core.wsgi import get_wsgi_application
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadedWSGIServer):
+        request_queue_size = 2048
+
+    server = Server(('127.0.0.1', port), QuietHandler)
+    server.set_app(get_wsgi_application())
+    server.serve_forever()
+
+
+def start_server(kind, port, env):
+    if kind == 'wsgi':
+        command = [sys.executable, '-m', 'benchmarks.asgi_load', '--serve-wsgi', str(port)]
+    else:
+        command = [
+            sys.executable, '-m', 'uvicorn', 'hiring_platform.asgi:application',
+            '--port', str(port), '--log-level', 'warning', '--backlog', '2048', '--no-access-log',
+        ]
+    process = subprocess.Popen(command, env=env)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f'{kind} server did not start')
+
+
+async def client(port, paths, job_ids, deadline, latencies, errors, offset):
+    reader = writer = None
+    n = offset
+    while time.perf_counter() < deadline:
+        path = paths[n % len(paths)].format(id=job_ids[n % len(job_ids)])
+        n += 1
+        start = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(f'GET {path} HTTP/1.1\r\nHost: localhost\r\nAccept: application/json\r\n\r\n'.encode())
+            await writer.drain()
+            head = await reader.readuntil(b'\r\n\r\n')
+            status = int(head.split(b' ', 2)[1])
+            length = 0
+            close = False
+            for line in head.split(b'\r\n')[1:]:
+                name, _, value = line.partition(b':')
+                if name.lower() == b'content-length':
+                    length = int(value)
+                elif name.lower() == b'connection' and value.strip().lower() == b'close':
+                    close = True
+            await reader.readexactly(length)
+            if status != 200:
+                errors[status] = errors.get(status, 0) + 1
+            else:
+                latencies.append((time.perf_counter() - start) * 1000)
+            if close:
+                writer.close()
+                reader = writer = None
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            errors['connection'] = errors.get('connection', 0) + 1
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def drive(port, paths, job_ids, connections, seconds):
+    latencies, errors = [], {}
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(port, paths, job_ids, deadline, latencies, errors, i) for i in range(connections)
+    ))
+    return latencies, errors, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--connections', type=int, default=500)
+    parser.add_argument('--seconds', type=float, default=20)
+    parser.add_argument('--jobs', type=int, default=10_000)
+    parser.add_argument('--servers', default='wsgi,asgi-sync,asgi-async')
+    parser.add_argument('--serve-wsgi', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve_wsgi:
+        serve_wsgi(args.serve_wsgi)
+        return
+
+    common.setup()
+    from django.db import connection
+
+    from jobs_api.models import Job, JobCategory
+
+    with common.test_database():
+        seed(args.jobs)
+        categories = [JobCategory.objects.create(name=f'Category {i}') for i in range(20)]
+        for i, category in enumerate(categories):
+            Job.objects.filter(pk__gt=i * args.jobs // 20, pk__lte=(i + 1) * args.jobs // 20).update(category=category)
+        job_ids = list(Job.objects.values_list('pk', flat=True)[:1000])
+        env = {
+            **os.environ,
+            'DATABASE_URL': f'sqlite:///{os.path.abspath(connection.settings_dict["NAME"])}',
+            'API_CACHE_TIMEOUT': '0',
+            # Every request comes from one address.
+            'THROTTLE_RATE_IP': '1000000/s',
+        }
+        connection.close()
+        print(f'{args.connections} connections x {args.seconds}s, {args.jobs} jobs')
+        print(f'{"server":<12} {"requests":>9} {"req/s":>8} {"p50 ms":>9} {"p99 ms":>9}  errors')
+        for offset, kind in enumerate(args.servers.split(',')):
+            port = 8700 + offset
+            server = start_server(kind, port, env)
+            try:
+                latencies, errors, elapsed = asyncio.run(
+                    drive(port, SERVERS[kind], job_ids, args.connections, args.seconds)
+                )
+            finally:
+                server.terminate()
+                server.wait()
+            p50 = common.percentile(latencies, 50) if latencies else float('nan')
+            p99 = common.percentile(latencies, 99) if latencies else float('nan')
+            print(
+                f'{kind:<12} {len(latencies):>9} {len(latencies) / elapsed:>8.0f} '
+                f'{p50:>9.1f} {p99:>9.1f}  {errors or "-"}'
+            )
+
+
+if __name__ == '__main__':
+    main()
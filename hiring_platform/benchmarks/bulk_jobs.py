@@ -0,0 +1,92 @@
+"""
+Bulk job import/export throughput.
+
+Writes ``--rows`` jobs as CSV, imports them with ``import_jobs`` (chunked
+validation and bulk writes), then streams them back out with
+``export_rows``. A sample of rows saved one at a time through
+``JobSerializer`` is the per-request baseline.
+
+    python -m benchmarks.bulk_jobs --rows 1000000
+"""
+import argparse
+import csv
+import os
+import random
+import resource
+import tempfile
+import time
+from itertools import islice
+
+from . import common
+from .search import WORDS, sentence
+
+
+def write_csv(path, rows, company_id):
+    rng = random.Random(3)
+    with open(path, 'w', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['company', 'title', 'location', 'description', 'skills_required', 'salary_min'])
+        for _ in range(rows):
+            writer.writerow([
+                company_id, sentence(rng, 3).title(), 'Remote', sentence(rng, 60),
+                ', '.join(rng.sample(WORDS, 4)), rng.choice(['', 40000, 60000, 90000]),
+            ])
+
+
+def peak_rss_mb():
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--baseline-rows', type=int, default=2000)
+    args = parser.parse_args()
+
+    common.setup()
+    from jobs_api.bulk import JOB_EXPORT_FIELDS, export_rows, import_jobs
+    from jobs_api.models import Company, Job
+    from jobs_api.serializers import JobSerializer
+
+    with common.test_database(), tempfile.TemporaryDirectory() as tmp:
+        company = Company.objects.create(name='Bench', email='b@example.com', location='x')
+        path = os.path.join(tmp, 'jobs.csv')
+        write_csv(path, args.rows, company.pk)
+        print(f'{args.rows} rows, {os.path.getsize(path) / 1e6:.0f} MB CSV')
+        results = []
+
+        with open(path, newline='') as handle:
+            start = time.perf_counter()
+            for row in islice(csv.DictReader(handle), args.baseline_rows):
+                serializer = JobSerializer(data={k: v for k, v in row.items() if v != ''})
+                serializer.is_valid(raise_exception=True)
+                serializer.save()
+            elapsed = time.perf_counter() - start
+        results.append(('per-row serializer save', args.baseline_rows, elapsed))
+        Job.objects.all().delete()
+
+        with open(path, newline='') as handle:
+            start = time.perf_counter()
+            summary = import_jobs(handle, 'csv', args.batch_size)
+            elapsed = time.perf_counter() - start
+        assert summary['created'] == args.rows, summary
+        results.append(('bulk import', args.rows, elapsed))
+        import_rss = peak_rss_mb()
+
+        start = time.perf_counter()
+        written = 0
+        for chunk in export_rows(Job.objects.all(), JOB_EXPORT_FIELDS, 'csv'):
+            written += len(chunk)
+        elapsed = time.perf_counter() - start
+        results.append(('streaming export', args.rows, elapsed))
+
+        print(f'{"case":<26} {"rows":>9} {"seconds":>9} {"rows/s":>10}')
+        for label, rows, seconds in results:
+            print(f'{label:<26} {rows:>9} {seconds:>9.1f} {rows / seconds:>10.0f}')
+        print(f'peak RSS after import {import_rss} MB, after export {peak_rss_mb()} MB '
+              f'({written / 1e6:.0f} MB exported)')
+
+
+if __name__ == '__main__':
+    main()
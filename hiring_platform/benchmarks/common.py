@@ -0,0 +1,77 @@
+"""
+Shared bootstrap for the benchmark scripts.
+
+Each benchmark runs against a throwaway test database so it never touches
+``db.sqlite3``. Run them from the ``hiring_platform`` directory, e.g.::
+
+    python -m benchmarks.search --jobs 100000
+"""
+import contextlib
+import os
+import statistics
+import time
+
+import django
+
+
+def setup():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hiring_platform.settings')
+    django.setup()
+
+
+@contextlib.contextmanager
+def test_database(keepdb=False):
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    # A file-backed database so numbers reflect real page cache / IO behaviour.
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    if connection.vendor == 'sqlite' and not test_settings.get('NAME'):
+        test_settings['NAME'] = 'bench.sqlite3'
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb)
+    try:
+        yield connection
+    finally:
+        test_name = connection.settings_dict['NAME']
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+        if connection.vendor == 'sqlite' and not keepdb:
+            for suffix in ('-wal', '-shm'):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(f'{test_name}{suffix}')
+        teardown_test_environment()
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(label, samples):
+    return {
+        'label': label,
+        'runs': len(samples),
+        'p50_ms': round(percentile(samples, 50), 3),
+        'p99_ms': round(percentile(samples, 99), 3),
+        'mean_ms': round(statistics.fmean(samples), 3),
+    }
+
+
+def print_table(rows):
+    print(f'{"case":<40} {"runs":>6} {"p50 ms":>10} {"p99 ms":>10} {"mean ms":>10}')
+    for row in rows:
+        print(
+            f'{row["label"]:<40} {row["runs"]:>6} {row["p50_ms"]:>10} '
+            f'{row["p99_ms"]:>10} {row["mean_ms"]:>10}'
+        )
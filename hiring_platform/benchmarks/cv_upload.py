@@ -0,0 +1,167 @@
+"""
+Peak server RSS while receiving concurrent CV uploads.
+
+Starts the app in a child process (threaded WSGI server on a throwaway
+database and media root), streams ``--clients`` concurrent uploads of
+``--size-mb`` each from this process, and reports the child's peak RSS. Runs
+once with the streaming ``CVUploadHandler`` and once with Django's in-memory
+handler as the buffered baseline.
+
+    python -m benchmarks.cv_upload --clients 50 --size-mb 10
+"""
+import argparse
+import http.client
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+from . import common
+
+CHUNK = 64 * 1024
+
+
+def serve(mode):
+    media_root = tempfile.mkdtemp(prefix='bench-media-')
+    common.setup()
+    from django.conf import settings
+    from django.core.files.uploadhandler import MemoryFileUploadHandler
+    from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+    from django.core.wsgi import get_wsgi_application
+
+    from jobs_api.models import Company, Job
+    from jobs_api.views import ApplicationViewSet
+
+    settings.MEDIA_ROOT = media_root
+    settings.CV_UPLOAD_MAX_BYTES = 64 * 1024 * 1024
+    if mode == 'buffered':
+        settings.FILE_UPLOAD_MAX_MEMORY_SIZE = 64 * 1024 * 1024
+        ApplicationViewSet.upload_handler_classes = [MemoryFileUploadHandler]
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadedWSGIServer):
+        request_queue_size = 256
+
+    with common.test_database():
+        company = Company.objects.create(name='Bench', email='b@example.com', location='x')
+        job = Job.objects.create(company=company, title='Bench', location='x', description='x')
+        server = Server(('127.0.0.1', 0), QuietHandler)
+        server.set_app(get_wsgi_application())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(json.dumps({'port': server.server_address[1], 'job': job.pk}), flush=True)
+        sys.stdin.readline()  # Parent signals completion.
+        server.shutdown()
+        stored = sum(len(files) for _, _, files in os.walk(media_root))
+    shutil.rmtree(media_root, ignore_errors=True)
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({'peak_rss_mb': round(peak_kb / 1024, 1), 'stored_files': stored}), flush=True)
+
+
+def upload(port, job_id, index, size, distinct, results):
+    boundary = uuid.uuid4().hex
+    fields = {
+        'job': str(job_id),
+        'candidate_name': f'Candidate {index}',
+        'candidate_email': f'c{index}@example.com',
+        'phone_number': '9800000000',
+    }
+    head = b''.join(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        for name, value in fields.items()
+    )
+    head += (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="cv"; filename="cv.pdf"\r\n'
+        f'Content-Type: application/pdf\r\n\r\n'
+    ).encode()
+    tail = f'\r\n--{boundary}--\r\n'.encode()
+    # Only ``distinct`` different contents, so deduplication shows up.
+    filler = f'{index % distinct:08d}'.encode() * (CHUNK // 8)
+
+    def body():
+        yield head
+        yield b'%PDF-1.7\n'
+        remaining = size - 9
+        while remaining > 0:
+            yield filler[:min(CHUNK, remaining)]
+            remaining -= CHUNK
+        yield tail
+
+    length = len(head) + size + len(tail)
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=300)
+    start = time.perf_counter()
+    try:
+        connection.request('POST', '/api/applications/', body=body(), headers={
+            'Content-Type': f'multipart/form-data; boundary={boundary}',
+            'Content-Length': str(length),
+        })
+        response = connection.getresponse()
+        response.read()
+        status = response.status
+    except OSError:
+        status = 'error'
+    results.append((status, (time.perf_counter() - start) * 1000))
+
+
+def run(mode, clients, size, distinct):
+    child = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.cv_upload', '--serve', mode],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+    )
+    ready = json.loads(child.stdout.readline())
+    results = []
+    threads = [
+        threading.Thread(target=upload, args=(ready['port'], ready['job'], i, size, distinct, results))
+        for i in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    child.stdin.write('\n')
+    child.stdin.flush()
+    stats = json.loads(child.stdout.readline())
+    child.wait()
+    latencies = [ms for _, ms in results]
+    statuses = sorted({str(status) for status, _ in results})
+    return {
+        'mode': mode,
+        'statuses': statuses,
+        'p50_ms': round(common.percentile(latencies, 50), 1),
+        'p99_ms': round(common.percentile(latencies, 99), 1),
+        **stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--size-mb', type=float, default=10)
+    parser.add_argument('--distinct', type=int, default=10, help='distinct CV contents')
+    parser.add_argument('--serve', choices=['streaming', 'buffered'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args.serve)
+        return
+
+    size = int(args.size_mb * 1024 * 1024)
+    print(f'{args.clients} concurrent uploads of {args.size_mb} MB ({args.distinct} distinct)')
+    print(f'{"mode":<10} {"status":<8} {"p50 ms":>9} {"p99 ms":>9} {"peak RSS MB":>12} {"files":>6}')
+    for mode in ('streaming', 'buffered'):
+        row = run(mode, args.clients, size, args.distinct)
+        print(
+            f'{row["mode"]:<10} {",".join(map(str, row["statuses"])):<8} {row["p50_ms"]:>9} '
+            f'{row["p99_ms"]:>9} {row["peak_rss_mb"]:>12} {row["stored_files"]:>6}'
+        )
+
+
+if __name__ == '__main__':
+    main()
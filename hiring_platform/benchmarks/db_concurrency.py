@@ -0,0 +1,131 @@
+"""
+Concurrent write throughput per database profile.
+
+Each profile runs in its own interpreter (settings are read once) against a
+throwaway test database. ``--workers`` processes then spend ``--seconds``
+doing the app's hot writes: submitting applications (row + counter + rollup
+updates in one transaction), bumping view counts, and moving applications
+between statuses. Failed writes ("database is locked") are counted.
+
+    python -m benchmarks.db_concurrency --workers 16 --seconds 10
+    DATABASE_URL=postgres://... python -m benchmarks.db_concurrency --profiles postgres,postgres-pool
+
+Profiles:
+
+* ``sqlite-default`` - Django's SQLite defaults (rollback journal, deferred
+  transactions, 5 s timeout)
+* ``sqlite-tuned`` - the WAL/IMMEDIATE profile from ``hiring_platform/database.py``
+* ``postgres`` / ``postgres-pool`` - ``DATABASE_URL`` with persistent
+  connections or psycopg's pool
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+from . import common
+
+PROFILES = {
+    'sqlite-default': {'DATABASE_URL': 'sqlite:///bench.sqlite3', 'DB_SQLITE_TUNED': 'false'},
+    'sqlite-tuned': {'DATABASE_URL': 'sqlite:///bench.sqlite3', 'DB_SQLITE_TUNED': 'true'},
+    'postgres': {'DB_POOL': 'false'},
+    'postgres-pool': {'DB_POOL': 'true'},
+}
+
+
+def worker(args):
+    index, job_ids, seconds = args
+    from django.db import DatabaseError
+    from django.db.models import F
+
+    from jobs_api.models import Application, Job
+
+    latencies, errors, n = [], 0, 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        job_id = job_ids[n % len(job_ids)]
+        start = time.perf_counter()
+        try:
+            if n % 3 == 0:
+                Application.objects.create(
+                    job_id=job_id, candidate_name='Bench', candidate_email=f'w{index}-{n}@example.com',
+                    phone_number='1', cv='cvs/bench.pdf',
+                )
+            elif n % 3 == 1:
+                Job.objects.filter(pk=job_id).update(views_count=F('views_count') + 1)
+            else:
+                application = Application.objects.filter(candidate_email=f'w{index}-{n - 2}@example.com').first()
+                if application is not None:
+                    application.status = 'reviewing'
+                    application.save()
+            latencies.append((time.perf_counter() - start) * 1000)
+        except DatabaseError:
+            errors += 1
+        n += 1
+    return latencies, errors
+
+
+def run_profile(workers, seconds):
+    common.setup()
+    from django.db import connection, connections
+
+    from jobs_api.models import Company, Job
+
+    with common.test_database():
+        company = Company.objects.create(name='Bench', email='b@example.com', location='x')
+        job_ids = [
+            Job.objects.create(company=company, title=f'Job {i}', location='x', description='x').pk
+            for i in range(20)
+        ]
+        vendor = connection.vendor
+        connections.close_all()  # Each forked worker opens its own connection.
+        start = time.perf_counter()
+        with multiprocessing.get_context('fork').Pool(workers) as pool:
+            results = pool.map(worker, [(i, job_ids, seconds) for i in range(workers)])
+        elapsed = time.perf_counter() - start
+    latencies = [ms for worker_latencies, _ in results for ms in worker_latencies]
+    return {
+        'vendor': vendor,
+        'writes': len(latencies),
+        'errors': sum(errors for _, errors in results),
+        'writes_per_s': round(len(latencies) / elapsed),
+        'p50_ms': round(common.percentile(latencies, 50), 2) if latencies else None,
+        'p99_ms': round(common.percentile(latencies, 99), 2) if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--profiles', default='sqlite-default,sqlite-tuned')
+    parser.add_argument('--run', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run:
+        print(json.dumps(run_profile(args.workers, args.seconds)))
+        return
+
+    print(f'{args.workers} workers x {args.seconds}s')
+    print(f'{"profile":<16} {"writes":>8} {"writes/s":>9} {"errors":>7} {"p50 ms":>8} {"p99 ms":>8}')
+    for profile in args.profiles.split(','):
+        env = {**os.environ, **PROFILES[profile]}
+        if profile.startswith('postgres') and not env.get('DATABASE_URL', '').startswith('postgres'):
+            print(f'{profile:<16} skipped: set DATABASE_URL=postgres://...')
+            continue
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.db_concurrency', '--run',
+             '--workers', str(args.workers), '--seconds', str(args.seconds)],
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        row = json.loads(output.strip().splitlines()[-1])
+        print(
+            f'{profile:<16} {row["writes"]:>8} {row["writes_per_s"]:>9} {row["errors"]:>7} '
+            f'{row["p50_ms"]:>8} {row["p99_ms"]:>8}'
+        )
+
+
+if __name__ == '__main__':
+    main()
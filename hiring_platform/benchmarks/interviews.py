@@ -0,0 +1,157 @@
+"""
+Interview scheduling against a large calendar: the indexed overlap check,
+the same check without the start-time bound, a Python loop over every
+interview, the free-slot finder and booking through the API.
+
+Interviews are spread over two years of weekday working hours for
+``--interviewers`` people, without overlaps per interviewer, as a system
+that rejects double bookings would have them.
+
+    python -m benchmarks.interviews --interviews 1000000
+    python -m benchmarks.interviews --keepdb   # reuse bench.sqlite3 from a previous run
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from . import common
+
+BASE = datetime(2030, 1, 7, tzinfo=dt_timezone.utc)  # a Monday
+HOURS_PER_DAY = 8
+WEEKDAYS = 2 * 52 * 5
+
+
+def hour_slot(index):
+    """The ``index``-th weekday working hour after BASE."""
+    day, hour = divmod(index, HOURS_PER_DAY)
+    week, weekday = divmod(day, 5)
+    return BASE + timedelta(days=week * 7 + weekday, hours=9 + hour)
+
+
+def seed(interviews, interviewers, applications, rng):
+    from jobs_api.models import Application, Company, Interview, Job
+
+    company = Company.objects.create(name='Bench', email='bench@example.com', location='Remote')
+    job = Job.objects.create(company=company, title='Engineer', location='Remote', description='Bench')
+    Application.objects.bulk_create(
+        [Application(job=job, candidate_name=f'C{i}', candidate_email=f'c{i}@example.com', phone_number='1')
+         for i in range(applications)],
+        batch_size=5000,
+    )
+    candidates = list(Application.objects.values_list('pk', 'candidate_email'))
+    per_interviewer = interviews // interviewers
+    batch = []
+    for n in range(interviewers):
+        for index in sorted(rng.sample(range(WEEKDAYS * HOURS_PER_DAY), per_interviewer)):
+            application_id, email = rng.choice(candidates)
+            start = hour_slot(index)
+            duration = rng.choice((30, 45, 60))
+            batch.append(Interview(
+                application_id=application_id, candidate_email=email, interview_type='video',
+                interviewer_name=f'Interviewer {n}', scheduled_at=start, duration_minutes=duration,
+                ends_at=start + timedelta(minutes=duration),
+                status='cancelled' if rng.random() < 0.1 else 'scheduled',
+            ))
+            if len(batch) == 10_000:
+                Interview.objects.bulk_create(batch)
+                batch = []
+    Interview.objects.bulk_create(batch)
+
+
+def unbounded_conflicts(start, end, interviewer, candidate_email):
+    """``find_conflicts`` without the max-duration bound on ``scheduled_at``."""
+    from jobs_api.models import Interview
+
+    by_interviewer, by_candidate = (
+        Interview.objects.exclude(status='cancelled')
+        .filter(scheduled_at__lt=end, ends_at__gt=start, **lookup).order_by()
+        .values('id', 'interviewer_name', 'candidate_email', 'scheduled_at', 'ends_at')
+        for lookup in ({'interviewer_name': interviewer}, {'candidate_email': candidate_email})
+    )
+    return list(by_interviewer.union(by_candidate))
+
+
+def python_conflicts(start, end, interviewer, candidate_email):
+    from jobs_api.models import Interview
+
+    return [
+        pk for pk, name, email, scheduled_at, ends_at, status in Interview.objects.values_list(
+            'id', 'interviewer_name', 'candidate_email', 'scheduled_at', 'ends_at', 'status',
+        ).iterator(chunk_size=10_000)
+        if status != 'cancelled' and (name == interviewer or email == candidate_email)
+        and scheduled_at < end and ends_at > start
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--interviews', type=int, default=1_000_000)
+    parser.add_argument('--interviewers', type=int, default=2000)
+    parser.add_argument('--applications', type=int, default=50_000)
+    parser.add_argument('--repeat', type=int, default=500)
+    parser.add_argument('--naive-repeat', type=int, default=3)
+    parser.add_argument('--keepdb', action='store_true')
+    args = parser.parse_args()
+
+    common.setup()
+    from django.conf import settings
+    from django.test import Client, override_settings
+
+    from jobs_api.models import Application, Interview
+    from jobs_api.scheduling import find_conflicts, free_slots, overlapping
+
+    rng = random.Random(7)
+    overrides = {'DEBUG': False, 'REST_FRAMEWORK': {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_CLASSES': []}}
+    with common.test_database(keepdb=args.keepdb), override_settings(**overrides):
+        if not Interview.objects.exists():
+            start = time.perf_counter()
+            seed(args.interviews, args.interviewers, args.applications, rng)
+            print(f'seeded {Interview.objects.count()} interviews in {time.perf_counter() - start:.1f}s')
+        emails = list(Application.objects.values_list('candidate_email', flat=True)[:1000])
+
+        def probe():
+            start = hour_slot(rng.randrange(WEEKDAYS * HOURS_PER_DAY)) + timedelta(minutes=rng.choice((0, 15, 30)))
+            return start, start + timedelta(minutes=45), f'Interviewer {rng.randrange(args.interviewers)}', rng.choice(emails)
+
+        def find_slots():
+            start = hour_slot(rng.randrange(WEEKDAYS * HOURS_PER_DAY))
+            interviewers = [f'Interviewer {rng.randrange(args.interviewers)}' for _ in range(3)]
+            return free_slots(
+                interviewers, start, start + timedelta(days=14), timedelta(minutes=60),
+                limit=10, step=timedelta(minutes=30),
+            )
+
+        sample = probe()
+        print('plan:', overlapping(sample[0], sample[1]).filter(interviewer_name=sample[2]).explain())
+        rows = [
+            common.summarize('indexed overlap check', common.timed(lambda: find_conflicts(*probe()), args.repeat)),
+            common.summarize('without start bound', common.timed(lambda: unbounded_conflicts(*probe()), args.repeat)),
+            common.summarize('python loop over all', common.timed(
+                lambda: python_conflicts(*probe()), args.naive_repeat,
+            )),
+            common.summarize('free slots, 3 interviewers', common.timed(find_slots, args.repeat)),
+        ]
+
+        client = Client()
+        last_seeded = Interview.objects.order_by('-pk').values_list('pk', flat=True).first()
+        applications = list(Application.objects.values_list('pk', flat=True)[:1000])
+        outcomes = {}
+
+        def book():
+            start, _, interviewer, _ = probe()
+            response = client.post('/api/interviews/', {
+                'application': rng.choice(applications), 'interviewer_name': interviewer,
+                'interview_type': 'video', 'scheduled_at': start.isoformat(), 'duration_minutes': 45,
+            }, content_type='application/json')
+            outcomes[response.status_code] = outcomes.get(response.status_code, 0) + 1
+        rows.append(common.summarize('POST /api/interviews/', common.timed(book, args.repeat)))
+        if args.keepdb:
+            Interview.objects.filter(pk__gt=last_seeded).delete()
+
+    common.print_table(rows)
+    print('booking responses:', dict(sorted(outcomes.items())))
+
+
+if __name__ == '__main__':
+    main()
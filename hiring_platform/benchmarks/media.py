@@ -0,0 +1,71 @@
+"""
+CV downloads: worker time per request when Django streams the file, when
+the web server is handed it (``MEDIA_OFFLOAD``), for a range request and for
+a revalidation answered with 304.
+
+Each sample reads the whole response body, as the WSGI server would.
+
+    python -m benchmarks.media --size-mb 5
+"""
+import argparse
+import os
+import tempfile
+
+from . import common
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size-mb', type=float, default=5)
+    parser.add_argument('--requests', type=int, default=50)
+    args = parser.parse_args()
+
+    common.setup()
+    from django.contrib.auth.models import User
+    from django.core.files.base import ContentFile
+    from django.test import override_settings
+    from rest_framework.test import APIClient
+
+    from jobs_api.models import Application, Company, Job
+
+    media = tempfile.TemporaryDirectory()
+    overrides = {'DEBUG': False, 'MEDIA_ROOT': media.name}
+    with media, common.test_database(), override_settings(**overrides):
+        user = User.objects.create_user('bench')
+        company = Company.objects.create(name='Bench', location='Remote', email='bench@example.com', user=user)
+        job = Job.objects.create(company=company, title='Engineer', description='-', location='Remote')
+        content = b'%PDF-1.7\n' + os.urandom(int(args.size_mb * 1024 * 1024))
+        application = Application.objects.create(
+            job=job, candidate_name='C', candidate_email='c@example.com', phone_number='1',
+            cv=ContentFile(content, name='cv.pdf'),
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+        url = f'/api/applications/{application.pk}/cv/'
+        etag = client.get(url)['ETag']
+
+        def download(**headers):
+            def run():
+                response = client.get(url, **headers)
+                return b''.join(response.streaming_content) if response.streaming else response.content
+            return run
+
+        cases = [
+            ('streamed', None, {}),
+            ('range 1MiB', None, {'HTTP_RANGE': 'bytes=0-1048575'}),
+            ('if-none-match (304)', None, {'HTTP_IF_NONE_MATCH': etag}),
+            ('x-accel-redirect', 'x-accel-redirect', {}),
+            ('x-sendfile', 'x-sendfile', {}),
+        ]
+        rows = []
+        for label, offload, headers in cases:
+            with override_settings(MEDIA_OFFLOAD=offload):
+                samples = common.timed(download(**headers), args.requests)
+            rows.append(common.summarize(label, samples))
+
+    print(f'{args.size_mb} MiB CV, worker time per download')
+    common.print_table(rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Compare ranked FTS5 search with the old ``icontains`` scan.
+
+    python -m benchmarks.search --jobs 100000 --repeat 200
+"""
+import argparse
+import random
+
+from . import common
+
+WORDS = (
+    'python django react kubernetes postgres golang rust typescript aws azure '
+    'docker terraform analyst designer backend frontend fullstack mobile data '
+    'engineer manager senior junior remote hybrid payments fintech health '
+    'security platform infrastructure machine learning product growth sales'
+).split()
+
+QUERIES = ['python', 'djan', 'kubernetes engineer', 'senior data', 'fintech payments', 'ru']
+
+
+def sentence(rng, n):
+    return ' '.join(rng.choice(WORDS) for _ in range(n))
+
+
+def seed(count, batch=5000):
+    from jobs_api.models import Company, Job
+    from jobs_api.search import get_search_backend
+
+    rng = random.Random(42)
+    company = Company.objects.create(name='Bench Co', email='bench@example.com', location='Remote')
+    for start in range(0, count, batch):
+        Job.objects.bulk_create(
+            Job(
+                company=company,
+                title=sentence(rng, 3).title(),
+                location='Remote',
+                description=sentence(rng, 120),
+                requirements=sentence(rng, 40),
+                skills_required=', '.join(rng.sample(WORDS, 5)),
+            )
+            for _ in range(start, min(count, start + batch))
+        )
+    # bulk_create skips signals, so index everything in one statement.
+    get_search_backend().rebuild()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--jobs', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=100)
+    parser.add_argument('--page-size', type=int, default=10)
+    args = parser.parse_args()
+
+    common.setup()
+    from jobs_api.models import Job
+    from jobs_api.search import LikeSearchBackend, SQLiteFTS5Backend
+
+    with common.test_database():
+        seed(args.jobs)
+        rows = []
+        for name, backend in (('icontains', LikeSearchBackend()), ('fts5', SQLiteFTS5Backend())):
+            for query in QUERIES:
+                def run():
+                    qs = backend.search(Job.objects.all(), query)
+                    qs.count()
+                    list(qs[:args.page_size])
+                rows.append(common.summarize(f'{name}: {query!r}', common.timed(run, args.repeat)))
+        print(f'{args.jobs} jobs, page size {args.page_size}')
+        common.print_table(rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+List serialization: DRF read serializers over model instances against
+``ValuesSerializer`` over ``values_list()`` rows, each rendered with DRF's
+``JSONRenderer`` and with ``ORJSONRenderer``.
+
+Each case runs the page query, serializes and renders ``--page-size`` rows;
+the output of every case is checked byte for byte against the DRF one before
+timing. The last rows time ``/api/jobs/`` and ``/api/applications/``
+end to end with the viewsets' ``values_list`` switched off and on.
+
+    python -m benchmarks.serializers --page-size 100 --repeat 200
+"""
+import argparse
+from unittest import mock
+
+from . import common
+
+
+def cases(page_size):
+    from django.test import RequestFactory
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.request import Request
+
+    from jobs_api.models import Application, Job
+    from jobs_api.renderers import ORJSONRenderer
+    from jobs_api.serializers import ApplicationReadSerializer, JobReadSerializer
+    from jobs_api.values import ValuesSerializer
+
+    request = Request(RequestFactory().get('/api/jobs/'))
+    context = {'request': request}
+
+    def drf(serializer_class, queryset, renderer):
+        def run():
+            page = list(serializer_class.optimize_queryset(queryset)[:page_size])
+            return renderer.render(serializer_class(page, many=True, context=context).data)
+        return run
+
+    def values(serializer_class, queryset, renderer):
+        def run():
+            serializer = ValuesSerializer(serializer_class, context=context)
+            page = list(serializer.rows(serializer_class.optimize_queryset(queryset))[:page_size])
+            return renderer.render(serializer.serialize(page))
+        return run
+
+    for name, serializer_class, queryset in (
+        ('jobs', JobReadSerializer, Job.objects.order_by('-created_at', '-id')),
+        ('applications', ApplicationReadSerializer, Application.objects.order_by('-submitted_at', '-id')),
+    ):
+        yield name, [
+            ('serializer + json', drf(serializer_class, queryset, JSONRenderer())),
+            ('serializer + orjson', drf(serializer_class, queryset, ORJSONRenderer())),
+            ('values_list + json', values(serializer_class, queryset, JSONRenderer())),
+            ('values_list + orjson', values(serializer_class, queryset, ORJSONRenderer())),
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=5000)
+    parser.add_argument('--applications', type=int, default=20_000)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    common.setup()
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.test import Client, override_settings
+    from rest_framework.settings import api_settings
+
+    from jobs_api.counters import view_counter
+    from jobs_api.views import ApplicationViewSet, JobViewSet
+
+    overrides = {
+        'DEBUG': False,
+        'API_CACHE_TIMEOUT': 0,
+        'REST_FRAMEWORK': {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_CLASSES': []},
+    }
+    with common.test_database(), override_settings(**overrides):
+        call_command(
+            'seed_data', companies=max(args.jobs // 20, 1), jobs=args.jobs, applications=args.applications,
+            saved_jobs=0, interviews=0, verbosity=0,
+        )
+        rows = []
+        for name, runs in cases(args.page_size):
+            expected = runs[0][1]()
+            for label, run in runs:
+                if run() != expected:
+                    raise SystemExit(f'{name}: {label} output differs from the DRF serializer')
+                rows.append(common.summarize(f'{name}: {label}', common.timed(run, args.repeat)))
+
+        client = Client()
+        for viewset, path in ((JobViewSet, '/api/jobs/'), (ApplicationViewSet, '/api/applications/')):
+            url = f'{path}?page_size={args.page_size}'
+            slow = {'values_list': False, 'renderer_classes': api_settings.DEFAULT_RENDERER_CLASSES}
+            with mock.patch.multiple(viewset, **slow):
+                expected = client.get(url).content
+                before = common.timed(lambda: client.get(url), args.repeat)
+            if client.get(url).content != expected:
+                raise SystemExit(f'GET {url}: response differs with values_list')
+            after = common.timed(lambda: client.get(url), args.repeat)
+            rows.append(common.summarize(f'GET {path} (serializer)', before))
+            rows.append(common.summarize(f'GET {path} (values_list)', after))
+        view_counter.flush()
+
+    print(f'page size {args.page_size}; every case produced identical bytes')
+    common.print_table(rows)
+
+
+if __name__ == '__main__':
+    main()
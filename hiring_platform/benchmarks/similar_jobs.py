@@ -0,0 +1,82 @@
+"""
+Similar-jobs lookups: the precomputed in-memory index against a naive
+per-request TF-IDF over every open job.
+
+    python -m benchmarks.similar_jobs --jobs 100000 --repeat 200 --naive-repeat 3
+"""
+import argparse
+import math
+import random
+import time
+from collections import Counter
+
+from . import common
+from .search import seed
+
+
+def naive_similar(job_id, k=10):
+    """Fetch, tokenize and weigh every open job on each request."""
+    from jobs_api.models import Job
+    from jobs_api.search import tokenize
+
+    docs = {
+        pk: Counter(tokenize(f'{title} {description} {skills}'.lower()))
+        for pk, title, description, skills in Job.objects.filter(status='open').values_list(
+            'pk', 'title', 'description', 'skills_required',
+        )
+    }
+    df = Counter(term for counts in docs.values() for term in counts)
+    idf = {term: math.log((1 + len(docs)) / (1 + n)) + 1 for term, n in df.items()}
+
+    def weigh(counts):
+        vector = {term: (1 + math.log(n)) * idf[term] for term, n in counts.items()}
+        norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+        return {term: v / norm for term, v in vector.items()}
+
+    query = weigh(docs[job_id])
+    scores = [
+        (pk, sum(query.get(term, 0) * v for term, v in weigh(counts).items()))
+        for pk, counts in docs.items() if pk != job_id
+    ]
+    scores.sort(key=lambda item: -item[1])
+    return scores[:k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--jobs', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--naive-repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    common.setup()
+    from jobs_api.models import Job
+    from jobs_api.similarity import SimilarJobsIndex, rebuild_job_vectors
+
+    with common.test_database():
+        seed(args.jobs)
+        start = time.perf_counter()
+        rebuild_job_vectors()
+        vectorize_s = time.perf_counter() - start
+
+        index = SimilarJobsIndex()
+        start = time.perf_counter()
+        index.load()
+        load_s = time.perf_counter() - start
+        print(f'{args.jobs} jobs: vectorized in {vectorize_s:.1f}s, index loaded in {load_s:.3f}s')
+
+        rng = random.Random(7)
+        ids = list(Job.objects.values_list('pk', flat=True))
+        rows = [
+            common.summarize('index top-10', common.timed(
+                lambda: index.similar(rng.choice(ids)), args.repeat,
+            )),
+            common.summarize('naive per-request top-10', common.timed(
+                lambda: naive_similar(rng.choice(ids)), args.naive_repeat,
+            )),
+        ]
+        common.print_table(rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Cost of the throttle check per request.
+
+Times ``APIView.check_throttles`` (all three throttle scopes) for a job
+search request from ``--clients`` distinct addresses, per bucket store. No
+database is needed: authentication is resolved before timing, and rates are
+set high enough that every request is allowed except in the "throttled" case.
+The budget is 100 µs per request.
+
+    python -m benchmarks.throttle --requests 200000
+    REDIS_URL=redis://localhost:6379/0 python -m benchmarks.throttle   # adds the shared store on Redis
+"""
+import argparse
+import time
+
+from . import common
+
+STORES = {
+    'local memory': 'jobs_api.throttling.LocalBucketStore',
+    'cache (CACHES["default"])': 'jobs_api.throttling.CacheBucketStore',
+}
+
+
+def build_requests(clients):
+    from rest_framework.test import APIRequestFactory
+
+    from jobs_api.views import JobViewSet
+
+    factory = APIRequestFactory()
+    pairs = []
+    for i in range(clients):
+        view = JobViewSet(action_map={'get': 'list'}, format_kwarg=None)
+        request = view.initialize_request(
+            factory.get('/api/jobs/?search=python', REMOTE_ADDR=f'10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}'),
+        )
+        request.user  # Authenticate up front; only the throttles are timed.
+        pairs.append((view, request))
+    return pairs
+
+
+def run(pairs, total):
+    from rest_framework.exceptions import Throttled
+
+    samples = []
+    throttled = 0
+    for n in range(total):
+        view, request = pairs[n % len(pairs)]
+        start = time.perf_counter()
+        try:
+            view.check_throttles(request)
+        except Throttled:
+            throttled += 1
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples, throttled
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200_000)
+    parser.add_argument('--clients', type=int, default=1000)
+    args = parser.parse_args()
+
+    common.setup()
+    from django.conf import settings
+    from django.test import override_settings
+
+    from jobs_api.throttling import LocalBucketStore, get_throttle_store
+
+    def reset(store):
+        # Empty buckets for the next run. The cache store has no clear() (it
+        # would wipe the shared cache), so it moves to fresh keys instead.
+        if isinstance(store, LocalBucketStore):
+            store.clear()
+        else:
+            store.prefix = f'throttle-bench-{time.monotonic_ns()}'
+
+    pairs = build_requests(args.clients)
+    generous = {**settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'], 'ip': '1000000/s', 'search': '1000000/s'}
+    strict = {**generous, 'search': '1/hour'}
+    cases = [
+        ('no throttles', {'DEFAULT_THROTTLE_CLASSES': []}, None),
+        *((f'{name}, allowed', {'DEFAULT_THROTTLE_RATES': generous}, store) for name, store in STORES.items()),
+        *((f'{name}, throttled', {'DEFAULT_THROTTLE_RATES': strict}, store) for name, store in STORES.items()),
+    ]
+    print(f'{args.requests} checks over {args.clients} clients')
+    print(f'{"case":<40} {"mean µs":>9} {"p50 µs":>9} {"p99 µs":>9} {"throttled":>10}')
+    for label, rest_framework, store in cases:
+        overrides = {'REST_FRAMEWORK': {**settings.REST_FRAMEWORK, **rest_framework}}
+        if store:
+            overrides['THROTTLE_STORE'] = store
+        with override_settings(**overrides):
+            from jobs_api.views import JobViewSet
+            from rest_framework.settings import api_settings
+
+            JobViewSet.throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES
+            reset(get_throttle_store())
+            run(pairs, min(args.requests, 10_000))  # Warm up.
+            reset(get_throttle_store())
+            samples, throttled = run(pairs, args.requests)
+        mean = sum(samples) / len(samples)
+        print(
+            f'{label:<40} {mean:>9.1f} {common.percentile(samples, 50):>9.1f} '
+            f'{common.percentile(samples, 99):>9.1f} {throttled:>10}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from .database import database_from_env
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -44,6 +47,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'jobs_api.metrics.InstrumentationMiddleware',  # No-op unless METRICS_ENABLED
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware', # Add this
@@ -77,12 +81,10 @@ WSGI_APPLICATION = 'hiring_platform.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
+# Configured from DATABASE_URL and DB_* variables; see hiring_platform/database.py.
 
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_from_env(os.environ, BASE_DIR),
 }
 
 
@@ -153,10 +155,115 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
-    ]
+    ],
+    # Token buckets: '<requests>/<period>' is the burst size and the refill
+    # rate. See jobs_api/throttling.py.
+    'DEFAULT_THROTTLE_CLASSES': [
+        'jobs_api.throttling.IPThrottle',
+        'jobs_api.throttling.TokenThrottle',
+        'jobs_api.throttling.EndpointThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'ip': os.environ.get('THROTTLE_RATE_IP', '600/min'),
+        'token': os.environ.get('THROTTLE_RATE_TOKEN', '1200/min'),
+        'applications': os.environ.get('THROTTLE_RATE_APPLICATIONS', '20/hour'),
+        'search': os.environ.get('THROTTLE_RATE_SEARCH', '120/min'),
+        'writes': os.environ.get('THROTTLE_RATE_WRITES', '120/min'),
+        'exports': os.environ.get('THROTTLE_RATE_EXPORTS', '10/hour'),
+    },
+    # Reverse proxies in front of the app. Throttles key clients on
+    # REMOTE_ADDR, or on the X-Forwarded-For entry this many hops back;
+    # with 0 the client-supplied header is ignored.
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 0)),
 }
 
 # Media files configuration for CV uploads
-import os
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# How CV and logo downloads reach the client (see jobs_api/media.py): unset
+# streams them from Django; 'x-accel-redirect' (nginx, with an internal
+# location at MEDIA_ACCEL_PREFIX aliased to MEDIA_ROOT) or 'x-sendfile'
+# (Apache/lighttpd) hands the file to the web server.
+MEDIA_OFFLOAD = os.environ.get('MEDIA_OFFLOAD') or None
+MEDIA_ACCEL_PREFIX = os.environ.get('MEDIA_ACCEL_PREFIX', '/protected-media/')
+
+# Longest side, in pixels, of the logo thumbnails used in listings.
+LOGO_THUMBNAIL_SIZE = int(os.environ.get('LOGO_THUMBNAIL_SIZE', 128))
+
+# Full-text job search backend; chosen from the database vendor when unset.
+# e.g. 'jobs_api.search.PostgresSearchBackend'
+JOBS_SEARCH_BACKEND = os.environ.get('JOBS_SEARCH_BACKEND') or None
+
+# Cache used for public API responses. Local memory per process by default;
+# set REDIS_URL to share it (and its invalidations) across workers.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+
+# Seconds a cached API response may live; 0 disables response caching.
+API_CACHE_TIMEOUT = int(os.environ.get('API_CACHE_TIMEOUT', 300))
+
+# Buffered Job.views_count: queue a flush after this many views or seconds,
+# whichever comes first (see jobs_api/counters.py). Views are only buffered in
+# a shared cache (REDIS_URL); with local memory each view is an UPDATE.
+VIEW_COUNT_FLUSH_THRESHOLD = int(os.environ.get('VIEW_COUNT_FLUSH_THRESHOLD', 100))
+VIEW_COUNT_FLUSH_INTERVAL = int(os.environ.get('VIEW_COUNT_FLUSH_INTERVAL', 30))
+
+# Largest CV accepted; bigger uploads are refused with 413 while streaming.
+CV_UPLOAD_MAX_BYTES = int(os.environ.get('CV_UPLOAD_MAX_BYTES', 10 * 1024 * 1024))
+
+# Outgoing mail (application notifications). Printed to the console unless an
+# SMTP backend is configured.
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'no-reply@hiring-platform.local')
+
+# Where throttle buckets live: process memory, or the cache backend (shared by
+# all workers) when REDIS_URL is set.
+THROTTLE_STORE = os.environ.get('THROTTLE_STORE') or (
+    'jobs_api.throttling.CacheBucketStore' if os.environ.get('REDIS_URL')
+    else 'jobs_api.throttling.LocalBucketStore'
+)
+
+# Recent-jobs feed (jobs_api/recent.py): jobs buffered per process, seconds
+# before a buffer reloads regardless of invalidations, and the SSE stream's
+# poll interval and lifetime (clients reconnect after it).
+RECENT_JOBS_BUFFER_SIZE = int(os.environ.get('RECENT_JOBS_BUFFER_SIZE', 50))
+RECENT_JOBS_MAX_AGE = int(os.environ.get('RECENT_JOBS_MAX_AGE', 60))
+RECENT_JOBS_STREAM_POLL = 1
+RECENT_JOBS_STREAM_TIMEOUT = 300
+
+# Background task queue (manage.py run_workers): retry backoff doubles from
+# the base delay up to the cap; running tasks not finished within the
+# visibility timeout are handed to another worker.
+TASK_RETRY_BASE_DELAY = 10
+TASK_RETRY_MAX_DELAY = 3600
+TASK_VISIBILITY_TIMEOUT = 600
+
+# Dashboard statistics read the ApplicationDailyStat rollup (flat cost as
+# applications grow); set to False to aggregate Application rows directly.
+STATS_USE_ROLLUPS = os.environ.get('STATS_USE_ROLLUPS', 'true').lower() != 'false'
+
+# Longest interview accepted. Overlap checks scan interviews starting up to
+# this long before the requested slot, so keep it tight.
+INTERVIEW_MAX_DURATION_MINUTES = 480
+
+# Request metrics at /metrics (jobs_api/metrics.py). Off by default; when off
+# the middleware drops out of the stack. METRICS_TOKEN, if set, must be sent
+# as "Authorization: Bearer <token>".
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'false').lower() == 'true'
+METRICS_SERVER_TIMING = os.environ.get('METRICS_SERVER_TIMING', 'false').lower() == 'true'
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+METRICS_SLOW_QUERY_MS = int(os.environ.get('METRICS_SLOW_QUERY_MS', 100))
+METRICS_SLOW_QUERY_SAMPLES = 50
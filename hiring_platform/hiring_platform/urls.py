@@ -1,7 +1,11 @@
 from django.contrib import admin
 from django.urls import path, include
+from jobs_api.views import company_logo, metrics, slow_queries
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('jobs_api.urls')),
+    path('metrics', metrics, name='metrics'),
+    path('metrics/slow-queries', slow_queries, name='slow-queries'),
+    path('media/company_logos/<path:path>', company_logo, name='company-logo'),
 ]
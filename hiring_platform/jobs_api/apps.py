@@ -3,3 +3,11 @@ from django.apps import AppConfig
 class JobsApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'jobs_api'
+
+    def ready(self):
+        from . import signals, tasks  # noqa: F401
+        from django.conf import settings
+        if getattr(settings, 'METRICS_ENABLED', False):
+            # Before any connection opens, so every thread's connection is wrapped.
+            from .metrics import install_query_tracking
+            install_query_tracking()
@@ -0,0 +1,117 @@
+"""
+Job archival: moves closed jobs, with their applications and interviews, out
+of the hot tables into ``ArchivedJob`` / ``ArchivedApplication`` /
+``ArchivedInterview``.
+
+Each batch of jobs is one transaction. Rows are copied as JSON snapshots
+keyed by field name (so the archive survives later schema changes), then the
+originals and everything hanging off them (interviews, skill links, saved
+jobs, daily stat rollups, vectors and the search index entry) are deleted
+bottom-up with plain ``DELETE ... WHERE`` statements. A cascading
+``delete()`` would load every dependent row and fire the per-application
+counter signals, whose only effect is updating jobs that are being removed.
+
+Archived jobs drop out of listings, search, similar jobs and the stats
+endpoints, which cover live jobs only.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import invalidate
+from .models import (
+    Application, ApplicationDailyStat, ApplicationSkill, ArchivedApplication, ArchivedInterview,
+    ArchivedJob, Interview, Job, JobVector, SavedJob,
+)
+from .recent import recent_jobs
+from .search import get_search_backend
+
+
+def archivable_jobs(statuses=('closed',), older_than=timedelta(days=180), now=None):
+    """Jobs in ``statuses`` not updated for ``older_than``."""
+    return Job.objects.filter(status__in=statuses, updated_at__lt=(now or timezone.now()) - older_than)
+
+
+def snapshot(queryset):
+    """``{field name: value}`` for every row, foreign keys as ids."""
+    fields = queryset.model._meta.concrete_fields
+    return [
+        {field.name: row[field.attname] for field in fields}
+        for row in queryset.values(*(field.attname for field in fields))
+    ]
+
+
+def _delete(queryset):
+    # No Collector, no signals: everything referencing these rows is
+    # deleted first by the caller.
+    return queryset._raw_delete(queryset.db)
+
+
+def archive_batch(job_ids, now=None):
+    """Move ``job_ids`` and their dependents to the archive; returns row counts."""
+    now = now or timezone.now()
+    applications = Application.objects.filter(job_id__in=job_ids)
+    application_ids = applications.values('pk')
+    interviews = Interview.objects.filter(application_id__in=application_ids)
+    with transaction.atomic():
+        jobs = snapshot(Job.objects.filter(pk__in=job_ids))
+        application_rows = snapshot(applications)
+        interview_rows = snapshot(interviews)
+        ArchivedJob.objects.bulk_create([
+            ArchivedJob(
+                id=row['id'], company_id=row['company'], category_id=row['category'], title=row['title'],
+                status=row['status'], created_at=row['created_at'], archived_at=now, data=row,
+            )
+            for row in jobs
+        ], batch_size=1000)
+        ArchivedApplication.objects.bulk_create([
+            ArchivedApplication(
+                id=row['id'], job_id=row['job'], candidate_email=row['candidate_email'], status=row['status'],
+                submitted_at=row['submitted_at'], data=row,
+            )
+            for row in application_rows
+        ], batch_size=1000)
+        ArchivedInterview.objects.bulk_create([
+            ArchivedInterview(
+                id=row['id'], application_id=row['application'], scheduled_at=row['scheduled_at'], data=row,
+            )
+            for row in interview_rows
+        ], batch_size=1000)
+        _delete(interviews)
+        _delete(ApplicationSkill.objects.filter(application_id__in=application_ids))
+        _delete(applications)
+        for model in (SavedJob, ApplicationDailyStat, JobVector):
+            _delete(model.objects.filter(job_id__in=job_ids))
+        _delete(Job.objects.filter(pk__in=job_ids))
+        get_search_backend().remove_many(job_ids)
+    return {'jobs': len(jobs), 'applications': len(application_rows), 'interviews': len(interview_rows)}
+
+
+def archive_jobs(queryset, batch_size=500, limit=None, log=None):
+    """
+    Archive every job in ``queryset``, ``batch_size`` jobs per transaction,
+    in id order. Returns the total rows moved per table.
+    """
+    totals = {'jobs': 0, 'applications': 0, 'interviews': 0}
+    last_id = 0
+    while limit is None or totals['jobs'] < limit:
+        size = batch_size if limit is None else min(batch_size, limit - totals['jobs'])
+        with transaction.atomic():
+            # Picked inside the transaction so a job reopened meanwhile stays put.
+            job_ids = list(
+                queryset.filter(pk__gt=last_id).order_by('pk').select_for_update()
+                .values_list('pk', flat=True)[:size]
+            )
+            if not job_ids:
+                break
+            counts = archive_batch(job_ids)
+        for name, count in counts.items():
+            totals[name] += count
+        last_id = job_ids[-1]
+        if log:
+            log(f'archived {counts["jobs"]} jobs up to id {last_id} ({totals["jobs"]} so far)')
+    if totals['jobs']:
+        invalidate('jobs', 'categories')
+        recent_jobs.invalidate()
+    return totals
@@ -0,0 +1,136 @@
+"""
+Async read endpoints for ASGI deployments (``uvicorn hiring_platform.asgi:application``).
+
+Plain Django async views over the async ORM, serving the same JSON as the
+DRF viewsets for the hottest reads. Under ASGI a request waiting on the
+database no longer pins a worker thread for its whole lifetime; only the
+query itself runs in the ORM's executor. Writes and everything else stay on
+the DRF viewsets.
+
+Job lists take the same filters, ``?search=``, ``page`` and ``page_size``
+as ``/api/jobs/``; facets, keyset pagination and the response cache are
+only on the DRF path.
+"""
+from asgiref.sync import sync_to_async
+from django.db.models import Count
+from django.http import Http404, HttpResponse
+from rest_framework.exceptions import Throttled, ValidationError
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .counters import view_counter
+from .filters import JobFilterBackend, parse_int
+from .models import Job, JobCategory
+from .recent import recent_jobs as recent_jobs_buffer, with_request
+from .renderers import ORJSONRenderer
+from .search import get_search_backend
+from .serializers import JobCategorySerializer, JobReadSerializer
+from .throttling import throttle_wait
+from .values import ValuesSerializer
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+RECENT_JOBS = 10
+
+
+def json_response(data, status=200):
+    return HttpResponse(ORJSONRenderer().render(data), status=status, content_type='application/json')
+
+
+def _int_param(request, name, default, minimum=1, maximum=None):
+    raw = request.GET.get(name)
+    if not raw:
+        return default
+    try:
+        value = max(parse_int(raw), minimum)
+    except ValueError as exc:
+        raise ValidationError({name: [str(exc)]})
+    return min(value, maximum) if maximum else value
+
+
+async def paginate(request, queryset, serializer_class, values_list=False):
+    """
+    ``PageNumberPagination``-shaped page: one ``COUNT`` and one page query.
+    ``values_list`` serializes rows with ``ValuesSerializer`` instead.
+    """
+    page_size = _int_param(request, 'page_size', DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE)
+    page = _int_param(request, 'page', 1)
+    count = await queryset.acount()
+    if page > 1 and (page - 1) * page_size >= count:
+        raise Http404('Invalid page.')
+    offset = (page - 1) * page_size
+    context = {'request': request}
+    if values_list:
+        serializer = ValuesSerializer(serializer_class, context=context)
+        rows = [row async for row in serializer.rows(queryset)[offset:offset + page_size]]
+        results = serializer.serialize(rows)
+    else:
+        rows = [obj async for obj in queryset[offset:offset + page_size]]
+        results = serializer_class(rows, many=True, context=context).data
+    url = request.build_absolute_uri()
+    previous = None
+    if page > 1:
+        previous = remove_query_param(url, 'page') if page == 2 else replace_query_param(url, 'page', page - 1)
+    return {
+        'count': count,
+        'next': replace_query_param(url, 'page', page + 1) if offset + page_size < count else None,
+        'previous': previous,
+        'results': results,
+    }
+
+
+async def check_throttles(request, *scopes):
+    # Same buckets as the DRF views, so neither stack gets around the other's limits.
+    wait = await sync_to_async(throttle_wait, thread_sensitive=False)(request, *scopes)
+    if wait:
+        raise Throttled(wait)
+
+
+def read_view(view):
+    """GET-only and IP-throttled, with validation errors and 404s rendered as JSON."""
+    async def wrapped(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return json_response({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+        try:
+            await check_throttles(request, 'ip')
+            return json_response(await view(request, *args, **kwargs))
+        except ValidationError as exc:
+            return json_response(exc.detail, status=400)
+        except Throttled as exc:
+            response = json_response({'detail': exc.detail}, status=429)
+            response['Retry-After'] = str(exc.wait)
+            return response
+        except (Http404, Job.DoesNotExist):
+            return json_response({'detail': 'Not found.'}, status=404)
+    return wrapped
+
+
+@read_view
+async def job_list(request):
+    queryset = Job.objects.filter(**JobFilterBackend().parse_params(request.GET))
+    query = request.GET.get('search', '').strip()
+    if query:
+        await check_throttles(request, 'search')
+        queryset = get_search_backend().search(queryset, query)
+    return await paginate(request, JobReadSerializer.optimize_queryset(queryset), JobReadSerializer, values_list=True)
+
+
+@read_view
+async def job_detail(request, pk):
+    job = await JobReadSerializer.optimize_queryset(Job.objects.all()).aget(pk=pk)
+    # On the ORM thread: without a shared cache the view is an UPDATE, and a
+    # due flush is queued with an INSERT.
+    await sync_to_async(view_counter.record)(job.pk)
+    return JobReadSerializer(job, context={'request': request}).data
+
+
+@read_view
+async def category_list(request):
+    queryset = JobCategory.objects.annotate(jobs_count=Count('jobs')).order_by('name')
+    return await paginate(request, queryset, JobCategorySerializer)
+
+
+@read_view
+async def recent_jobs(request):
+    limit = _int_param(request, 'limit', RECENT_JOBS, maximum=recent_jobs_buffer.size)
+    # Normally a cache read; only a stale buffer reloads from the database.
+    return with_request(await sync_to_async(recent_jobs_buffer.jobs)(limit), request)
@@ -0,0 +1,213 @@
+"""
+Bulk job import and streaming export.
+
+Imports read CSV or JSON-lines rows lazily, validate them with
+``JobImportSerializer`` in chunks of ``batch_size`` and write each chunk in
+one transaction with ``bulk_create`` (rows without an ``id``) and
+``bulk_update`` (rows with one). Because bulk writes skip model signals, the
+work the ``Job`` signals normally do (search index, skill vocabulary,
+similarity vectors, response cache) is done here once per chunk.
+
+Chunks commit independently: rows rejected by validation are reported per
+line, and a chunk whose write fails with a database error is rolled back and
+reported per line too, while earlier and later chunks stay written. A body
+that stops decoding as UTF-8 or parsing as CSV part way through is reported
+on the line where it did, and the rows before it are still imported.
+
+Exports stream ``values_list`` rows from a server-side iterator, so memory
+stays flat however many rows are exported.
+"""
+import csv
+import json
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .cache import invalidate
+from .models import Job
+from .recent import recent_jobs
+from .search import get_search_backend
+from .serializers import JobImportSerializer
+from .similarity import store_job_vectors
+from .skills import sync_job_skills
+
+FORMATS = ('csv', 'jsonl')
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+MAX_REPORTED_ERRORS = 100
+
+JOB_EXPORT_FIELDS = (
+    'id', 'company', 'category', 'title', 'location', 'description', 'requirements',
+    'salary_min', 'salary_max', 'salary_currency', 'job_type', 'experience_level', 'status',
+    'skills_required', 'benefits', 'created_at', 'updated_at',
+)
+APPLICATION_EXPORT_FIELDS = (
+    'id', 'job', 'candidate_name', 'candidate_email', 'phone_number', 'status', 'rating',
+    'cv', 'submitted_at', 'updated_at',
+)
+
+
+def format_for(name_or_content_type):
+    """``csv``/``jsonl`` from a file name or Content-Type, else ``None``."""
+    value = (name_or_content_type or '').split(';')[0].strip().lower()
+    if value.endswith(('.csv', '/csv')):
+        return 'csv'
+    if value.endswith(('.jsonl', '.ndjson', '/x-ndjson', '/jsonl', '/json-lines')):
+        return 'jsonl'
+    return None
+
+
+def read_rows(lines, fmt):
+    """
+    Yield ``(line_number, row)``; ``row`` is a dict, or an error message.
+    Undecodable or malformed input ends the rows with an error on that line.
+    """
+    if fmt == 'csv':
+        # Counted here: the reader's line_num doesn't include a line it
+        # failed to fetch or parse.
+        read = 0
+
+        def counted():
+            nonlocal read
+            for line in lines:
+                read += 1
+                yield line
+
+        reader = csv.DictReader(counted())
+        try:
+            for row in reader:
+                # Empty cells mean "not given" so model defaults and nulls apply.
+                yield reader.line_num, {key: value for key, value in row.items() if value != ''}
+        except UnicodeDecodeError as exc:
+            yield read + 1, f'Not valid UTF-8, stopped reading: {exc}'
+        except csv.Error as exc:
+            yield read, f'Invalid CSV, stopped reading: {exc}'
+        return
+    number = 0
+    try:
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                yield number, f'Invalid JSON: {exc}'
+                continue
+            yield number, row if isinstance(row, dict) else 'Expected a JSON object.'
+    except UnicodeDecodeError as exc:
+        yield number + 1, f'Not valid UTF-8, stopped reading: {exc}'
+
+
+class JobImporter:
+    def __init__(self, batch_size=1000):
+        self.batch_size = batch_size
+        self.serializer = JobImportSerializer(context={})
+        self.created = self.updated = self.error_count = 0
+        self.errors = []
+
+    def run(self, rows):
+        rows = iter(rows)
+        while chunk := list(islice(rows, self.batch_size)):
+            self.import_chunk(chunk)
+        return self.summary()
+
+    def summary(self):
+        return {
+            'created': self.created,
+            'updated': self.updated,
+            'error_count': self.error_count,
+            'errors': self.errors,
+        }
+
+    def error(self, line, detail):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'errors': detail})
+
+    def import_chunk(self, chunk):
+        ids = [row.get('id') for _, row in chunk if isinstance(row, dict) and row.get('id')]
+        existing = Job.objects.order_by().in_bulk([pk for pk in ids if str(pk).isdigit()])
+        creates, updates, update_fields, lines = [], [], set(), []
+        for line, row in chunk:
+            if not isinstance(row, dict):
+                self.error(line, {'non_field_errors': [row]})
+                continue
+            pk = row.pop('id', None)
+            job = None
+            if pk not in (None, ''):
+                job = existing.get(int(pk)) if str(pk).isdigit() else None
+                if job is None:
+                    self.error(line, {'id': [f'No job with id {pk!r}.']})
+                    continue
+            try:
+                data = self.serializer.run_validation(row)
+            except ValidationError as exc:
+                self.error(line, exc.detail)
+                continue
+            if job is None:
+                creates.append(Job(**data))
+            else:
+                for field, value in data.items():
+                    setattr(job, field, value)
+                update_fields.update(data)
+                updates.append(job)
+            lines.append(line)
+        if not creates and not updates:
+            return
+        try:
+            with transaction.atomic():
+                Job.objects.bulk_create(creates)
+                if updates:
+                    # bulk_update doesn't apply auto_now.
+                    now = timezone.now()
+                    for job in updates:
+                        job.updated_at = now
+                    Job.objects.bulk_update(updates, [*update_fields, 'updated_at'])
+                written = creates + updates
+                get_search_backend().index_many(written)
+                sync_job_skills(*written)
+                store_job_vectors(written)
+        except DatabaseError as exc:
+            for line in lines:
+                self.error(line, {'non_field_errors': [f'Not written, the batch failed: {exc}']})
+            return
+        invalidate('jobs')
+        recent_jobs.invalidate()
+        self.created += len(creates)
+        self.updated += len(updates)
+
+
+def import_jobs(lines, fmt, batch_size=1000):
+    return JobImporter(batch_size).run(read_rows(lines, fmt))
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def _export_value(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def export_rows(queryset, fields, fmt, chunk_size=2000):
+    """Yield the rows of ``queryset`` as CSV or JSON-lines text, a chunk at a time."""
+    rows = queryset.order_by('pk').values_list(*fields).iterator(chunk_size=chunk_size)
+    if fmt == 'csv':
+        writer = csv.writer(_Echo())
+        yield writer.writerow(fields)
+        encode = writer.writerow
+    else:
+        encoder = DjangoJSONEncoder()
+
+        def encode(row):
+            return encoder.encode(dict(zip(fields, row))) + '\n'
+    while chunk := list(islice(rows, chunk_size)):
+        yield ''.join(encode([_export_value(value) for value in row]) for row in chunk)
@@ -0,0 +1,172 @@
+"""
+Response cache for the public read endpoints.
+
+Keys carry a generation number for every model namespace a response depends
+on (``jobs``, ``companies``, ``categories``; ``saved:<hash>`` for one
+candidate's saved jobs). A write bumps its namespace's generation, so every
+dependent entry becomes unreachable at once without scanning keys (model
+signals bump it again when the write commits); only
+``get``/``set``/``add``/``incr`` are used, which every Django cache backend
+(local memory, Redis, Memcached) supports.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+KEY_PREFIX = 'api-response'
+
+
+def get_cache():
+    return caches[getattr(settings, 'API_CACHE_ALIAS', 'default')]
+
+
+def get_timeout():
+    return getattr(settings, 'API_CACHE_TIMEOUT', 300)
+
+
+def _generation_key(namespace):
+    return f'{KEY_PREFIX}:gen:{namespace}'
+
+
+def _modified_key(namespace):
+    return f'{KEY_PREFIX}:modified:{namespace}'
+
+
+def invalidate(*namespaces):
+    """Drop every cached response depending on ``namespaces``."""
+    cache = get_cache()
+    now = int(time.time())
+    for namespace in namespaces:
+        key = _generation_key(namespace)
+        # add() is a no-op if the key exists, so concurrent bumps never reset it.
+        cache.add(key, 0, timeout=None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Evicted between add() and incr(); any fresh value invalidates too.
+            cache.set(key, now, timeout=None)
+        cache.set(_modified_key(namespace), now, timeout=None)
+
+
+def invalidate_on_commit(*namespaces):
+    """
+    ``invalidate()`` now, so later reads in this transaction miss, and again
+    once it commits: until then other connections still see the old rows and
+    may cache them under the new generation.
+    """
+    invalidate(*namespaces)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: invalidate(*namespaces))
+
+
+def _state(namespaces):
+    cache = get_cache()
+    keys = [_generation_key(ns) for ns in namespaces] + [_modified_key(ns) for ns in namespaces]
+    values = cache.get_many(keys)
+    now = int(time.time())
+    generations, modified = [], []
+    for ns in namespaces:
+        generation = values.get(_generation_key(ns))
+        if generation is None:
+            cache.add(_generation_key(ns), 0, timeout=None)
+            generation = 0
+        stamp = values.get(_modified_key(ns))
+        if stamp is None:
+            # Unknown history (cold cache): treat the data as changed now.
+            cache.add(_modified_key(ns), now, timeout=None)
+            stamp = now
+        generations.append(f'{ns}{generation}')
+        modified.append(stamp)
+    return '.'.join(generations), max(modified)
+
+
+def normalize_params(query_params):
+    items = sorted(
+        (key, value)
+        for key, values in query_params.lists()
+        for value in values
+        if value != ''
+    )
+    return urlencode(items)
+
+
+class CachedResponseMixin:
+    """
+    Caches rendered GET responses of ``cached_actions`` and answers
+    ``If-None-Match`` / ``If-Modified-Since`` with 304s.
+    """
+
+    cache_namespaces = ()
+    cached_actions = ('list', 'retrieve')
+
+    def get_cache_namespaces(self, request):
+        return self.cache_namespaces
+
+    def _response_cache_key(self, request, generations):
+        params = hashlib.md5(normalize_params(request.query_params).encode()).hexdigest()
+        return ':'.join([
+            KEY_PREFIX, generations, self.basename, self.action,
+            str(self.kwargs.get(self.lookup_url_kwarg or self.lookup_field, '')),
+            request.accepted_renderer.format, params,
+        ])
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._cache_entry = None
+        if (
+            request.method != 'GET'
+            or self.action not in self.cached_actions
+            or not get_timeout()
+        ):
+            return
+        generations, last_modified = _state(self.get_cache_namespaces(request))
+        key = self._response_cache_key(request, generations)
+        self._cache_entry = {'key': key, 'last_modified': last_modified}
+        cached = get_cache().get(key)
+        if cached is not None:
+            self._cache_entry['hit'] = cached
+
+    def handle_cached(self, handler, request, *args, **kwargs):
+        entry = getattr(self, '_cache_entry', None)
+        if entry and 'hit' in entry:
+            content, content_type, etag, last_modified = entry['hit']
+            response = HttpResponse(content, content_type=content_type)
+            response['X-Cache'] = 'HIT'
+            return self._finish(request, response, etag, last_modified)
+        return handler(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        return self.handle_cached(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.handle_cached(super().retrieve, request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        entry = getattr(self, '_cache_entry', None)
+        if not entry or 'hit' in entry or response.status_code != 200:
+            return response
+        response.render()
+        etag = '"%s"' % hashlib.md5(response.content).hexdigest()
+        get_cache().set(
+            entry['key'],
+            (response.content, response['Content-Type'], etag, entry['last_modified']),
+            get_timeout(),
+        )
+        response['X-Cache'] = 'MISS'
+        return self._finish(request, response, etag, entry['last_modified'])
+
+    def _finish(self, request, response, etag, last_modified):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ['Accept'])
+        return get_conditional_response(
+            request, etag=etag, last_modified=last_modified, response=response,
+        )
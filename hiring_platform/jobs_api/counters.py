@@ -0,0 +1,300 @@
+"""
+Denormalized ``Job`` counters.
+
+Application counters (``applications_count`` and the per-status columns) are
+kept in step with ``Application`` rows by ``adjust_application_counters`` and
+repaired in bulk by ``recompute_application_counters``.
+
+``views_count`` is write-buffered.
+
+Views are counted in the cache backend instead of issuing an ``UPDATE`` per
+page view, and flushed as ``UPDATE ... SET views_count = views_count + n``
+statements (one per distinct ``n``) once ``VIEW_COUNT_FLUSH_THRESHOLD`` views
+are pending or ``VIEW_COUNT_FLUSH_INTERVAL`` seconds have passed.
+
+Pending counts live in a shared cache backend (Redis), so nothing is lost
+when a worker restarts and any process can flush them. Flushes never run on
+the request path: a due flush is queued as the ``flush_view_counts`` task for
+``manage.py run_workers``, and the command of the same name flushes on
+demand (e.g. from cron). A process-local backend (``LocMemCache``) would lose
+its counts with the process and can't be flushed from elsewhere, so with one
+views are written straight through with an ``UPDATE`` each.
+
+Bookkeeping keys:
+
+* ``<prefix>:job:<id>`` - pending views for one job.
+* ``<prefix>:seq`` / ``<prefix>:slot:<n>`` - append-only log of jobs that
+  went from 0 to 1 pending views, read from ``<prefix>:flushed``.
+* ``<prefix>:gaps`` - when each missing slot was first seen.
+
+The bookkeeping keys share the cache with everything else, so any of them
+can be evicted. A flush that skips an evicted slot, or finds ``seq`` has
+started over, sweeps the count key of every job instead of trusting the log.
+"""
+import time
+from collections import Counter, defaultdict
+from itertools import islice
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import Application, Job
+from .queue import enqueue
+from .stats import adjust_daily_stat
+
+
+# Backends whose contents no other process can see.
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+APPLICATION_COUNTER_FIELDS = (
+    'applications_count',
+    'pending_applications_count',
+    'accepted_applications_count',
+    'rejected_applications_count',
+)
+
+
+def adjust_application_counters(job_id, status, delta):
+    """Add ``delta`` to a job's total and ``status`` counters in one UPDATE."""
+    updates = {'applications_count': F('applications_count') + delta}
+    field = Application.STATUS_COUNTERS.get(status)
+    if field:
+        updates[field] = F(field) + delta
+    Job.objects.filter(pk=job_id).update(**updates)
+
+
+def move_application_counter(job_id, old_status, new_status, count=1):
+    old_field = Application.STATUS_COUNTERS.get(old_status)
+    new_field = Application.STATUS_COUNTERS.get(new_status)
+    if old_field == new_field:
+        return
+    updates = {}
+    if old_field:
+        updates[old_field] = F(old_field) - count
+    if new_field:
+        updates[new_field] = F(new_field) + count
+    Job.objects.filter(pk=job_id).update(**updates)
+
+
+def change_application_status(queryset, status, batch_size=1000):
+    """
+    Set ``status`` on every application in ``queryset``, ``batch_size`` rows
+    per transaction, and return how many changed. ``update()`` sends no
+    ``post_save``, so job counters and daily stats are moved here, once per
+    (job, old status) and (job, day, old status) group rather than per row.
+    """
+    changed = 0
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                queryset.exclude(status=status).filter(pk__gt=last_id).order_by('pk').select_for_update()
+                .values_list('pk', 'job_id', 'status', 'submitted_at')[:batch_size]
+            )
+            if not rows:
+                return changed
+            Application.objects.filter(pk__in=[row[0] for row in rows]).update(
+                status=status, updated_at=timezone.now(),
+            )
+            for (job_id, old_status), count in Counter((row[1], row[2]) for row in rows).items():
+                move_application_counter(job_id, old_status, status, count)
+            days = Counter((row[1], timezone.localdate(row[3]), row[2]) for row in rows)
+            for (job_id, day, old_status), count in days.items():
+                adjust_daily_stat(job_id, day, old_status, -count)
+                adjust_daily_stat(job_id, day, status, count)
+        changed += len(rows)
+        last_id = rows[-1][0]
+
+
+def application_counter_aggregates():
+    """``{job_id: {field: value}}`` from one GROUP BY over all applications."""
+    aggregates = {'applications_count': Count('pk')}
+    for field in APPLICATION_COUNTER_FIELDS[1:]:
+        statuses = [s for s, f in Application.STATUS_COUNTERS.items() if f == field]
+        aggregates[field] = Count('pk', filter=Q(status__in=statuses))
+    rows = Application.objects.order_by().values('job_id').annotate(**aggregates)
+    return {row.pop('job_id'): row for row in rows}
+
+
+def recompute_application_counters(batch_size=1000):
+    """Rewrite drifted application counters; returns the number of jobs fixed."""
+    expected = application_counter_aggregates()
+    zero = dict.fromkeys(APPLICATION_COUNTER_FIELDS, 0)
+    drifted = []
+    current = Job.objects.order_by().values_list('pk', *APPLICATION_COUNTER_FIELDS)
+    for pk, *values in current.iterator(chunk_size=batch_size):
+        target = expected.get(pk, zero)
+        if [target[field] for field in APPLICATION_COUNTER_FIELDS] != values:
+            drifted.append(Job(pk=pk, **target))
+    for start in range(0, len(drifted), batch_size):
+        with transaction.atomic():
+            Job.objects.bulk_update(
+                drifted[start:start + batch_size], APPLICATION_COUNTER_FIELDS,
+            )
+    return len(drifted)
+
+
+class ViewCounter:
+    prefix = 'job-views'
+    lock_timeout = 60
+    stall_timeout = 5
+
+    def __init__(self, cache=None, threshold=None, interval=None, buffered=None):
+        self.cache = cache or caches[getattr(settings, 'VIEW_COUNT_CACHE_ALIAS', 'default')]
+        self.buffered = buffered if buffered is not None else not isinstance(self.cache, PROCESS_LOCAL_CACHES)
+        self.threshold = threshold if threshold is not None else getattr(
+            settings, 'VIEW_COUNT_FLUSH_THRESHOLD', 100)
+        self.interval = interval if interval is not None else getattr(
+            settings, 'VIEW_COUNT_FLUSH_INTERVAL', 30)
+        self._recorded = 0
+        self._last_flush = time.monotonic()
+
+    def _key(self, *parts):
+        return ':'.join([self.prefix, *map(str, parts)])
+
+    def _incr(self, key, delta=1):
+        self.cache.add(key, 0, timeout=None)
+        try:
+            return self.cache.incr(key, delta)
+        except ValueError:
+            # Evicted between add() and incr().
+            self.cache.add(key, 0, timeout=None)
+            return self.cache.incr(key, delta)
+
+    def _register(self, job_id):
+        seq = self._incr(self._key('seq'))
+        self.cache.set(self._key('slot', seq), job_id, timeout=None)
+
+    def record(self, job_id):
+        if not self.buffered:
+            Job.objects.filter(pk=job_id).update(views_count=F('views_count') + 1)
+            return
+        if self._incr(self._key('job', job_id)) == 1:
+            self._register(job_id)
+        self._recorded += 1
+        if self._recorded >= self.threshold or (
+            time.monotonic() - self._last_flush >= self.interval
+        ):
+            self.schedule_flush()
+
+    def schedule_flush(self):
+        """Queue a flush for the task workers, at most one per ``interval``."""
+        self._recorded = 0
+        self._last_flush = time.monotonic()
+        window = int(time.time() // max(self.interval, 1))
+        enqueue('flush_view_counts', idempotency_key=self._key('flush', window))
+
+    def pending(self):
+        """``{job_id: views}`` not yet written to the database."""
+        flushed, seq = self._slot_range()
+        job_ids = set(self._read_slots(flushed, seq).values())
+        counts = self.cache.get_many([self._key('job', job_id) for job_id in job_ids])
+        return {
+            job_id: counts[self._key('job', job_id)]
+            for job_id in job_ids
+            if counts.get(self._key('job', job_id))
+        }
+
+    def _slot_range(self):
+        flushed = self.cache.get(self._key('flushed')) or 0
+        return flushed, self.cache.get(self._key('seq')) or 0
+
+    def _read_slots(self, flushed, seq):
+        keys = {self._key('slot', n): n for n in range(flushed + 1, seq + 1)}
+        return {keys[key]: job_id for key, job_id in self.cache.get_many(list(keys)).items()}
+
+    def _readable_upto(self, slots, flushed, seq):
+        """
+        ``(upto, skipped)``: the highest slot number the flush may consume,
+        and whether that skips any missing slot. A slot is claimed (seq
+        incremented) before it is written, so a gap usually means a writer is
+        mid-registration and we stop short of it; a gap still open
+        ``stall_timeout`` after it was first seen was evicted and is skipped.
+        Gaps first seen together, as after a cache cull, expire together.
+        """
+        now = time.time()
+        first_seen = self.cache.get(self._key('gaps')) or {}
+        gaps = {n: first_seen.get(n, now) for n in range(flushed + 1, seq + 1) if n not in slots}
+        upto, skipped = seq, False
+        for n, since in sorted(gaps.items()):
+            if now - since <= self.stall_timeout:
+                upto = n - 1
+                break
+            skipped = True
+        waiting = {n: since for n, since in gaps.items() if n > upto}
+        if waiting != first_seen:
+            self.cache.set(self._key('gaps'), waiting, timeout=None)
+        return upto, skipped
+
+    def _counted_job_ids(self, batch_size=2000):
+        """Every job with pending views, found by reading each job's count key."""
+        found = set()
+        job_ids = Job.objects.order_by().values_list('pk', flat=True).iterator(chunk_size=batch_size)
+        while batch := list(islice(job_ids, batch_size)):
+            counts = self.cache.get_many([self._key('job', job_id) for job_id in batch])
+            found.update(job_id for job_id in batch if counts.get(self._key('job', job_id)))
+        return found
+
+    def flush(self):
+        """Write pending views to the database; returns the number written."""
+        self._recorded = 0
+        self._last_flush = time.monotonic()
+        lock = self._key('lock')
+        if not self.cache.add(lock, 1, timeout=self.lock_timeout):
+            return 0  # Another process is flushing.
+        try:
+            flushed, seq = self._slot_range()
+            restarted = seq < flushed
+            if restarted:
+                # The seq key was evicted and numbering started over.
+                flushed = 0
+                self.cache.delete(self._key('gaps'))
+            slots = self._read_slots(flushed, seq)
+            upto, skipped = self._readable_upto(slots, flushed, seq)
+            if upto <= flushed and not restarted:
+                return 0
+            job_ids = {slots[n] for n in range(flushed + 1, upto + 1) if n in slots}
+            if skipped or restarted:
+                # A job whose slot was lost only registers again once its
+                # count is flushed back to 0, so sweep for it.
+                job_ids |= self._counted_job_ids()
+            taken = {}
+            for job_id in job_ids:
+                key = self._key('job', job_id)
+                count = self.cache.get(key) or 0
+                if count:
+                    # Subtract exactly what we read so concurrent views survive.
+                    taken[job_id] = count
+                    self.cache.decr(key, count)
+            try:
+                self._write(taken)
+            except Exception:
+                for job_id, count in taken.items():
+                    self._incr(self._key('job', job_id), count)
+                raise
+            self.cache.set(self._key('flushed'), upto, timeout=None)
+            self.cache.delete_many([self._key('slot', n) for n in range(flushed + 1, upto + 1)])
+            for job_id in taken:
+                # Views that arrived mid-flush didn't register a slot; do it now.
+                if self.cache.get(self._key('job', job_id)):
+                    self._register(job_id)
+            return sum(taken.values())
+        finally:
+            self.cache.delete(lock)
+
+    def _write(self, counts):
+        by_increment = defaultdict(list)
+        for job_id, count in counts.items():
+            by_increment[count].append(job_id)
+        with transaction.atomic():
+            for count, job_ids in by_increment.items():
+                Job.objects.filter(pk__in=job_ids).update(views_count=F('views_count') + count)
+
+
+view_counter = ViewCounter()
+
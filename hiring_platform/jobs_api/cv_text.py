@@ -0,0 +1,104 @@
+"""
+Plain-text extraction from uploaded CVs.
+
+PDFs go through a small built-in reader that pulls the text operators out of
+(Flate-compressed) content streams, which covers CVs exported from word
+processors; a full PDF library would read more layouts, but inflates streams
+without a size limit. DOCX is read from its XML, legacy DOC by scanning for
+text runs, and TXT is decoded.
+
+Decompression is bounded: at most ``MAX_TEXT_BYTES`` are inflated from a
+PDF's content streams, and a DOCX body larger than that, or compressed more
+than ``MAX_COMPRESSION_RATIO`` to one, is not read, so a small upload can't
+expand into gigabytes in the worker.
+"""
+import io
+import re
+import zipfile
+import zlib
+from xml.etree import ElementTree
+
+_STREAM_RE = re.compile(rb'stream\r?\n(.*?)\r?\nendstream', re.S)
+_TEXT_OP_RE = re.compile(rb'\((?:\\.|[^\\)])*\)\s*Tj|\[(?:\\.|[^\]])*\]\s*TJ|T\*|Td|TD|ET')
+_STRING_RE = re.compile(rb'\(((?:\\.|[^\\)])*)\)')
+_PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'', b'f': b'',
+                b'(': b'(', b')': b')', b'\\': b'\\'}
+_WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_DOC_RUN_RE = re.compile(rb'(?:[\x20-\x7e]\x00){4,}|[\x20-\x7e]{4,}')
+MAX_TEXT_BYTES = 8 * 1024 * 1024
+MAX_COMPRESSION_RATIO = 100
+
+
+def _unescape_pdf(raw):
+    def replace(match):
+        token = match.group(1)
+        if token[:1].isdigit():
+            return bytes([int(token, 8) & 0xFF])
+        return _PDF_ESCAPES.get(token, token)
+    return re.sub(rb'\\([0-7]{1,3}|.)', replace, raw, flags=re.S)
+
+
+def pdf_text(data):
+    parts = []
+    budget = MAX_TEXT_BYTES
+    for stream in _STREAM_RE.findall(data):
+        if budget <= 0:
+            break
+        try:
+            stream = zlib.decompressobj().decompress(stream, budget)
+            budget -= len(stream)
+        except zlib.error:
+            pass
+        for op in _TEXT_OP_RE.finditer(stream):
+            token = op.group(0)
+            if token[:1] in (b'(', b'['):
+                parts.append(b''.join(_unescape_pdf(s) for s in _STRING_RE.findall(token)))
+            else:
+                parts.append(b' ')
+    return b''.join(parts).decode('latin-1')
+
+
+def docx_text(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        info = archive.getinfo('word/document.xml')
+        # Reads stop at file_size, so checking it bounds what is inflated.
+        if info.file_size > MAX_TEXT_BYTES or info.file_size > MAX_COMPRESSION_RATIO * max(info.compress_size, 1):
+            return ''
+        root = ElementTree.fromstring(archive.read(info))
+    paragraphs = []
+    for paragraph in root.iter(f'{_WORD_NS}p'):
+        paragraphs.append(''.join(node.text or '' for node in paragraph.iter(f'{_WORD_NS}t')))
+    return '\n'.join(paragraphs)
+
+
+def doc_text(data):
+    runs = []
+    for run in _DOC_RUN_RE.findall(data):
+        runs.append(run.decode('utf-16-le') if b'\x00' in run else run.decode('latin-1'))
+    return '\n'.join(runs)
+
+
+def txt_text(data):
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return data.decode('latin-1')
+
+
+EXTRACTORS = {
+    'pdf': pdf_text,
+    'docx': docx_text,
+    'doc': doc_text,
+    'txt': txt_text,
+}
+
+
+def extract_text(data, ext):
+    extractor = EXTRACTORS.get(ext)
+    if extractor is None:
+        return ''
+    try:
+        return extractor(data)
+    except Exception:
+        # A corrupt file yields no text rather than failing its task forever.
+        return ''
@@ -0,0 +1,260 @@
+from collections import defaultdict
+from datetime import date, datetime, time
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import validate_email
+from django.db.models import Count
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Application, ArchivedApplication, ArchivedJob, Interview, Job
+from .saved import MAX_JOB_IDS
+from .search import get_search_backend
+from .skills import match_applications
+from .stats import BUCKET_CHOICES
+
+
+class JobSearchFilter(BaseFilterBackend):
+    """Ranked full-text ``?search=`` backed by the configured search backend."""
+
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return get_search_backend().search(queryset, query)
+
+
+def parse_int(value):
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError('must be an integer') from None
+
+
+def parse_date(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError('must be a date (YYYY-MM-DD)') from None
+
+
+def parse_datetime(value):
+    """ISO 8601 date or datetime; naive values are left for the caller to localize."""
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError('must be an ISO 8601 date or datetime') from None
+
+
+def parse_aware_datetime(value):
+    moment = parse_datetime(value)
+    return timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+
+
+def parse_time(value):
+    try:
+        return time.fromisoformat(value)
+    except ValueError:
+        raise ValueError('must be a time (HH:MM)') from None
+
+
+def parse_timezone(value):
+    try:
+        return ZoneInfo(value)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError('must be an IANA time zone, e.g. Europe/Berlin') from None
+
+
+def parse_bool(value):
+    if value.lower() in ('1', 'true', 'yes'):
+        return True
+    if value.lower() in ('0', 'false', 'no'):
+        return False
+    raise ValueError('must be true or false')
+
+
+def parse_list(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def parse_email(value):
+    try:
+        validate_email(value)
+    except DjangoValidationError:
+        raise ValueError('must be an email address') from None
+    return value
+
+
+def parse_id_list(value):
+    try:
+        ids = [int(item) for item in parse_list(value)]
+    except ValueError:
+        raise ValueError('must be comma-separated integers') from None
+    if len(ids) > MAX_JOB_IDS:
+        raise ValueError(f'at most {MAX_JOB_IDS} ids')
+    return ids
+
+
+def parse_choice(choices):
+    allowed = {key for key, _ in choices}
+
+    def parse(value):
+        if value not in allowed:
+            raise ValueError(f'must be one of: {", ".join(sorted(allowed))}')
+        return value
+    return parse
+
+
+def parse_query_params(params, spec):
+    """
+    ``{name: value}`` for each non-blank query param in ``spec``, a dict of
+    ``param -> (name, parser)``; bad values raise a 400 listing every one.
+    """
+    parsed, errors = {}, {}
+    for param, (name, parser) in spec.items():
+        raw = params.get(param, '').strip()
+        if not raw:
+            continue
+        try:
+            parsed[name] = parser(raw)
+        except ValueError as exc:
+            errors[param] = [str(exc)]
+    if errors:
+        raise ValidationError(errors)
+    return parsed
+
+
+class TypedFilterBackend(BaseFilterBackend):
+    """
+    Maps query params to ORM lookups through ``filters``: a dict of
+    ``param -> (lookup, parser)``. Bad values are reported as a 400 rather than
+    silently ignored.
+    """
+
+    filters = {}
+
+    def parse(self, request):
+        return self.parse_params(request.query_params)
+
+    def parse_params(self, params):
+        return parse_query_params(params, self.filters)
+
+    def filter_queryset(self, request, queryset, view):
+        return queryset.filter(**self.parse(request))
+
+
+class JobFilterBackend(TypedFilterBackend):
+    # Equality filters lead so they can use the (category, status, created_at)
+    # and (status, created_at) indexes; salary bounds use the range index.
+    filters = {
+        'category': ('category_id', parse_int),
+        'status': ('status', parse_choice(Job.STATUS_CHOICES)),
+        'job_type': ('job_type', parse_choice(Job.JOB_TYPE_CHOICES)),
+        'experience_level': ('experience_level', parse_choice(Job.EXPERIENCE_LEVEL_CHOICES)),
+        'location': ('location__icontains', str),
+        'salary_min': ('salary_min__gte', parse_int),
+        'salary_max': ('salary_max__lte', parse_int),
+    }
+
+
+class ApplicationFilterBackend(TypedFilterBackend):
+    filters = {
+        'job': ('job_id', parse_int),
+        'status': ('status', parse_choice(Application.STATUS_CHOICES)),
+    }
+
+
+class ApplicationSkillFilter(BaseFilterBackend):
+    """``?skills=python,django[&min_score=0.5]`` via the candidate skill index."""
+
+    def filter_queryset(self, request, queryset, view):
+        skills = request.query_params.get('skills', '').split(',')
+        if not any(skill.strip() for skill in skills):
+            return queryset
+        try:
+            min_score = float(request.query_params.get('min_score') or 0)
+        except ValueError:
+            raise ValidationError({'min_score': ['must be a number']})
+        return match_applications(queryset, skills, min_score)
+
+
+class InterviewFilterBackend(TypedFilterBackend):
+    # Equality on interviewer or candidate uses their (…, scheduled_at) index.
+    filters = {
+        'interviewer': ('interviewer_name', str),
+        'candidate': ('candidate_email', str),
+        'application': ('application_id', parse_int),
+        'status': ('status', parse_choice(Interview.STATUS_CHOICES)),
+        'from': ('scheduled_at__gte', parse_aware_datetime),
+        'to': ('scheduled_at__lt', parse_aware_datetime),
+    }
+
+
+class SavedJobFilterBackend(TypedFilterBackend):
+    filters = {
+        'candidate': ('candidate_email', parse_email),
+        'job': ('job_id', parse_int),
+    }
+
+
+class ArchivedJobFilterBackend(TypedFilterBackend):
+    filters = {
+        'company': ('company_id', parse_int),
+        'category': ('category_id', parse_int),
+        'status': ('status', parse_choice(ArchivedJob._meta.get_field('status').choices)),
+    }
+
+
+class ArchivedApplicationFilterBackend(TypedFilterBackend):
+    filters = {
+        'job': ('job_id', parse_int),
+        'candidate': ('candidate_email', parse_email),
+        'status': ('status', parse_choice(ArchivedApplication._meta.get_field('status').choices)),
+    }
+
+
+# ``/interviews/free-slots/`` query params, as ``free_slots`` arguments.
+FREE_SLOT_PARAMS = {
+    'interviewers': ('interviewers', parse_list),
+    'application': ('application', parse_int),
+    'start': ('start', parse_datetime),
+    'end': ('end', parse_datetime),
+    'duration': ('duration', parse_int),
+    'step': ('step', parse_int),
+    'limit': ('limit', parse_int),
+    'day_start': ('day_start', parse_time),
+    'day_end': ('day_end', parse_time),
+    'timezone': ('tz', parse_timezone),
+    'weekends': ('weekends', parse_bool),
+}
+
+
+# The stats endpoints' query params, as ``ApplicationStats`` arguments.
+STATS_PARAMS = {
+    'job': ('job', parse_int),
+    'company': ('company', parse_int),
+    'since': ('since', parse_date),
+    'until': ('until', parse_date),
+    'bucket': ('bucket', parse_choice(BUCKET_CHOICES)),
+}
+
+
+FACET_FIELDS = ('job_type', 'experience_level', 'category')
+
+
+def job_facets(queryset):
+    """Counts per job_type / experience_level / category from one GROUP BY."""
+    rows = (
+        queryset.order_by()
+        .values('job_type', 'experience_level', 'category')
+        .annotate(total=Count('id'))
+    )
+    facets = {field: defaultdict(int) for field in FACET_FIELDS}
+    for row in rows:
+        for field in FACET_FIELDS:
+            facets[field][row[field]] += row['total']
+    return {field: dict(counts) for field, counts in facets.items()}
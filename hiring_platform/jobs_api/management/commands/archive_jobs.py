@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs_api.archive import archivable_jobs, archive_jobs
+from jobs_api.models import Application, Interview, Job
+
+
+class Command(BaseCommand):
+    help = 'Move closed jobs and their applications and interviews into the archive tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--status', action='append', choices=[key for key, _ in Job.STATUS_CHOICES],
+            help='Archive jobs in this status (repeatable; default: closed).',
+        )
+        parser.add_argument('--older-than', type=int, default=180, help='Days since the job was last updated.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Jobs per transaction.')
+        parser.add_argument('--limit', type=int, help='Archive at most this many jobs.')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the jobs that would be archived.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['older_than'] < 0:
+            raise CommandError('--batch-size must be positive and --older-than not negative.')
+        queryset = archivable_jobs(options['status'] or ['closed'], timedelta(days=options['older_than']))
+        if options['dry_run']:
+            self.stdout.write(f'{queryset.count()} jobs would be archived.')
+            return
+        before = self.hot_counts()
+        log = (lambda message: self.stdout.write(message)) if options['verbosity'] > 1 else None
+        moved = archive_jobs(queryset, batch_size=options['batch_size'], limit=options['limit'], log=log)
+        after = self.hot_counts()
+        self.stdout.write(self.style.SUCCESS(
+            'Archived ' + ', '.join(f'{count} {name}' for name, count in moved.items()) + '.'
+        ))
+        for name in before:
+            self.stdout.write(f'{name}: {before[name]} -> {after[name]} rows')
+
+    @staticmethod
+    def hot_counts():
+        return {model._meta.db_table: model.objects.count() for model in (Job, Application, Interview)}
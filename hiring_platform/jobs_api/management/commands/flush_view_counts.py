@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from jobs_api.counters import view_counter
+
+
+class Command(BaseCommand):
+    help = 'Write buffered job view counts to the database now.'
+
+    def handle(self, *args, **options):
+        written = view_counter.flush()
+        self.stdout.write(self.style.SUCCESS(f'Flushed {written} job views.'))
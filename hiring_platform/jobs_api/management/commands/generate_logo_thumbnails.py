@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from jobs_api.media import make_logo_thumbnail
+from jobs_api.models import Company
+
+
+class Command(BaseCommand):
+    help = 'Create listing thumbnails for company logos uploaded before they were generated on save.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate existing thumbnails too.')
+
+    def handle(self, *args, force, **options):
+        companies = Company.objects.exclude(logo='').exclude(logo__isnull=True).only('logo', 'logo_thumbnail')
+        if not force:
+            companies = companies.filter(Q(logo_thumbnail__isnull=True) | Q(logo_thumbnail=''))
+        created = failed = 0
+        for company in companies.iterator(chunk_size=200):
+            try:
+                with company.logo.open('rb') as logo:
+                    thumbnail = make_logo_thumbnail(logo)
+            except FileNotFoundError:
+                thumbnail = None
+            if thumbnail is None:
+                failed += 1
+                continue
+            company.logo_thumbnail.save(thumbnail.name, thumbnail, save=False)
+            # queryset.update: no save() logic, no updated_at bump.
+            Company.objects.filter(pk=company.pk).update(logo_thumbnail=company.logo_thumbnail.name)
+            created += 1
+        self.stdout.write(self.style.SUCCESS(f'Created {created} thumbnails ({failed} logos unreadable).'))
@@ -0,0 +1,33 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs_api.bulk import FORMATS, format_for, import_jobs
+
+
+class Command(BaseCommand):
+    help = 'Create or update jobs from a CSV or JSON-lines file (rows with an id update).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or '-' for stdin.")
+        parser.add_argument('--format', choices=FORMATS, help='Defaults to the file extension.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, path, format, batch_size, **options):
+        fmt = format or format_for(path)
+        if fmt is None:
+            raise CommandError('Cannot tell the format from the file name; pass --format.')
+        if path == '-':
+            result = import_jobs(sys.stdin, fmt, batch_size)
+        else:
+            with open(path, newline='', encoding='utf-8') as lines:
+                result = import_jobs(lines, fmt, batch_size)
+        for error in result['errors']:
+            self.stderr.write(f'line {error["line"]}: {json.dumps(error["errors"])}')
+        if result['error_count'] > len(result['errors']):
+            self.stderr.write(f'... {result["error_count"] - len(result["errors"])} more errors')
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {result["created"]}, updated {result["updated"]} jobs; '
+            f'{result["error_count"]} rows rejected.'
+        ))
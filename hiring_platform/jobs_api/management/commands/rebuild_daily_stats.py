@@ -0,0 +1,19 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from jobs_api.stats import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the ApplicationDailyStat rollup from Application rows.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since', type=date.fromisoformat,
+            help='Only rebuild days from this date (YYYY-MM-DD) on.',
+        )
+
+    def handle(self, *args, since=None, **options):
+        written = rebuild_daily_stats(since)
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} daily stat rows.'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from jobs_api.similarity import rebuild_job_vectors
+
+
+class Command(BaseCommand):
+    help = 'Recompute the persisted similar-jobs vector of every job.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, batch_size, **options):
+        count = rebuild_job_vectors(batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f'Vectorized {count} jobs.'))
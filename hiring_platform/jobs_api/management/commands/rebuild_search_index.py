@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from jobs_api.models import Job
+from jobs_api.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text job search index from the jobs table.'
+
+    def handle(self, *args, **options):
+        get_search_backend().rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {Job.objects.count()} jobs.'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from jobs_api.counters import recompute_application_counters
+
+
+class Command(BaseCommand):
+    help = 'Repair drifted Job application counters from one grouped aggregate.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        fixed = recompute_application_counters(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Fixed counters on {fixed} jobs.'))
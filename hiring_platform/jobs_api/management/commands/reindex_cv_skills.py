@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from jobs_api.models import Application, Job, Skill
+from jobs_api.skills import index_application, sync_job_skills
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the skill vocabulary from jobs and re-index every CV against it.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, batch_size, **options):
+        for job in Job.objects.only('skills_required').iterator(chunk_size=batch_size):
+            sync_job_skills(job)
+        vocabulary = dict(Skill.objects.values_list('name', 'id'))
+        indexed = 0
+        for application in Application.objects.only('cv').iterator(chunk_size=batch_size):
+            index_application(application, vocabulary)
+            indexed += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {indexed} applications against {len(vocabulary)} skills.'
+        ))
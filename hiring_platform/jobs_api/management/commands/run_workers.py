@@ -0,0 +1,54 @@
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs_api.queue import default_worker_id, run_pending
+
+
+def _init_process():
+    # Forked children must not share the parent's database connections.
+    django.setup()
+    connections.close_all()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def work(batch_size, poll_interval, once, stop=lambda: False):
+    worker_id = default_worker_id()
+    processed = 0
+    while not stop():
+        ran = run_pending(worker_id, batch_size)
+        processed += ran
+        if not ran:
+            if once:
+                break
+            time.sleep(poll_interval)
+    return processed
+
+
+class Command(BaseCommand):
+    help = 'Run background task workers against the database queue.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=2,
+                            help='Worker processes; 1 runs in this process.')
+        parser.add_argument('--batch-size', type=int, default=10)
+        parser.add_argument('--poll-interval', type=float, default=1.0)
+        parser.add_argument('--once', action='store_true',
+                            help='Exit once no task is due instead of polling.')
+
+    def handle(self, *args, processes, batch_size, poll_interval, once, **options):
+        if processes <= 1:
+            processed = work(batch_size, poll_interval, once)
+        else:
+            connections.close_all()
+            with ProcessPoolExecutor(processes, initializer=_init_process) as pool:
+                futures = [
+                    pool.submit(work, batch_size, poll_interval, once)
+                    for _ in range(processes)
+                ]
+                processed = sum(future.result() for future in futures)
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} tasks.'))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs_api.seeding import Seeder
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic companies, jobs, applications, saved jobs and interviews in bulk.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--companies', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=12)
+        parser.add_argument('--jobs', type=int, default=20_000)
+        parser.add_argument('--applications', type=int, default=100_000)
+        parser.add_argument('--saved-jobs', type=int, default=50_000)
+        parser.add_argument('--interviews', type=int, default=10_000)
+        parser.add_argument('--days', type=int, default=365, help='Spread timestamps over this many days.')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; same seed, same data.')
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if options['companies'] < 1 or options['categories'] < 0:
+            raise CommandError('Need at least one company.')
+        if options['jobs'] < 1 and (options['applications'] or options['saved_jobs']):
+            raise CommandError('Applications and saved jobs need at least one job.')
+        log = (lambda message: self.stdout.write(message)) if options['verbosity'] > 1 else None
+        seeder = Seeder(seed=options['seed'], days=options['days'], batch_size=options['batch_size'], log=log)
+        counts = seeder.run(
+            options['companies'], options['categories'], options['jobs'], options['applications'],
+            options['saved_jobs'], options['interviews'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            'Created ' + ', '.join(f'{count} {name.replace("_", " ")}' for name, count in counts.items()) + '.'
+        ))
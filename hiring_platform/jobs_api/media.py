@@ -0,0 +1,171 @@
+"""
+Media delivery: CV downloads, company logos and logo thumbnails.
+
+``serve_file`` answers conditional requests (``If-None-Match`` /
+``If-Modified-Since``) with 304 before touching the file, then either hands
+the file to the web server or streams it itself:
+
+* ``MEDIA_OFFLOAD = 'x-accel-redirect'`` (nginx) or ``'x-sendfile'`` (Apache
+  mod_xsendfile, lighttpd) returns an empty response carrying the header;
+  the server sends the bytes, ranges included, and the worker is free at
+  once. For nginx, ``MEDIA_ACCEL_PREFIX`` names an ``internal`` location
+  aliased to ``MEDIA_ROOT``.
+* Otherwise a ``FileResponse`` streams the file in ``BLOCK_SIZE`` chunks and
+  honours a single ``Range: bytes=`` (with ``If-Range``) with a 206.
+  Multi-range requests get the whole file, which RFC 9110 allows.
+
+Logos are thumbnailed when uploaded (``make_logo_thumbnail``) so listings
+link a small image rather than the original.
+"""
+import logging
+import mimetypes
+import re
+from io import BytesIO
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+OFFLOAD_HEADERS = {'x-sendfile': 'X-Sendfile', 'x-accel-redirect': 'X-Accel-Redirect'}
+BLOCK_SIZE = 64 * 1024
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header, size):
+    """
+    ``(start, end)``, inclusive, for a single-range ``Range`` header, or None
+    to send the whole file. Raises ``RangeNotSatisfiable`` for a range that
+    starts past the end.
+    """
+    match = _RANGE_RE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        # Suffix range: the last N bytes.
+        if int(last) == 0:
+            raise RangeNotSatisfiable
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    """False when ``If-Range`` names another version of the file."""
+    validator = request.headers.get('If-Range')
+    if not validator:
+        return True
+    if validator.startswith(('"', 'W/')):
+        # Weak validators never match (RFC 9110 §13.1.5).
+        return validator == etag
+    return parse_http_date_safe(validator) == last_modified
+
+
+class _FileRange:
+    """Reads ``length`` bytes of ``file`` from ``start``, for ``FileResponse``."""
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        size = self.remaining if size < 0 else min(size, self.remaining)
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def offload_mode():
+    mode = getattr(settings, 'MEDIA_OFFLOAD', None)
+    if mode and mode not in OFFLOAD_HEADERS:
+        raise ImproperlyConfigured(f'MEDIA_OFFLOAD must be one of: {", ".join(OFFLOAD_HEADERS)}')
+    return mode
+
+
+def serve_file(request, storage, name, filename=None, attachment=False, cache_control='private, no-cache'):
+    """Respond with ``name`` from ``storage``: 304, offloaded, 206 or streamed whole."""
+    try:
+        size = storage.size(name)
+        last_modified = int(storage.get_modified_time(name).timestamp())
+    except (FileNotFoundError, NotImplementedError):
+        raise Http404
+    etag = f'"{last_modified:x}-{size:x}"'
+    headers = {'ETag': etag, 'Last-Modified': http_date(last_modified), 'Cache-Control': cache_control}
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        for header, value in headers.items():
+            not_modified[header] = value
+        return not_modified
+
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    headers['Content-Type'] = content_type
+    if attachment or filename:
+        headers['Content-Disposition'] = content_disposition_header(attachment, filename or name.rsplit('/', 1)[-1])
+    mode = offload_mode()
+    if mode == 'x-sendfile':
+        return HttpResponse(headers={**headers, 'X-Sendfile': storage.path(name)})
+    if mode == 'x-accel-redirect':
+        prefix = getattr(settings, 'MEDIA_ACCEL_PREFIX', '/protected-media/').rstrip('/')
+        return HttpResponse(headers={**headers, 'X-Accel-Redirect': f'{prefix}/{name}'})
+
+    headers['Accept-Ranges'] = 'bytes'
+    byte_range = None
+    if request.headers.get('Range') and _if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = parse_range(request.headers['Range'], size)
+        except RangeNotSatisfiable:
+            return HttpResponse(status=416, headers={**headers, 'Content-Range': f'bytes */{size}'})
+    file = storage.open(name, 'rb')
+    # FileResponse writes Content-Disposition itself.
+    headers.pop('Content-Disposition', None)
+    download = {'as_attachment': attachment, 'filename': filename or name.rsplit('/', 1)[-1]}
+    if byte_range is None:
+        response = FileResponse(file, headers=headers, **download)
+        response['Content-Length'] = size
+    else:
+        start, end = byte_range
+        response = FileResponse(_FileRange(file, start, end - start + 1), status=206, headers=headers, **download)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = end - start + 1
+    response.block_size = BLOCK_SIZE
+    return response
+
+
+def make_logo_thumbnail(logo, size=None):
+    """A WebP of ``logo`` fitted inside ``size`` pixels square, or None if it can't be read."""
+    size = size or getattr(settings, 'LOGO_THUMBNAIL_SIZE', 128)
+    try:
+        logo.seek(0)
+        with Image.open(logo) as image:
+            thumbnail = ImageOps.exif_transpose(image)
+            thumbnail.thumbnail((size, size), Image.Resampling.LANCZOS)
+            if thumbnail.mode not in ('RGB', 'RGBA'):
+                thumbnail = thumbnail.convert('RGBA')
+            out = BytesIO()
+            thumbnail.save(out, 'WEBP', quality=85)
+    except (OSError, Image.DecompressionBombError) as exc:
+        logger.warning('Could not thumbnail logo %s: %s', logo.name, exc)
+        return None
+    finally:
+        logo.seek(0)
+    stem = logo.name.rsplit('/', 1)[-1].rsplit('.', 1)[0]
+    return ContentFile(out.getvalue(), name=f'{stem}.webp')
@@ -0,0 +1,234 @@
+"""
+Request instrumentation, exported in the Prometheus text format at ``/metrics``.
+
+``InstrumentationMiddleware`` records, per route (URL name) and method:
+
+* ``http_request_duration_seconds`` - latency histogram, also by status code
+* ``http_response_size_bytes`` - body size histogram (non-streaming responses)
+* ``http_request_db_queries_total`` / ``http_request_db_seconds_total`` - from
+  a ``connection.execute_wrapper``
+* ``http_request_render_seconds_total`` - DRF response rendering (JSON
+  encoding); time in the view outside queries is mostly serializer work
+
+Queries slower than ``METRICS_SLOW_QUERY_MS`` are logged and the latest
+``METRICS_SLOW_QUERY_SAMPLES`` are listed at ``/metrics/slow-queries``.
+``METRICS_SERVER_TIMING`` adds a ``Server-Timing`` header (db / app / render /
+total) that browser dev tools show per request.
+
+Everything is off unless ``METRICS_ENABLED``: the middleware then removes
+itself from the stack (``MiddlewareNotUsed``) and no query wrapper is
+installed. Metrics are per process; scrape each worker, or aggregate in the
+collector.
+"""
+import contextvars
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict, deque
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        # bisect_left: a value equal to a bound falls in that bucket (le).
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RequestMetrics:
+    """What one request has spent so far."""
+
+    __slots__ = ('start', 'queries', 'db_seconds', 'render_start', 'render_seconds', 'slow_queries')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.render_start = None
+        self.render_seconds = 0.0
+        self.slow_queries = []
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+class MetricsRegistry:
+    def __init__(self, slow_query_samples=50):
+        self._lock = threading.Lock()
+        self.durations = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+        self.sizes = defaultdict(lambda: Histogram(SIZE_BUCKETS))
+        self.queries = defaultdict(int)
+        self.db_seconds = defaultdict(float)
+        self.render_seconds = defaultdict(float)
+        self.slow_queries = deque(maxlen=slow_query_samples)
+
+    def record(self, route, method, status, seconds, size, request_metrics):
+        key = (route, method)
+        with self._lock:
+            self.durations[(route, method, status)].observe(seconds)
+            if size is not None:
+                self.sizes[key].observe(size)
+            self.queries[key] += request_metrics.queries
+            self.db_seconds[key] += request_metrics.db_seconds
+            self.render_seconds[key] += request_metrics.render_seconds
+            for sql, duration in request_metrics.slow_queries:
+                self.slow_queries.append({
+                    'route': route, 'method': method, 'sql': sql,
+                    'duration_ms': round(duration * 1000, 3), 'at': time.time(),
+                })
+
+    def reset(self):
+        with self._lock:
+            for metric in (self.durations, self.sizes, self.queries, self.db_seconds,
+                           self.render_seconds, self.slow_queries):
+                metric.clear()
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            self._histogram(lines, 'http_request_duration_seconds', 'Request latency.', self.durations,
+                            ('route', 'method', 'status'))
+            self._histogram(lines, 'http_response_size_bytes', 'Response body size.', self.sizes,
+                            ('route', 'method'))
+            for name, help_text, values in (
+                ('http_request_db_queries_total', 'Database queries run by requests.', self.queries),
+                ('http_request_db_seconds_total', 'Time spent in database queries.', self.db_seconds),
+                ('http_request_render_seconds_total', 'Time spent rendering responses.', self.render_seconds),
+            ):
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+                for (route, method), value in sorted(values.items()):
+                    lines.append(f'{name}{{{_labels(route=route, method=method)}}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _histogram(lines, name, help_text, histograms, label_names):
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+        for key, histogram in sorted(histograms.items()):
+            labels = _labels(**dict(zip(label_names, key)))
+            cumulative = 0
+            for bound, count in zip((*histogram.buckets, '+Inf'), histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+            lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+
+
+registry = MetricsRegistry(getattr(settings, 'METRICS_SLOW_QUERY_SAMPLES', 50))
+
+
+def track_query(execute, sql, params, many, context):
+    request_metrics = _current.get()
+    if request_metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - start
+        request_metrics.queries += 1
+        request_metrics.db_seconds += elapsed
+        if elapsed * 1000 >= getattr(settings, 'METRICS_SLOW_QUERY_MS', 100):
+            request_metrics.slow_queries.append((sql[:2000], elapsed))
+            logger.warning('Slow query (%.1f ms): %s', elapsed * 1000, sql[:2000])
+
+
+def _attach(connection, **kwargs):
+    if track_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(track_query)
+
+
+def install_query_tracking():
+    """Wrap every database connection, including ones already open."""
+    connection_created.connect(_attach, dispatch_uid='jobs_api.metrics')
+    for connection in connections.all(initialized_only=True):
+        _attach(connection)
+
+
+class InstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.server_timing = getattr(settings, 'METRICS_SERVER_TIMING', False)
+        install_query_tracking()
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        request_metrics = RequestMetrics()
+        token = _current.set(request_metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, request_metrics)
+
+    async def __acall__(self, request):
+        request_metrics = RequestMetrics()
+        token = _current.set(request_metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, request_metrics)
+
+    def process_template_response(self, request, response):
+        # DRF renders after the view returns; time it with a post-render callback.
+        request_metrics = _current.get()
+        if request_metrics is not None:
+            request_metrics.render_start = time.perf_counter()
+            response.add_post_render_callback(lambda rendered: self._rendered(request_metrics))
+        return response
+
+    @staticmethod
+    def _rendered(request_metrics):
+        request_metrics.render_seconds = time.perf_counter() - request_metrics.render_start
+
+    def finish(self, request, response, request_metrics):
+        seconds = time.perf_counter() - request_metrics.start
+        match = request.resolver_match
+        route = (match.view_name or match.route) if match else 'unmatched'
+        size = None if response.streaming else len(response.content)
+        registry.record(route, request.method, response.status_code, seconds, size, request_metrics)
+        if self.server_timing:
+            db = request_metrics.db_seconds * 1000
+            render = request_metrics.render_seconds * 1000
+            total = seconds * 1000
+            response['Server-Timing'] = (
+                f'db;dur={db:.2f};desc="{request_metrics.queries} queries", '
+                f'app;dur={max(total - db - render, 0):.2f}, '
+                f'render;dur={render:.2f}, total;dur={total:.2f}'
+            )
+        return response
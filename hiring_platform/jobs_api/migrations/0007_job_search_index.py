@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_api_job_fts USING fts5("
+        "title, description, requirements, skills_required, "
+        "tokenize = 'porter unicode61', prefix = '2 3')"
+    )
+    schema_editor.execute(
+        "INSERT INTO jobs_api_job_fts (rowid, title, description, requirements, skills_required) "
+        "SELECT id, title, description, requirements, skills_required FROM jobs_api_job"
+    )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS jobs_api_job_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs_api', '0006_alter_company_user'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
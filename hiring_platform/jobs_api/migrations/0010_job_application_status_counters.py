@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:14
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_counters(apps, schema_editor):
+    Application = apps.get_model('jobs_api', 'Application')
+    Job = apps.get_model('jobs_api', 'Job')
+    rows = Application.objects.order_by().values('job_id').annotate(
+        applications_count=Count('pk'),
+        pending_applications_count=Count(
+            'pk', filter=Q(status__in=['submitted', 'reviewing', 'interview'])),
+        accepted_applications_count=Count('pk', filter=Q(status='accepted')),
+        rejected_applications_count=Count('pk', filter=Q(status='rejected')),
+    )
+    Job.objects.bulk_update(
+        [Job(pk=row.pop('job_id'), **row) for row in rows],
+        ['applications_count', 'pending_applications_count',
+         'accepted_applications_count', 'rejected_applications_count'],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs_api', '0009_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='accepted_applications_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='pending_applications_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='rejected_applications_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
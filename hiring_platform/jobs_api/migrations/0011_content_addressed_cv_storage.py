@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:16
+
+import django.core.validators
+import jobs_api.uploads
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs_api', '0010_job_application_status_counters'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='application',
+            name='cv',
+            field=models.FileField(storage=jobs_api.uploads.cv_storage, upload_to=jobs_api.uploads.cv_upload_to, validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx', 'txt'])]),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill_daily_stats(apps, schema_editor):
+    Application = apps.get_model('jobs_api', 'Application')
+    ApplicationDailyStat = apps.get_model('jobs_api', 'ApplicationDailyStat')
+    rows = (
+        Application.objects.order_by()
+        .annotate(day=TruncDate('submitted_at'))
+        .values('job_id', 'day', 'status')
+        .annotate(count=Count('pk'))
+    )
+    ApplicationDailyStat.objects.bulk_create(
+        [ApplicationDailyStat(**row) for row in rows.iterator()], batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs_api', '0013_cv_skill_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(choices=[('submitted', 'Submitted'), ('reviewing', 'Reviewing'), ('interview', 'Interview'), ('rejected', 'Rejected'), ('accepted', 'Accepted')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='jobs_api.job')),
+            ],
+            options={
+                'ordering': ['day'],
+                'indexes': [models.Index(fields=['day'], name='app_daily_stat_day_idx')],
+                'unique_together': {('job', 'day', 'status')},
+            },
+        ),
+        migrations.RunPython(backfill_daily_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs_api', '0014_application_daily_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobVector',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='vector', serialize=False, to='jobs_api.job')),
+                ('terms', models.BinaryField()),
+                ('weights', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:05
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_interviews(apps, schema_editor):
+    Application = apps.get_model('jobs_api', 'Application')
+    Interview = apps.get_model('jobs_api', 'Interview')
+    Interview.objects.update(candidate_email=Subquery(
+        Application.objects.filter(pk=OuterRef('application_id')).values('candidate_email')[:1]
+    ))
+    batch = []
+    for interview in Interview.objects.only('scheduled_at', 'duration_minutes').iterator(chunk_size=2000):
+        interview.ends_at = interview.scheduled_at + timedelta(minutes=interview.duration_minutes)
+        batch.append(interview)
+        if len(batch) == 2000:
+            Interview.objects.bulk_update(batch, ['ends_at'])
+            batch = []
+    Interview.objects.bulk_update(batch, ['ends_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs_api', '0015_job_vectors'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interview',
+            name='candidate_email',
+            field=models.EmailField(default='', editable=False, max_length=254),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='interview',
+            name='ends_at',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_interviews, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='interview',
+            name='ends_at',
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['interviewer_name', 'scheduled_at'], name='interview_interviewer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['candidate_email', 'scheduled_at'], name='interview_candidate_idx'),
+        ),
+    ]
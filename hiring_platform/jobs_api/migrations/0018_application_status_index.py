@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs_api', '0017_job_archive'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['status', '-submitted_at'], name='app_status_submitted_idx'),
+        ),
+    ]
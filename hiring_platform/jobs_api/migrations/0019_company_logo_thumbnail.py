@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs_api', '0018_application_status_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='logo_thumbnail',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='company_logos/thumbnails/'),
+        ),
+    ]
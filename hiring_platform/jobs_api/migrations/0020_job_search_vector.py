@@ -0,0 +1,40 @@
+from django.db import migrations
+
+# Must match the weights PostgresSearchBackend ranks with.
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(skills_required, '')), 'B') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(requirements, '')), 'C') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'D')"
+)
+
+
+def add_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        f"ALTER TABLE jobs_api_job ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED"
+    )
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS jobs_api_job_search_vector_gin "
+        "ON jobs_api_job USING gin (search_vector)"
+    )
+
+
+def drop_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS jobs_api_job_search_vector_gin")
+    schema_editor.execute("ALTER TABLE jobs_api_job DROP COLUMN IF EXISTS search_vector")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs_api', '0019_company_logo_thumbnail'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_vector, drop_search_vector),
+    ]
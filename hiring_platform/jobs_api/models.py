@@ -1,26 +1,408 @@
-from django.db import models
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import FileExtensionValidator
+from django.db import models, transaction
+
+from .media import make_logo_thumbnail
+from .uploads import cv_storage, cv_upload_to
+
 
 class JobCategory(models.Model):
-    name = models.CharField(max_length=100)
-    slug = models.SlugField(unique=True)
+    name = models.CharField(max_length=100, unique=True)
+    description = models.TextField(blank=True, null=True)
+    icon = models.CharField(max_length=50, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        ordering = ['name']
+        verbose_name_plural = 'Job Categories'
+
+    def __str__(self):
+        return self.name
+
+
 class Company(models.Model):
-    name = models.CharField(max_length=200)
-    email = models.EmailField(unique=True)
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+        related_name='company', blank=True, null=True,
+    )
+    name = models.CharField(max_length=200, unique=True)
+    description = models.TextField(blank=True, null=True)
+    website = models.URLField(blank=True, null=True)
+    logo = models.ImageField(upload_to='company_logos/', blank=True, null=True)
+    # Small WebP of the logo for listings, made on upload (see jobs_api/media.py).
+    logo_thumbnail = models.ImageField(
+        upload_to='company_logos/thumbnails/', blank=True, null=True, editable=False,
+    )
     location = models.CharField(max_length=200)
-    industry = models.CharField(max_length=100)
+    industry = models.CharField(max_length=100, blank=True, null=True)
+    employee_count = models.CharField(max_length=50, blank=True, null=True)
+    founded_year = models.IntegerField(blank=True, null=True)
+    phone = models.CharField(max_length=20, blank=True, null=True)
+    email = models.EmailField()
+    verified = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name_plural = 'Companies'
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        if self.logo and not self.logo._committed:
+            thumbnail = make_logo_thumbnail(self.logo)
+            if thumbnail is not None:
+                self.logo_thumbnail.save(thumbnail.name, thumbnail, save=False)
+            else:
+                self.logo_thumbnail = None
+        elif not self.logo:
+            self.logo_thumbnail = None
+        if kwargs.get('update_fields') is not None and 'logo' in kwargs['update_fields']:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'logo_thumbnail'}
+        super().save(*args, **kwargs)
+
 
 class Job(models.Model):
+    JOB_TYPE_CHOICES = [
+        ('Full-time', 'Full-time'),
+        ('Part-time', 'Part-time'),
+        ('Contract', 'Contract'),
+        ('Freelance', 'Freelance'),
+        ('Internship', 'Internship'),
+    ]
+    EXPERIENCE_LEVEL_CHOICES = [
+        ('Entry', 'Entry Level'),
+        ('Mid', 'Mid Level'),
+        ('Senior', 'Senior'),
+    ]
+    STATUS_CHOICES = [
+        ('open', 'Open'),
+        ('closed', 'Closed'),
+        ('on_hold', 'On Hold'),
+    ]
+
     title = models.CharField(max_length=200)
-    company = models.ForeignKey(Company, on_delete=models.CASCADE)
-    location = models.CharField(max_length=200)
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='jobs')
+    category = models.ForeignKey(
+        JobCategory, on_delete=models.SET_NULL, related_name='jobs', null=True,
+    )
+    location = models.CharField(max_length=150)
     description = models.TextField()
+    requirements = models.TextField(default='')
+    salary_min = models.IntegerField(blank=True, null=True)
+    salary_max = models.IntegerField(blank=True, null=True)
+    salary_currency = models.CharField(max_length=10, default='USD')
+    job_type = models.CharField(max_length=50, choices=JOB_TYPE_CHOICES, default='Full-time')
+    experience_level = models.CharField(
+        max_length=50, choices=EXPERIENCE_LEVEL_CHOICES, default='Entry',
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='open')
+    skills_required = models.TextField(blank=True, help_text='Comma-separated skills')
+    benefits = models.TextField(blank=True, null=True)
+    applications_count = models.IntegerField(default=0)
+    pending_applications_count = models.IntegerField(default=0)
+    accepted_applications_count = models.IntegerField(default=0)
+    rejected_applications_count = models.IntegerField(default=0)
+    views_count = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name_plural = 'Jobs'
+        indexes = [
+            models.Index(fields=['status', '-created_at'], name='job_status_created_idx'),
+            models.Index(
+                fields=['category', 'status', '-created_at'], name='job_cat_status_created_idx',
+            ),
+            models.Index(fields=['salary_min', 'salary_max'], name='job_salary_range_idx'),
+            models.Index(fields=['-created_at', '-id'], name='job_created_id_idx'),
+        ]
+
+    # Only ever written as UPDATE ... SET col = col + n (jobs_api/counters.py).
+    COUNTER_FIELDS = (
+        'applications_count', 'pending_applications_count', 'accepted_applications_count',
+        'rejected_applications_count', 'views_count',
+    )
+
+    def __str__(self):
+        return self.title
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            # Writing back the counters loaded with the row would undo
+            # increments and view flushes made since.
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
 
 class Application(models.Model):
-    job = models.ForeignKey(Job, on_delete=models.CASCADE)
-    candidate_name = models.CharField(max_length=200)
+    STATUS_CHOICES = [
+        ('submitted', 'Submitted'),
+        ('reviewing', 'Reviewing'),
+        ('interview', 'Interview'),
+        ('rejected', 'Rejected'),
+        ('accepted', 'Accepted'),
+    ]
+    RATING_CHOICES = [(i, i) for i in range(1, 6)]
+    # Job counter column tracking applications in each status.
+    STATUS_COUNTERS = {
+        'submitted': 'pending_applications_count',
+        'reviewing': 'pending_applications_count',
+        'interview': 'pending_applications_count',
+        'accepted': 'accepted_applications_count',
+        'rejected': 'rejected_applications_count',
+    }
+
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='applications')
+    candidate_name = models.CharField(max_length=150)
     candidate_email = models.EmailField()
-    cv = models.FileField(upload_to='cvs/')
-    applied_at = models.DateTimeField(auto_now_add=True)
+    phone_number = models.CharField(max_length=20)
+    candidate_message = models.TextField(blank=True, null=True)
+    cv = models.FileField(
+        upload_to=cv_upload_to,
+        storage=cv_storage,
+        validators=[FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx', 'txt'])],
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='submitted')
+    rating = models.IntegerField(choices=RATING_CHOICES, blank=True, null=True)
+    notes = models.TextField(blank=True, null=True)
+    submitted_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-submitted_at']
+        verbose_name_plural = 'Applications'
+        unique_together = [('job', 'candidate_email')]
+        indexes = [
+            models.Index(fields=['-submitted_at', '-id'], name='application_submitted_id_idx'),
+            models.Index(fields=['status', '-submitted_at'], name='app_status_submitted_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.candidate_name} - {self.job}'
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so post_save can move Job counters on status/job changes.
+        instance._loaded_counter_state = (
+            instance.__dict__.get('job_id'), instance.__dict__.get('status'),
+        )
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Makes the row write and the Job counter updates in post_save atomic.
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+        self._loaded_counter_state = (self.job_id, self.status)
+
+
+class SavedJob(models.Model):
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='saved_by')
+    candidate_email = models.EmailField()
+    saved_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = [('candidate_email', 'job')]
+
+
+class Interview(models.Model):
+    INTERVIEW_TYPE_CHOICES = [
+        ('phone', 'Phone'),
+        ('video', 'Video Call'),
+        ('in_person', 'In-person'),
+        ('assignment', 'Assignment'),
+    ]
+    STATUS_CHOICES = [
+        ('scheduled', 'Scheduled'),
+        ('completed', 'Completed'),
+        ('cancelled', 'Cancelled'),
+        ('rescheduled', 'Rescheduled'),
+    ]
+    RATING_CHOICES = [(i, i) for i in range(1, 11)]
+
+    application = models.ForeignKey(
+        Application, on_delete=models.CASCADE, related_name='interviews',
+    )
+    interview_type = models.CharField(max_length=20, choices=INTERVIEW_TYPE_CHOICES)
+    scheduled_at = models.DateTimeField()
+    duration_minutes = models.IntegerField(default=30)
+    interviewer_name = models.CharField(max_length=150)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='scheduled')
+    notes = models.TextField(blank=True, null=True)
+    rating = models.IntegerField(choices=RATING_CHOICES, blank=True, null=True)
+    # Denormalized on save for the overlap checks in jobs_api/scheduling.py.
+    ends_at = models.DateTimeField(editable=False)
+    candidate_email = models.EmailField(editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-scheduled_at']
+        indexes = [
+            models.Index(fields=['interviewer_name', 'scheduled_at'], name='interview_interviewer_idx'),
+            models.Index(fields=['candidate_email', 'scheduled_at'], name='interview_candidate_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.ends_at = self.scheduled_at + timedelta(minutes=self.duration_minutes)
+        self.candidate_email = self.application.candidate_email
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'ends_at', 'candidate_email'}
+        super().save(*args, **kwargs)
+
+
+class BackgroundTask(models.Model):
+    """A unit of work for ``manage.py run_workers`` (see jobs_api/queue.py)."""
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    name = models.CharField(max_length=200)
+    payload = models.JSONField(default=dict, blank=True)
+    idempotency_key = models.CharField(max_length=200, unique=True, blank=True, null=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=5)
+    run_at = models.DateTimeField()
+    locked_by = models.CharField(max_length=100, blank=True, null=True)
+    locked_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['run_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='task_status_run_at_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} #{self.pk} ({self.status})'
+
+
+class Skill(models.Model):
+    """Normalized skill name; the vocabulary comes from ``Job.skills_required``."""
+
+    name = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class CVText(models.Model):
+    """Extracted CV text, keyed by content hash so identical CVs are parsed once."""
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    text = models.TextField(blank=True)
+    extracted_at = models.DateTimeField(auto_now=True)
+
+
+class ApplicationSkill(models.Model):
+    """Inverted index of skills found in each application's CV."""
+
+    application = models.ForeignKey(
+        Application, on_delete=models.CASCADE, related_name='skill_links',
+    )
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='application_links')
+
+    class Meta:
+        # Leads with skill so "who has python" is an index range scan.
+        unique_together = [('skill', 'application')]
+
+
+class ApplicationDailyStat(models.Model):
+    """
+    Applications per job, submission day and current status; a materialized
+    rollup of ``Application`` kept current by signals (see ``stats.py``).
+    """
+
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='daily_stats')
+    day = models.DateField()
+    status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['day']
+        unique_together = [('job', 'day', 'status')]
+        indexes = [
+            models.Index(fields=['day'], name='app_daily_stat_day_idx'),
+        ]
+
+
+class JobVector(models.Model):
+    """Persisted term vector of a job for similar-job lookups (see ``similarity.py``)."""
+
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name='vector')
+    terms = models.BinaryField()
+    weights = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+
+# Cold storage for ``manage.py archive_jobs`` (see ``archive.py``). Rows keep
+# their original ids; ``data`` is a snapshot of every column at archival time,
+# and the columns the archive is filtered or ordered on are copied out of it.
+
+class ArchivedJob(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='archived_jobs')
+    category = models.ForeignKey(
+        JobCategory, on_delete=models.SET_NULL, related_name='archived_jobs', null=True,
+    )
+    title = models.CharField(max_length=200)
+    status = models.CharField(max_length=20, choices=Job.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField()
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='archived_job_created_id_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class ArchivedApplication(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    job = models.ForeignKey(ArchivedJob, on_delete=models.CASCADE, related_name='applications')
+    candidate_email = models.EmailField(db_index=True)
+    status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    submitted_at = models.DateTimeField()
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+
+    class Meta:
+        ordering = ['-submitted_at', '-id']
+        indexes = [
+            models.Index(fields=['-submitted_at', '-id'], name='archived_app_submitted_id_idx'),
+        ]
+
+
+class ArchivedInterview(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    application = models.ForeignKey(ArchivedApplication, on_delete=models.CASCADE, related_name='interviews')
+    scheduled_at = models.DateTimeField()
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+
+    class Meta:
+        ordering = ['scheduled_at', 'id']
@@ -0,0 +1,186 @@
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _is_true(value):
+    return str(value).lower() in ('1', 'true', 'yes')
+
+
+class KeysetPagination:
+    """
+    Seek pagination over the view's ``keyset_ordering`` (e.g. ``('-created_at',
+    '-id')``). Each page is a single ``WHERE (created_at, id) < (...) LIMIT n``
+    query, so page 10,000 costs the same as page 1 and rows inserted between
+    requests can't shift items across page boundaries.
+    """
+
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, ordering, page_size):
+        self.ordering = ordering
+        self.page_size = page_size
+
+    @staticmethod
+    def _split(term):
+        return term.lstrip('-'), term.startswith('-')
+
+    def encode_cursor(self, obj):
+        values = []
+        for term in self.ordering:
+            name, _ = self._split(term)
+            value = getattr(obj, name)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def decode_cursor(self, model, cursor):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                model._meta.get_field(self._split(term)[0]).to_python(value)
+                for term, value in zip(self.ordering, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def seek(self, values):
+        # Expands a row comparison so it works on every backend:
+        # (a, b) < (x, y)  ==  a < x OR (a = x AND b < y)
+        condition, equal = Q(), Q()
+        for term, value in zip(self.ordering, values):
+            name, descending = self._split(term)
+            lookup = 'lt' if descending else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def paginate_queryset(self, queryset, request):
+        self.request = request
+        queryset = queryset.order_by(*self.ordering)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.seek(self.decode_cursor(queryset.model, cursor)))
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, 'page')
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+
+class ListPagination(PageNumberPagination):
+    """
+    Page-number pagination with two per-request opt-ins:
+
+    * ``?pagination=cursor`` (or any ``?cursor=``) switches to keyset paging
+      on the view's ``keyset_ordering``.
+    * ``?count=false`` skips the ``COUNT(*)`` in page-number mode.
+
+    Keyset responses never include a count unless ``?count=true``. Keyset
+    paging can't follow any other order, so a request that asks for one
+    (``?ordering=``, or ``?search=`` ranking) together with a cursor is a 400.
+    """
+
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    mode_query_param = 'pagination'
+    count_query_param = 'count'
+
+    def use_keyset(self, request, view):
+        if getattr(view, 'keyset_ordering', None) is None:
+            return False
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or KeysetPagination.cursor_query_param in request.query_params
+        )
+
+    @staticmethod
+    def follows_keyset(queryset, ordering):
+        """Whether ``queryset`` is unordered or ordered by a prefix of ``ordering``."""
+        order_by = list(queryset.query.order_by)
+        return order_by == list(ordering[:len(order_by)])
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.keyset = None
+        self.count = None
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        if self.use_keyset(request, view):
+            if not self.follows_keyset(queryset, view.keyset_ordering):
+                raise ValidationError({self.mode_query_param: [
+                    'Cursor pagination only follows the default order; '
+                    'use page numbers with ?search= or ?ordering=.'
+                ]})
+            if _is_true(request.query_params.get(self.count_query_param)):
+                self.count = queryset.count()
+            self.keyset = KeysetPagination(view.keyset_ordering, page_size)
+            return self.keyset.paginate_queryset(queryset, request)
+
+        if _is_true(request.query_params.get(self.count_query_param, 'true')):
+            return super().paginate_queryset(queryset, request, view)
+
+        # Uncounted page-number mode: probe one extra row instead of COUNT(*).
+        try:
+            self.page_number = int(request.query_params.get(self.page_query_param, 1))
+            if self.page_number < 1:
+                raise ValueError
+        except ValueError:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=request.query_params.get(self.page_query_param), message='',
+            ))
+        offset = (self.page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page_rows = rows[:page_size]
+        self.page = None
+        return self.page_rows
+
+    def get_next_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_next_link()
+        if self.page is not None:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        if self.keyset is not None:
+            return None
+        if self.page is not None:
+            return super().get_previous_link()
+        if self.page_number <= 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page_number - 1)
+
+    def get_paginated_response(self, data):
+        if self.keyset is None and self.page is not None:
+            return super().get_paginated_response(data)
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count is not None:
+            payload = {'count': self.count, **payload}
+        return Response(payload)
@@ -0,0 +1,133 @@
+"""
+Database-backed background task queue.
+
+Tasks are plain functions registered with ``@task`` and enqueued as
+``BackgroundTask`` rows, usually in the same transaction as the data they act
+on, so a side effect is never lost or run for a rolled-back write. Workers
+(``manage.py run_workers``) claim due rows, run them, and reschedule failures
+with exponential backoff until ``max_attempts``. An ``idempotency_key`` makes
+enqueueing the same work twice a no-op.
+"""
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from .models import BackgroundTask
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+def task(name=None, max_attempts=5):
+    def register(func):
+        task_name = name or f'{func.__module__}.{func.__name__}'
+        func.task_name = task_name
+        func.max_attempts = max_attempts
+        registry[task_name] = func
+        return func
+    return register
+
+
+def enqueue(func_or_name, payload=None, idempotency_key=None, delay=None):
+    """Queue a task; returns the existing row if ``idempotency_key`` was seen."""
+    name = getattr(func_or_name, 'task_name', func_or_name)
+    func = registry.get(name)
+    fields = {
+        'name': name,
+        'payload': payload or {},
+        'max_attempts': getattr(func, 'max_attempts', 5),
+        'run_at': timezone.now() + (delay or timedelta()),
+    }
+    if idempotency_key is None:
+        return BackgroundTask.objects.create(**fields)
+    try:
+        with transaction.atomic():
+            return BackgroundTask.objects.create(idempotency_key=idempotency_key, **fields)
+    except IntegrityError:
+        return BackgroundTask.objects.get(idempotency_key=idempotency_key)
+
+
+def retry_delay(attempts):
+    base = getattr(settings, 'TASK_RETRY_BASE_DELAY', 10)
+    cap = getattr(settings, 'TASK_RETRY_MAX_DELAY', 3600)
+    return timedelta(seconds=min(cap, base * 2 ** max(0, attempts - 1)))
+
+
+def default_worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def _due(now):
+    # Running rows whose worker vanished are retried after the visibility timeout.
+    stale = now - timedelta(seconds=getattr(settings, 'TASK_VISIBILITY_TIMEOUT', 600))
+    return (
+        BackgroundTask.objects.filter(status='pending', run_at__lte=now)
+        | BackgroundTask.objects.filter(status='running', locked_at__lt=stale)
+    )
+
+
+def claim(worker_id, limit=10):
+    """Atomically mark up to ``limit`` due tasks as running for ``worker_id``."""
+    now = timezone.now()
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(
+                _due(now).order_by('run_at', 'id')
+                .select_for_update(skip_locked=True)
+                .values_list('id', flat=True)[:limit]
+            )
+            BackgroundTask.objects.filter(id__in=ids).update(
+                status='running', locked_by=worker_id, locked_at=now,
+            )
+    else:
+        # No row locks (SQLite): claim optimistically, one conditional UPDATE
+        # per candidate; a row another worker took first updates 0 rows.
+        ids = []
+        candidates = _due(now).order_by('run_at', 'id').values_list('id', 'status', 'locked_at')
+        for task_id, status, locked_at in candidates[:limit]:
+            claimed = BackgroundTask.objects.filter(
+                id=task_id, status=status, locked_at=locked_at,
+            ).update(status='running', locked_by=worker_id, locked_at=now)
+            if claimed:
+                ids.append(task_id)
+    return list(BackgroundTask.objects.filter(id__in=ids).order_by('run_at', 'id'))
+
+
+def execute(task_row):
+    func = registry.get(task_row.name)
+    task_row.attempts += 1
+    try:
+        if func is None:
+            raise LookupError(f'No task registered as {task_row.name!r}')
+        func(**task_row.payload)
+    except Exception:
+        task_row.last_error = traceback.format_exc()
+        if task_row.attempts >= task_row.max_attempts:
+            task_row.status = 'failed'
+            logger.error('Task %s failed permanently', task_row)
+        else:
+            task_row.status = 'pending'
+            task_row.run_at = timezone.now() + retry_delay(task_row.attempts)
+    else:
+        task_row.status = 'done'
+        task_row.last_error = None
+    task_row.locked_by = task_row.locked_at = None
+    task_row.save(update_fields=[
+        'status', 'attempts', 'run_at', 'locked_by', 'locked_at', 'last_error', 'updated_at',
+    ])
+    return task_row
+
+
+def run_pending(worker_id=None, batch_size=10):
+    """Claim and run one batch; returns the number of tasks executed."""
+    tasks = claim(worker_id or default_worker_id(), batch_size)
+    for task_row in tasks:
+        execute(task_row)
+    return len(tasks)
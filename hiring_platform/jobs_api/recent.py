@@ -0,0 +1,218 @@
+"""
+Recent open jobs, served from a bounded per-process buffer.
+
+The homepage feed (``/api/recent-jobs/``) is the hottest read path; as a
+query it is an ``ORDER BY created_at DESC LIMIT n`` on every hit. Instead each
+process keeps the newest ``RECENT_JOBS_BUFFER_SIZE`` open jobs, already
+serialized, loaded on first use and kept current by the ``Job`` signals.
+
+Other processes learn about a write through a generation number in the cache
+backend, the same way the response cache does: a reader whose generation is
+behind reloads the buffer with one query. Once a write commits, the writing
+process applies it in place and skips the reload when nothing else wrote in
+between.
+With the default per-process cache, or for columns changed by ``UPDATE``
+statements (application and view counters), the buffer is also reloaded
+every ``RECENT_JOBS_MAX_AGE`` seconds.
+
+``/api/recent-jobs/stream/`` pushes jobs entering the buffer as Server-Sent
+Events (event id = job id, so ``Last-Event-ID`` resumes a dropped stream).
+Streams end after ``RECENT_JOBS_STREAM_TIMEOUT`` seconds and the browser's
+``EventSource`` reconnects. The stream is only served under ASGI, where an
+idle client waits on the event loop; under WSGI every open stream would pin
+a worker thread for that long.
+"""
+import asyncio
+import json
+import secrets
+import threading
+import time
+from bisect import bisect_left
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from rest_framework.utils.encoders import JSONEncoder
+
+from .cache import get_cache
+from .models import Job
+from .serializers import JobReadSerializer
+
+
+def _sort_key(job):
+    # Newest first: bisect over ascending keys.
+    return (-job.created_at.timestamp(), -job.pk)
+
+
+class RecentJobsBuffer:
+    key = 'recent-jobs:generation'
+
+    def __init__(self, size=None, max_age=None, cache=None):
+        self.size = size or getattr(settings, 'RECENT_JOBS_BUFFER_SIZE', 50)
+        self.max_age = max_age if max_age is not None else getattr(settings, 'RECENT_JOBS_MAX_AGE', 60)
+        self._cache = cache
+        self._lock = threading.Lock()
+        self._keys = None
+        self._jobs = None
+        self._generation = None
+        self._loaded_at = 0
+
+    @property
+    def cache(self):
+        return self._cache or get_cache()
+
+    def generation(self):
+        generation = self.cache.get(self.key)
+        if generation is None:
+            # A random start means a cleared or evicted key never repeats a
+            # generation some process has already seen.
+            self.cache.add(self.key, secrets.randbits(48), timeout=None)
+            generation = self.cache.get(self.key)
+        return generation
+
+    def _bump(self):
+        self.generation()
+        try:
+            return self.cache.incr(self.key)
+        except ValueError:
+            self.cache.set(self.key, secrets.randbits(48), timeout=None)
+            return None
+
+    def jobs(self, limit=None):
+        """Serialized open jobs, newest first."""
+        generation = self.generation()
+        with self._lock:
+            fresh = (
+                self._jobs is not None and generation == self._generation
+                and time.monotonic() - self._loaded_at < self.max_age
+            )
+            jobs = self._jobs
+        if not fresh:
+            jobs = self.load(generation)
+        return jobs[:limit]
+
+    def load(self, generation=None):
+        if generation is None:
+            generation = self.generation()
+        queryset = JobReadSerializer.optimize_queryset(Job.objects.filter(status='open'))
+        rows = list(queryset.order_by('-created_at', '-id')[:self.size])
+        jobs = list(JobReadSerializer(rows, many=True).data)
+        with self._lock:
+            self._keys = [_sort_key(job) for job in rows]
+            self._jobs = jobs
+            self._generation = generation
+            self._loaded_at = time.monotonic()
+        return jobs
+
+    # Writes are applied once they commit: until then other processes would
+    # reload the old rows under the new generation, and a rollback would leave
+    # a job in the buffer that was never written.
+
+    def job_saved(self, job):
+        transaction.on_commit(lambda: self._job_saved(job.pk))
+
+    def _job_saved(self, job_id):
+        # Re-read rather than serialize the instance, which may hold unsaved
+        # representations (strings for dates, ints for decimals).
+        queryset = JobReadSerializer.optimize_queryset(Job.objects.filter(pk=job_id, status='open'))
+        self._apply(job_id, queryset.first())
+
+    def job_deleted(self, job_id):
+        transaction.on_commit(lambda: self._apply(job_id, None))
+
+    def invalidate(self):
+        """Reload everywhere, e.g. after a company or category rename; now and on commit."""
+        self._invalidate()
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(self._invalidate)
+
+    def _invalidate(self):
+        self._bump()
+        with self._lock:
+            self._generation = None
+
+    def _apply(self, job_id, job):
+        generation = self._bump()
+        entry = JobReadSerializer(job).data if job is not None else None
+        with self._lock:
+            if self._jobs is None:
+                return
+            if generation is None or self._generation is None or generation != self._generation + 1:
+                # Another process wrote too; reload on the next read.
+                self._generation = None
+                return
+            pairs = [(key, data) for key, data in zip(self._keys, self._jobs) if data['id'] != job_id]
+            removed = len(pairs) < len(self._jobs)
+            if entry is not None:
+                key = _sort_key(job)
+                index = bisect_left([k for k, _ in pairs], key)
+                pairs.insert(index, (key, entry))
+            if removed and entry is None and len(self._jobs) == self.size:
+                # The job that should take the freed slot isn't buffered.
+                self._generation = None
+                return
+            pairs = pairs[:self.size]
+            self._keys = [key for key, _ in pairs]
+            self._jobs = [data for _, data in pairs]
+            self._generation = generation
+
+
+recent_jobs = RecentJobsBuffer()
+
+
+def with_request(jobs, request):
+    """Absolute logo URLs, as the request-aware serializers produce."""
+    result = []
+    for job in jobs:
+        company = job.get('company')
+        if company and company.get('logo'):
+            job = {**job, 'company': {**company, 'logo': request.build_absolute_uri(company['logo'])}}
+        result.append(job)
+    return result
+
+
+def job_events(jobs, cursor, request):
+    """SSE frames for buffered jobs newer than ``cursor``, oldest first, and the new cursor."""
+    new = [job for job in jobs if job['id'] > cursor]
+    frames = ''.join(
+        f'id: {job["id"]}\nevent: job\ndata: {json.dumps(job, cls=JSONEncoder)}\n\n'
+        for job in reversed(with_request(new, request))
+    )
+    return frames, max([cursor] + [job['id'] for job in new])
+
+
+class RecentJobsStream:
+    """Asynchronously iterates SSE frames for one client."""
+
+    def __init__(self, request, buffer=None):
+        self.request = request
+        self.buffer = buffer or recent_jobs
+        self.poll = getattr(settings, 'RECENT_JOBS_STREAM_POLL', 1)
+        self.heartbeat = getattr(settings, 'RECENT_JOBS_STREAM_HEARTBEAT', 15)
+        self.timeout = getattr(settings, 'RECENT_JOBS_STREAM_TIMEOUT', 300)
+        last_event_id = request.headers.get('Last-Event-ID', '')
+        self.cursor = int(last_event_id) if last_event_id.isdigit() else None
+
+    def _start(self, jobs):
+        if self.cursor is None:
+            # New subscribers already fetched the list; only send what's next.
+            self.cursor = max([0] + [job['id'] for job in jobs])
+        return f'retry: {int(self.poll * 3000)}\n\n'
+
+    def _step(self, jobs, last_sent):
+        frames, self.cursor = job_events(jobs, self.cursor, self.request)
+        if not frames and time.monotonic() - last_sent >= self.heartbeat:
+            frames = ': keepalive\n\n'
+        return frames
+
+    async def __aiter__(self):
+        fetch = sync_to_async(self.buffer.jobs)
+        deadline = time.monotonic() + self.timeout
+        yield self._start(await fetch())
+        last_sent = time.monotonic()
+        while time.monotonic() < deadline:
+            frames = self._step(await fetch(), last_sent)
+            if frames:
+                last_sent = time.monotonic()
+                yield frames
+            await asyncio.sleep(self.poll)
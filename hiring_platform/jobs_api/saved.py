@@ -0,0 +1,62 @@
+"""
+Saved jobs: batched membership lookups and per-candidate cache namespaces.
+
+"Which of these jobs has this candidate saved?" is one
+``candidate_email = ? AND job_id IN (...)`` query on the
+``(candidate_email, job_id)`` unique index however many jobs a page shows.
+Job lists requested with ``?saved_by=`` are cached per candidate under a
+``saved:<hash>`` namespace (``jobs_api/cache.py``) that only that candidate's
+saves and unsaves bump, so other visitors' cached pages are unaffected.
+
+A candidate's saved jobs are only readable and writable by the signed-in
+user with that email, or by staff (``acts_for``).
+"""
+import hashlib
+
+from .cache import invalidate
+from .models import SavedJob
+
+# Upper bound on job ids per lookup or bulk request.
+MAX_JOB_IDS = 500
+
+
+def cache_namespace(email):
+    # Hashed: cache keys can't hold arbitrary characters on every backend.
+    return 'saved:' + hashlib.md5(email.encode()).hexdigest()
+
+
+def acts_for(user, email):
+    """Whether ``user`` may see or change ``email``'s saved jobs: staff, or the user with that email."""
+    if not user or not user.is_authenticated:
+        return False
+    return user.is_staff or bool(user.email) and user.email.lower() == email.lower()
+
+
+def saved_job_ids(email, job_ids):
+    """The subset of ``job_ids`` saved by ``email``."""
+    if not job_ids:
+        return set()
+    return set(
+        SavedJob.objects.filter(candidate_email=email, job_id__in=job_ids).values_list('job_id', flat=True)
+    )
+
+
+def save_jobs(email, job_ids):
+    """Save every job in ``job_ids`` for ``email``; returns the ids that weren't saved yet."""
+    new = sorted(set(job_ids) - saved_job_ids(email, job_ids))
+    # ignore_conflicts covers a concurrent save of the same job.
+    SavedJob.objects.bulk_create(
+        [SavedJob(candidate_email=email, job_id=job_id) for job_id in new], ignore_conflicts=True,
+    )
+    if new:
+        # bulk_create sends no post_save.
+        invalidate(cache_namespace(email))
+    return new
+
+
+def unsave_jobs(email, job_ids):
+    """Remove ``job_ids`` from ``email``'s saved jobs; returns how many were removed."""
+    if not job_ids:
+        return 0
+    deleted, _ = SavedJob.objects.filter(candidate_email=email, job_id__in=job_ids).delete()
+    return deleted
@@ -0,0 +1,134 @@
+"""
+Interview scheduling: double-booking checks and a free-slot finder.
+
+An interview occupies ``[scheduled_at, ends_at)``; ``ends_at`` and the
+candidate's email are stored on the row when it is saved. Two intervals
+overlap when each starts before the other ends. Because no interview is
+longer than ``INTERVIEW_MAX_DURATION_MINUTES``, every interview overlapping
+``[start, end)`` starts within ``[start - max duration, end)``, so a check is
+a short range scan of the ``(interviewer_name, scheduled_at)`` or
+``(candidate_email, scheduled_at)`` index however many interviews exist.
+Cancelled interviews don't hold their slot.
+
+Bookings for the same interviewer or candidate are serialized: SQLite write
+transactions are ``BEGIN IMMEDIATE`` (one writer at a time) and PostgreSQL
+takes a transaction-scoped advisory lock per interviewer and candidate, so
+two requests can't both see a slot as free and both take it.
+"""
+import heapq
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import connection
+from rest_framework.exceptions import APIException
+
+from .models import Interview
+
+# Default working hours for free-slot searches.
+DAY_START, DAY_END = time(9), time(17)
+
+
+class ScheduleConflict(APIException):
+    status_code = 409
+    default_detail = 'The interview overlaps another booking.'
+    default_code = 'conflict'
+
+    def __init__(self, conflicts):
+        super().__init__()
+        self.detail = {'detail': self.detail, 'conflicts': conflicts}
+
+
+def max_duration():
+    return timedelta(minutes=getattr(settings, 'INTERVIEW_MAX_DURATION_MINUTES', 480))
+
+
+def overlapping(start, end):
+    """Interviews holding any part of ``[start, end)``; filter by interviewer or candidate."""
+    return Interview.objects.exclude(status='cancelled').filter(
+        scheduled_at__gte=start - max_duration(), scheduled_at__lt=end, ends_at__gt=start,
+    )
+
+
+def lock_schedules(interviewers=(), candidates=()):
+    """Hold off concurrent bookings for these people until the transaction ends."""
+    if connection.vendor != 'postgresql':
+        return
+    keys = sorted({
+        *(f'interviewer:{name}' for name in interviewers), *(f'candidate:{email}' for email in candidates),
+    })
+    with connection.cursor() as cursor:
+        for key in keys:
+            cursor.execute('SELECT pg_advisory_xact_lock(hashtext(%s))', [key])
+
+
+def find_conflicts(start, end, interviewer, candidate_email, exclude=None):
+    """Bookings of ``interviewer`` or ``candidate_email`` overlapping ``[start, end)``."""
+    # One index range scan per person, in a single UNION; an OR across both
+    # columns can't bound either index by start time.
+    by_interviewer, by_candidate = (
+        overlapping(start, end).filter(**lookup).exclude(pk=exclude).order_by()
+        .values('id', 'interviewer_name', 'candidate_email', 'scheduled_at', 'ends_at')
+        for lookup in ({'interviewer_name': interviewer}, {'candidate_email': candidate_email})
+    )
+    return list(by_interviewer.union(by_candidate).order_by('scheduled_at', 'id'))
+
+
+def check_availability(start, end, interviewer, candidate_email, exclude=None):
+    conflicts = find_conflicts(start, end, interviewer, candidate_email, exclude)
+    if conflicts:
+        raise ScheduleConflict(conflicts)
+
+
+def busy_intervals(start, end, interviewers, candidate_email=None):
+    """Merged, sorted ``(start, end)`` intervals when anyone involved is booked."""
+    queries = [overlapping(start, end).filter(interviewer_name__in=interviewers)]
+    if candidate_email:
+        queries.append(overlapping(start, end).filter(candidate_email=candidate_email))
+    merged = []
+    rows = heapq.merge(*(q.order_by('scheduled_at').values_list('scheduled_at', 'ends_at') for q in queries))
+    for busy_start, busy_end in rows:
+        if merged and busy_start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], busy_end)
+        else:
+            merged.append([busy_start, busy_end])
+    return merged
+
+
+def _align(moment, origin, step):
+    """``moment`` rounded up to ``origin`` plus a whole number of ``step``."""
+    return origin + -((origin - moment) // step) * step
+
+
+def free_slots(interviewers, start, end, duration, limit=10, step=None, candidate_email=None,
+               day_start=DAY_START, day_end=DAY_END, tz=None, weekends=False):
+    """
+    The first ``limit`` windows of ``duration`` within ``[start, end)`` when
+    every interviewer (and the candidate) is free, inside working hours
+    ``day_start``-``day_end`` in ``tz``. Start times fall on ``step`` boundaries
+    from the start of the working day. One query per person group, then a
+    single pass over the merged busy intervals.
+    """
+    step = step or duration
+    tz = tz or start.tzinfo
+    busy = busy_intervals(start, end, interviewers, candidate_email)
+    slots, index = [], 0
+    day = start.astimezone(tz).date()
+    while len(slots) < limit:
+        opens = datetime.combine(day, day_start, tzinfo=tz)
+        if opens >= end:
+            break
+        closes = min(datetime.combine(day, day_end, tzinfo=tz), end)
+        day += timedelta(days=1)
+        if not weekends and opens.weekday() >= 5:
+            continue
+        slot = _align(max(opens, start), opens, step)
+        while len(slots) < limit and slot + duration <= closes:
+            while index < len(busy) and busy[index][1] <= slot:
+                index += 1
+            if index < len(busy) and busy[index][0] < slot + duration:
+                # Jump past the booking in the way.
+                slot = _align(busy[index][1], opens, step)
+                continue
+            slots.append({'start': slot, 'end': slot + duration})
+            slot += step
+    return slots
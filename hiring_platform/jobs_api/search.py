@@ -0,0 +1,224 @@
+"""
+Full-text search over jobs.
+
+The active backend is picked from the ``JOBS_SEARCH_BACKEND`` setting, or from
+the database vendor when it is unset. Backends annotate matching querysets
+with ``search_rank`` (lower is better) and ``search_snippet`` so they compose
+with the other filter backends and pagination.
+
+``search_snippet`` is an HTML fragment: the job text HTML-escaped, matches in
+``<mark>``. Job text is user input, so the database marks matches with
+placeholder characters, escapes the snippet and only then swaps the
+placeholders for tags.
+"""
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+SEARCH_FIELDS = ('title', 'description', 'requirements', 'skills_required')
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Private-use characters around matches, replaced after escaping.
+MATCH_START, MATCH_END = '\ue000', '\ue001'
+# (old, new) in the order they are applied; '&' must go first.
+SNIPPET_REPLACEMENTS = (
+    ('&', '&amp;'), ('<', '&lt;'), ('>', '&gt;'), ('"', '&quot;'), ("'", '&#x27;'),
+    (MATCH_START, '<mark>'), (MATCH_END, '</mark>'),
+)
+
+
+def tokenize(query):
+    return _TOKEN_RE.findall(query or '')
+
+
+def _sql_string(value):
+    return "'" + value.replace("'", "''") + "'"
+
+
+def html_snippet_sql(expression):
+    """``expression`` (a snippet with placeholder marks) escaped in SQL, as for ``extra()``."""
+    for old, new in SNIPPET_REPLACEMENTS:
+        expression = f'replace({expression}, {_sql_string(old)}, {_sql_string(new)})'
+    return expression
+
+
+class BaseSearchBackend:
+    def index(self, job):
+        raise NotImplementedError
+
+    def index_many(self, jobs):
+        for job in jobs:
+            self.index(job)
+
+    def remove(self, job_id):
+        raise NotImplementedError
+
+    def remove_many(self, job_ids):
+        for job_id in job_ids:
+            self.remove(job_id)
+
+    def rebuild(self):
+        raise NotImplementedError
+
+    def search(self, queryset, query):
+        raise NotImplementedError
+
+
+class SQLiteFTS5Backend(BaseSearchBackend):
+    """Keeps an FTS5 virtual table keyed by job id (see migration 0007)."""
+
+    table = 'jobs_api_job_fts'
+    snippet_tokens = 16
+
+    def build_match(self, query):
+        # Every token is quoted so user input can't inject FTS5 syntax, and
+        # becomes a prefix term so "pyth" matches "python".
+        return ' '.join(f'"{token}"*' for token in tokenize(query))
+
+    def index(self, job):
+        values = [getattr(job, field) or '' for field in SEARCH_FIELDS]
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [job.pk])
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, {", ".join(SEARCH_FIELDS)}) '
+                f'VALUES (%s, %s, %s, %s, %s)',
+                [job.pk, *values],
+            )
+
+    def index_many(self, jobs):
+        rows = [[job.pk, *(getattr(job, field) or '' for field in SEARCH_FIELDS)] for job in jobs]
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table} WHERE rowid = %s', [row[:1] for row in rows])
+            cursor.executemany(
+                f'INSERT INTO {self.table} (rowid, {", ".join(SEARCH_FIELDS)}) '
+                f'VALUES (%s, %s, %s, %s, %s)',
+                rows,
+            )
+
+    def remove(self, job_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [job_id])
+
+    def remove_many(self, job_ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table} WHERE rowid = %s', [[job_id] for job_id in job_ids])
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, {", ".join(SEARCH_FIELDS)}) '
+                f'SELECT id, {", ".join(SEARCH_FIELDS)} FROM jobs_api_job'
+            )
+
+    def search(self, queryset, query):
+        match = self.build_match(query)
+        if not match:
+            return queryset
+        table = self.table
+        job_table = queryset.model._meta.db_table
+        # Joined rather than correlated so bm25()/snippet() are evaluated once
+        # per matching row from a single MATCH scan of the index.
+        return queryset.extra(
+            tables=[table],
+            where=[f'{table}.rowid = {job_table}.id', f'{table} MATCH %s'],
+            params=[match],
+            select={
+                'search_rank': f'bm25({table}, 10.0, 1.0, 2.0, 5.0)',
+                'search_snippet': html_snippet_sql(
+                    f"snippet({table}, -1, '{MATCH_START}', '{MATCH_END}', '…', {self.snippet_tokens})"
+                ),
+            },
+        ).order_by('search_rank', '-created_at')
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    tsvector search over a stored generated column with a GIN index
+    (migration 0020); PostgreSQL keeps it current, so index/remove are no-ops.
+    """
+
+    config = 'english'
+    column = 'search_vector'
+
+    def index(self, job):
+        pass
+
+    def remove(self, job_id):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def search(self, queryset, query):
+        from django.contrib.postgres.search import (
+            SearchHeadline, SearchQuery, SearchRank, SearchVectorField,
+        )
+        from django.db.models import F, Value
+        from django.db.models.expressions import RawSQL
+        from django.db.models.functions import Replace
+
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset
+        # Not a model field, so it is only referenced from search querysets.
+        vector = RawSQL(
+            f'{queryset.model._meta.db_table}.{self.column}', [], output_field=SearchVectorField(),
+        )
+        search_query = SearchQuery(
+            ' & '.join(f'{token}:*' for token in tokens),
+            search_type='raw', config=self.config,
+        )
+        snippet = SearchHeadline(
+            'description', search_query, config=self.config, start_sel=MATCH_START, stop_sel=MATCH_END,
+        )
+        for old, new in SNIPPET_REPLACEMENTS:
+            snippet = Replace(snippet, Value(old), Value(new))
+        return (
+            queryset.annotate(
+                search_vector=vector,
+                # Negated so that, as with bm25, a lower rank sorts first.
+                search_rank=-SearchRank(F('search_vector'), search_query),
+                search_snippet=snippet,
+            )
+            .filter(search_vector=search_query)
+            .order_by('search_rank', '-created_at')
+        )
+
+
+class LikeSearchBackend(BaseSearchBackend):
+    """Unindexed fallback for databases without a full-text engine."""
+
+    def index(self, job):
+        pass
+
+    def remove(self, job_id):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def search(self, queryset, query):
+        for token in tokenize(query):
+            condition = Q()
+            for field in SEARCH_FIELDS:
+                condition |= Q(**{f'{field}__icontains': token})
+            queryset = queryset.filter(condition)
+        return queryset
+
+
+VENDOR_BACKENDS = {
+    'sqlite': SQLiteFTS5Backend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_search_backend():
+    path = getattr(settings, 'JOBS_SEARCH_BACKEND', None)
+    if path:
+        return import_string(path)()
+    return VENDOR_BACKENDS.get(connection.vendor, LikeSearchBackend)()
@@ -0,0 +1,286 @@
+"""
+Synthetic data for development and benchmarks (``manage.py seed_data``).
+
+Rows are generated from a seeded RNG, so the same arguments give the same
+data, and written with ``bulk_create`` in batches. Timestamps are spread over
+the last ``days`` days (``auto_now``/``auto_now_add`` are suspended while
+seeding) and job popularity is skewed towards a minority of jobs, so time
+filters, pagination and per-job aggregates see realistic shapes.
+
+``bulk_create`` skips signals, so derived data is rebuilt per batch the way
+bulk imports do (search index, skill vocabulary, similarity vectors) and at
+the end in one pass (application counters, daily stats rollup).
+"""
+import contextlib
+import random
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import invalidate
+from .counters import recompute_application_counters
+from .models import Application, Company, Interview, Job, JobCategory, SavedJob
+from .recent import recent_jobs
+from .search import get_search_backend
+from .similarity import store_job_vectors
+from .skills import sync_job_skills
+from .stats import rebuild_daily_stats
+
+SKILLS = (
+    'Python', 'Django', 'React', 'TypeScript', 'PostgreSQL', 'Kubernetes', 'Docker', 'AWS',
+    'Go', 'Rust', 'Java', 'Kotlin', 'Swift', 'Terraform', 'GraphQL', 'Redis', 'Machine Learning',
+    'Data Analysis', 'Figma', 'SQL', 'Node.js', 'Vue', 'Spark', 'Airflow', 'Security',
+)
+ROLES = (
+    'Engineer', 'Developer', 'Designer', 'Analyst', 'Manager', 'Architect', 'Scientist',
+    'Consultant', 'Specialist', 'Administrator',
+)
+SENIORITY = ('Junior', 'Mid-level', 'Senior', 'Lead', 'Principal', 'Staff')
+AREAS = (
+    'Backend', 'Frontend', 'Full Stack', 'Data', 'Platform', 'Mobile', 'Security', 'Product',
+    'Infrastructure', 'Machine Learning', 'QA', 'Growth',
+)
+CATEGORIES = (
+    ('Engineering', '💻'), ('Design', '🎨'), ('Data', '📊'), ('Product', '🧭'),
+    ('Marketing', '📣'), ('Sales', '🤝'), ('Operations', '⚙️'), ('Finance', '💰'),
+    ('Customer Support', '🎧'), ('Human Resources', '🧑'), ('Legal', '⚖️'), ('Security', '🔒'),
+)
+CITIES = (
+    'Kathmandu', 'Pokhara', 'Lalitpur', 'Bangalore', 'Berlin', 'London', 'New York', 'Toronto',
+    'Singapore', 'Sydney', 'Remote',
+)
+INDUSTRIES = ('Fintech', 'Health', 'E-commerce', 'Education', 'Logistics', 'Media', 'SaaS', 'Travel')
+FIRST_NAMES = ('Aarav', 'Sita', 'Maya', 'Liam', 'Noah', 'Emma', 'Priya', 'Ravi', 'Anita', 'Leo', 'Zoe', 'Kiran')
+LAST_NAMES = ('Sharma', 'Thapa', 'Gurung', 'Smith', 'Garcia', 'Chen', 'Khan', 'Müller', 'Rai', 'Silva')
+# Weighted like a real pipeline: most applications are still pending.
+APPLICATION_STATUSES = (('submitted', 50), ('reviewing', 20), ('interview', 10), ('rejected', 15), ('accepted', 5))
+WORDS = (
+    'build scale ship own design review mentor collaborate customers reliable systems team '
+    'product data services platform users performance quality roadmap growth impact'
+).split()
+
+
+@contextlib.contextmanager
+def _explicit_timestamps(*models):
+    """Let ``bulk_create`` keep the timestamps we generate."""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Seeder:
+    def __init__(self, seed=0, days=365, batch_size=5000, log=None):
+        self.rng = random.Random(seed)
+        self.days = days
+        self.batch_size = batch_size
+        self.log = log or (lambda message: None)
+        self.now = timezone.now()
+        self.counts = {}
+
+    def _text(self, words):
+        return ' '.join(self.rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+    def _past(self, after=None):
+        start = after or self.now - timedelta(days=self.days)
+        span = (self.now - start).total_seconds()
+        # Skewed towards recent activity.
+        return start + timedelta(seconds=span * self.rng.random() ** 0.5)
+
+    def _batches(self, total):
+        for start in range(0, total, self.batch_size):
+            yield start, min(total, start + self.batch_size)
+
+    def _popular(self, ids):
+        # A fifth of the jobs draw most of the traffic.
+        return ids[min(len(ids) - 1, int(len(ids) * self.rng.random() ** 3))]
+
+    def run(self, companies, categories, jobs, applications, saved_jobs, interviews):
+        with _explicit_timestamps(Company, Job, Application, SavedJob, Interview):
+            category_ids = self.seed_categories(categories)
+            company_ids = self.seed_companies(companies)
+            job_ids = self.seed_jobs(jobs, company_ids, category_ids)
+            self.seed_applications(applications, interviews, job_ids)
+            self.seed_saved_jobs(saved_jobs, job_ids)
+        self.log('Rebuilding application counters and daily stats...')
+        recompute_application_counters()
+        rebuild_daily_stats()
+        invalidate('jobs', 'companies', 'categories')
+        recent_jobs.invalidate()
+        return self.counts
+
+    def seed_categories(self, count):
+        rows = list(CATEGORIES[:count]) + [
+            (f'Category {i}', None) for i in range(len(CATEGORIES), count)
+        ]
+        existing = dict(JobCategory.objects.filter(name__in=[name for name, _ in rows]).values_list('name', 'pk'))
+        created = JobCategory.objects.bulk_create(
+            JobCategory(name=name, icon=icon, description=f'{name} roles.')
+            for name, icon in rows if name not in existing
+        )
+        self.counts['categories'] = len(created)
+        return list(existing.values()) + [category.pk for category in created]
+
+    def seed_companies(self, count):
+        offset = Company.objects.count()
+        ids = []
+        for start, end in self._batches(count):
+            companies = []
+            for i in range(offset + start, offset + end):
+                created = self._past()
+                companies.append(Company(
+                    name=f'{self.rng.choice(AREAS)} {self.rng.choice(INDUSTRIES)} {i}',
+                    description=self._text(30),
+                    website=f'https://company{i}.example.com',
+                    location=self.rng.choice(CITIES),
+                    industry=self.rng.choice(INDUSTRIES),
+                    employee_count=self.rng.choice(['1-10', '11-50', '51-200', '201-1000', '1000+']),
+                    email=f'hr@company{i}.example.com',
+                    verified=self.rng.random() < 0.3,
+                    created_at=created,
+                    updated_at=created,
+                ))
+            ids += [company.pk for company in Company.objects.bulk_create(companies)]
+        self.counts['companies'] = len(ids)
+        self.log(f'{len(ids)} companies')
+        return ids
+
+    def seed_jobs(self, count, company_ids, category_ids):
+        rows = []
+        search = get_search_backend()
+        for start, end in self._batches(count):
+            jobs = []
+            for _ in range(start, end):
+                created = self._past()
+                salary = self.rng.choice([None, 30_000, 45_000, 60_000, 80_000, 100_000, 140_000])
+                jobs.append(Job(
+                    title=f'{self.rng.choice(SENIORITY)} {self.rng.choice(AREAS)} {self.rng.choice(ROLES)}',
+                    company_id=self.rng.choice(company_ids),
+                    category_id=self.rng.choice(category_ids) if category_ids and self.rng.random() < 0.9 else None,
+                    location=self.rng.choice(CITIES),
+                    description=self._text(120),
+                    requirements=self._text(40),
+                    salary_min=salary,
+                    salary_max=salary and salary + self.rng.choice([10_000, 20_000, 40_000]),
+                    job_type=self.rng.choice(Job.JOB_TYPE_CHOICES)[0],
+                    experience_level=self.rng.choice(Job.EXPERIENCE_LEVEL_CHOICES)[0],
+                    # Older postings are more likely to have closed.
+                    status='open' if self.rng.random() > (self.now - created).days / (self.days * 1.5) else
+                    self.rng.choice(['closed', 'closed', 'on_hold']),
+                    skills_required=', '.join(self.rng.sample(SKILLS, self.rng.randint(2, 6))),
+                    views_count=int(self.rng.paretovariate(1.5) * 20),
+                    created_at=created,
+                    updated_at=created,
+                ))
+            with transaction.atomic():
+                jobs = Job.objects.bulk_create(jobs)
+                search.index_many(jobs)
+                sync_job_skills(*jobs)
+                store_job_vectors(jobs)
+            rows += [(job.created_at, job.pk) for job in jobs]
+            self.log(f'{len(rows)}/{count} jobs')
+        self.counts['jobs'] = len(rows)
+        # Newest first, so _popular() favours recent postings.
+        return [pk for _, pk in sorted(rows, reverse=True)]
+
+    def _candidate(self, n):
+        first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+        return f'{first} {last}', f'candidate{n}@example.com'
+
+    def seed_applications(self, count, interviews, job_ids):
+        statuses, weights = zip(*APPLICATION_STATUSES)
+        created_jobs = dict(Job.objects.filter(pk__in=job_ids).values_list('pk', 'created_at'))
+        offset = Application.objects.count()
+        written = interviews_written = 0
+        # Each candidate applies to a job at most once, so never to more jobs than there are.
+        per_candidate = min(3, len(job_ids))
+        applied = set()
+        for start, end in self._batches(count):
+            applications = []
+            for i in range(start, end):
+                n = offset + i // per_candidate
+                if i % per_candidate == 0:
+                    applied = set()
+                job_id = self._popular(job_ids)
+                while job_id in applied:
+                    job_id = self._popular(job_ids)
+                applied.add(job_id)
+                name, email = self._candidate(n)
+                submitted = self._past(created_jobs[job_id])
+                applications.append(Application(
+                    job_id=job_id, candidate_name=name, candidate_email=email,
+                    phone_number=f'98{self.rng.randrange(10 ** 8):08d}',
+                    candidate_message=self._text(20) if self.rng.random() < 0.5 else None,
+                    cv=f'cvs/seed/{n}.pdf',
+                    status=self.rng.choices(statuses, weights)[0],
+                    rating=self.rng.randint(1, 5) if self.rng.random() < 0.3 else None,
+                    submitted_at=submitted,
+                    updated_at=submitted,
+                ))
+            with transaction.atomic():
+                applications = Application.objects.bulk_create(applications)
+                target = interviews * end // count if count else 0
+                interviews_written += self._seed_interviews(applications, target - interviews_written)
+            written += len(applications)
+            self.log(f'{written}/{count} applications')
+        self.counts['applications'] = written
+        self.counts['interviews'] = interviews_written
+
+    def _seed_interviews(self, applications, count):
+        candidates = [a for a in applications if a.status in ('interview', 'accepted', 'rejected')]
+        if count <= 0 or not candidates:
+            return 0
+        rows = []
+        for _ in range(count):
+            application = self.rng.choice(candidates)
+            start = self._past(application.submitted_at).replace(minute=0, second=0, microsecond=0)
+            start = start.replace(hour=self.rng.randint(9, 16))
+            status = 'scheduled' if start > self.now else self.rng.choice(['completed', 'completed', 'cancelled'])
+            duration = self.rng.choice([30, 45, 60])
+            rows.append(Interview(
+                application_id=application.pk,
+                candidate_email=application.candidate_email,
+                interview_type=self.rng.choice(Interview.INTERVIEW_TYPE_CHOICES)[0],
+                scheduled_at=start,
+                duration_minutes=duration,
+                ends_at=start + timedelta(minutes=duration),
+                interviewer_name=f'{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}',
+                status=status,
+                rating=self.rng.randint(1, 10) if status == 'completed' else None,
+                created_at=application.submitted_at,
+                updated_at=application.submitted_at,
+            ))
+        Interview.objects.bulk_create(rows)
+        return len(rows)
+
+    def seed_saved_jobs(self, count, job_ids):
+        written = 0
+        per_candidate = min(5, len(job_ids))
+        saved = set()
+        for start, end in self._batches(count):
+            rows = []
+            for i in range(start, end):
+                if i % per_candidate == 0:
+                    saved = set()
+                job_id = self._popular(job_ids)
+                while job_id in saved:
+                    job_id = self._popular(job_ids)
+                saved.add(job_id)
+                rows.append(SavedJob(
+                    job_id=job_id, candidate_email=f'candidate{i // per_candidate}@example.com',
+                    saved_at=self._past(),
+                ))
+            # Re-seeding can repeat (candidate, job) pairs; those are skipped.
+            SavedJob.objects.bulk_create(rows, ignore_conflicts=True)
+            written += len(rows)
+        self.counts['saved_jobs'] = written
+        self.log(f'{written} saved jobs')
@@ -1,22 +1,200 @@
 from rest_framework import serializers
-from .models import JobCategory, Company, Job, Application
+from rest_framework.reverse import reverse
+from .models import (
+    JobCategory, Company, Job, Application, Interview, SavedJob, ArchivedJob, ArchivedApplication,
+)
+from .saved import MAX_JOB_IDS
+from .scheduling import max_duration
 
 class JobCategorySerializer(serializers.ModelSerializer):
+    jobs_count = serializers.SerializerMethodField()
+
     class Meta:
         model = JobCategory
         fields = '__all__'
 
+    def get_jobs_count(self, obj):
+        # Annotated by JobCategoryViewSet; absent on freshly created rows.
+        return getattr(obj, 'jobs_count', None)
+
 class CompanySerializer(serializers.ModelSerializer):
+    jobs_count = serializers.SerializerMethodField()
+    active_jobs = serializers.SerializerMethodField()
+
     class Meta:
         model = Company
         fields = '__all__'
 
+    def get_jobs_count(self, obj):
+        return getattr(obj, 'jobs_count', None)
+
+    def get_active_jobs(self, obj):
+        return getattr(obj, 'active_jobs', None)
+
 class JobSerializer(serializers.ModelSerializer):
+    search_snippet = serializers.SerializerMethodField()
+
     class Meta:
         model = Job
         fields = '__all__'
+        read_only_fields = [
+            'applications_count', 'pending_applications_count',
+            'accepted_applications_count', 'rejected_applications_count', 'views_count',
+        ]
+
+    def get_search_snippet(self, obj):
+        return getattr(obj, 'search_snippet', None)
+
+class CachedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Looks each id up once per serializer instance rather than once per row."""
+
+    def to_internal_value(self, data):
+        resolved = self.context.setdefault('related_cache', {}).setdefault(self.field_name, {})
+        key = str(data)
+        if key not in resolved:
+            resolved[key] = super().to_internal_value(data)
+        return resolved[key]
+
+class JobImportSerializer(JobSerializer):
+    """Validates bulk-imported rows; one instance is reused for a whole import."""
+
+    company = CachedPrimaryKeyRelatedField(queryset=Company.objects.all())
+    category = CachedPrimaryKeyRelatedField(
+        queryset=JobCategory.objects.all(), allow_null=True, required=False,
+    )
+
+class DownloadURLField(serializers.FileField):
+    """
+    Accepts uploads like ``FileField`` but reads as ``view_name``'s URL for the
+    row, a permission-checked download, instead of the file's storage URL.
+    """
+
+    def __init__(self, view_name, **kwargs):
+        self.view_name = view_name
+        super().__init__(**kwargs)
+
+    def download_url(self, pk, request):
+        return reverse(self.view_name, kwargs={'pk': pk}, request=request)
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        return self.download_url(value.instance.pk, self.context.get('request'))
 
 class ApplicationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Application
         fields = '__all__'
+
+    def build_standard_field(self, field_name, model_field):
+        field_class, kwargs = super().build_standard_field(field_name, model_field)
+        if field_name == 'cv':
+            # CVs are only served through ApplicationViewSet.cv, never from MEDIA_URL.
+            return DownloadURLField, {**kwargs, 'view_name': 'application-cv'}
+        return field_class, kwargs
+
+class InterviewSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Interview
+        fields = '__all__'
+
+    def validate_duration_minutes(self, value):
+        # Bounded so overlap checks can limit their index scan (jobs_api/scheduling.py).
+        limit = int(max_duration().total_seconds() // 60)
+        if not 1 <= value <= limit:
+            raise serializers.ValidationError(f'must be between 1 and {limit} minutes')
+        return value
+
+class SavedJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SavedJob
+        fields = '__all__'
+
+class SavedJobBulkSerializer(serializers.Serializer):
+    """``{"candidate_email", "save": [job ids], "unsave": [job ids]}``."""
+
+    candidate_email = serializers.EmailField()
+    save = serializers.ListField(child=serializers.IntegerField(), max_length=MAX_JOB_IDS, default=list)
+    unsave = serializers.ListField(child=serializers.IntegerField(), max_length=MAX_JOB_IDS, default=list)
+
+    def validate_save(self, value):
+        missing = set(value) - set(Job.objects.filter(pk__in=value).values_list('pk', flat=True))
+        if missing:
+            raise serializers.ValidationError(f'no such jobs: {", ".join(map(str, sorted(missing)))}')
+        return value
+
+
+# Read-only representations for list/detail endpoints. Each one declares the
+# queryset shape it needs in ``optimize_queryset`` so a page costs a fixed
+# number of queries however many rows it holds.
+
+class CompanySummarySerializer(serializers.ModelSerializer):
+    # Listings link the thumbnail, never the full-size upload.
+    logo = serializers.ImageField(source='logo_thumbnail', read_only=True)
+    columns = ['id', 'name', 'logo_thumbnail', 'location', 'verified']
+
+    class Meta:
+        model = Company
+        fields = ['id', 'name', 'logo', 'location', 'verified']
+
+class CategorySummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = JobCategory
+        fields = ['id', 'name', 'icon']
+
+class JobReadSerializer(JobSerializer):
+    company = CompanySummarySerializer(read_only=True)
+    category = CategorySummarySerializer(read_only=True)
+    category_id = serializers.IntegerField(read_only=True)
+
+    @staticmethod
+    def optimize_queryset(queryset):
+        return queryset.select_related('company', 'category').only(
+            *(field.attname for field in Job._meta.concrete_fields),
+            *(f'company__{name}' for name in CompanySummarySerializer.columns),
+            *(f'category__{name}' for name in CategorySummarySerializer.Meta.fields),
+        )
+
+class ApplicationReadSerializer(ApplicationSerializer):
+    job_title = serializers.CharField(source='job.title', read_only=True)
+    company_id = serializers.IntegerField(source='job.company_id', read_only=True)
+    company_name = serializers.CharField(source='job.company.name', read_only=True)
+    matched_skills = serializers.SerializerMethodField()
+    skill_score = serializers.SerializerMethodField()
+
+    @staticmethod
+    def optimize_queryset(queryset):
+        return queryset.select_related('job__company').only(
+            *(field.attname for field in Application._meta.concrete_fields),
+            'job__id', 'job__title', 'job__company_id', 'job__company__id', 'job__company__name',
+        )
+
+    def get_matched_skills(self, obj):
+        # Present when filtered with ?skills=.
+        return getattr(obj, 'matched_skills', None)
+
+    def get_skill_score(self, obj):
+        score = getattr(obj, 'skill_score', None)
+        return None if score is None else round(score, 3)
+
+
+
+# Archived rows are served as stored: the snapshot taken by ``archive.py``.
+
+class ArchivedJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedJob
+        fields = ['data', 'archived_at']
+
+    def to_representation(self, instance):
+        archived_at = self.fields['archived_at'].to_representation(instance.archived_at)
+        return {**instance.data, 'archived_at': archived_at}
+
+class ArchivedApplicationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedApplication
+        fields = ['data']
+
+    def to_representation(self, instance):
+        # Interviews come from prefetch_related('interviews').
+        return {**instance.data, 'interviews': [interview.data for interview in instance.interviews.all()]}
@@ -0,0 +1,98 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_on_commit
+from .counters import adjust_application_counters, move_application_counter
+from .models import Application, Company, Interview, Job, JobCategory, SavedJob
+from .recent import recent_jobs
+from .saved import cache_namespace as saved_cache_namespace
+from .search import get_search_backend
+from .similarity import store_job_vector
+from .skills import sync_job_skills
+from .stats import adjust_daily_stat, submission_day
+
+
+@receiver(post_save, sender=Job)
+def index_job(sender, instance, **kwargs):
+    get_search_backend().index(instance)
+    sync_job_skills(instance)
+    store_job_vector(instance)
+    recent_jobs.job_saved(instance)
+
+
+@receiver(post_delete, sender=Job)
+def unindex_job(sender, instance, **kwargs):
+    get_search_backend().remove(instance.pk)
+    recent_jobs.job_deleted(instance.pk)
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+@receiver(post_save, sender=JobCategory)
+@receiver(post_delete, sender=JobCategory)
+def refresh_recent_jobs(sender, **kwargs):
+    # Buffered jobs embed company and category summaries.
+    recent_jobs.invalidate()
+
+
+CACHE_NAMESPACES = {
+    Job: 'jobs',
+    Company: 'companies',
+    JobCategory: 'categories',
+}
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_cached_responses(sender, **kwargs):
+    namespace = CACHE_NAMESPACES.get(sender)
+    if namespace:
+        invalidate_on_commit(namespace)
+
+
+@receiver(post_save, sender=SavedJob)
+@receiver(post_delete, sender=SavedJob)
+def invalidate_saved_jobs(sender, instance, **kwargs):
+    # Only the candidate's own ?saved_by= pages embed their saved flags.
+    invalidate_on_commit(saved_cache_namespace(instance.candidate_email))
+
+
+def count_application(instance, job_id, status, delta):
+    adjust_application_counters(job_id, status, delta)
+    adjust_daily_stat(job_id, submission_day(instance), status, delta)
+
+
+@receiver(post_save, sender=Application)
+def count_saved_application(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        count_application(instance, instance.job_id, instance.status, 1)
+        return
+    loaded = getattr(instance, '_loaded_counter_state', None)
+    if loaded is None:
+        return
+    old_job_id, old_status = loaded
+    if old_job_id != instance.job_id:
+        count_application(instance, old_job_id, old_status, -1)
+        count_application(instance, instance.job_id, instance.status, 1)
+    elif old_status != instance.status:
+        move_application_counter(instance.job_id, old_status, instance.status)
+        day = submission_day(instance)
+        adjust_daily_stat(instance.job_id, day, old_status, -1)
+        adjust_daily_stat(instance.job_id, day, instance.status, 1)
+
+
+@receiver(post_save, sender=Application)
+def sync_interview_candidates(sender, instance, created, raw=False, **kwargs):
+    if created or raw:
+        return
+    # Interviews carry the candidate's email for their overlap index.
+    Interview.objects.filter(application_id=instance.pk).exclude(
+        candidate_email=instance.candidate_email,
+    ).update(candidate_email=instance.candidate_email)
+
+
+@receiver(post_delete, sender=Application)
+def count_deleted_application(sender, instance, **kwargs):
+    count_application(instance, instance.job_id, instance.status, -1)
@@ -0,0 +1,236 @@
+"""
+Similar-job recommendations.
+
+Each job is turned into a hashed term-frequency vector over its title,
+skills and description (``job_features``) and persisted as a ``JobVector``
+whenever the job is saved. ``SimilarJobsIndex`` loads the vectors of open
+jobs into NumPy arrays, applies IDF weights computed over the loaded corpus,
+and keeps them as a term -> postings (CSC) index, so the cosine similarity of
+one job against every other is a gather plus one ``bincount``.
+
+Jobs changed after the index was loaded are picked up on the next lookup
+(one indexed range query on ``JobVector.updated_at``) and scored on the side
+until there are enough of them to warrant a full reload.
+"""
+import heapq
+import math
+import threading
+import zlib
+from collections import defaultdict
+from datetime import timedelta
+from operator import itemgetter
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Job, JobVector
+from .search import tokenize
+from .skills import parse_skill_list
+
+FEATURE_BITS = 20
+FEATURE_MASK = (1 << FEATURE_BITS) - 1
+# Highest-weighted terms kept per job; bounds index size and load time.
+MAX_TERMS = 64
+FIELD_WEIGHTS = {'title': 3.0, 'skills': 2.0, 'description': 1.0}
+STOP_WORDS = frozenset(
+    'a an and are as at be by for from has have in is it of on or our the to we will with you your'.split()
+)
+# Allowance for clock differences between the processes writing vectors.
+SYNC_MARGIN = timedelta(seconds=5)
+
+
+def feature(token):
+    return zlib.crc32(token.encode()) & FEATURE_MASK
+
+
+def job_features(job):
+    """``(terms, weights)``: sorted int32 feature ids and float32 log-scaled weights."""
+    counts = defaultdict(float)
+    for field in ('title', 'description'):
+        for token in tokenize((getattr(job, field) or '').lower()):
+            if len(token) > 1 and token not in STOP_WORDS and not token.isdigit():
+                counts[token] += FIELD_WEIGHTS[field]
+    for skill in parse_skill_list(job.skills_required):
+        counts[f'skill:{skill}'] += FIELD_WEIGHTS['skills']
+    features = defaultdict(float)
+    for token, count in heapq.nlargest(MAX_TERMS, counts.items(), key=itemgetter(1)):
+        features[feature(token)] += 1 + math.log(count)
+    terms = np.fromiter(sorted(features), dtype=np.int32, count=len(features))
+    weights = np.fromiter((features[t] for t in terms.tolist()), dtype=np.float32, count=len(terms))
+    return terms, weights
+
+
+def _vector(job):
+    terms, weights = job_features(job)
+    return JobVector(job_id=job.pk, terms=terms.tobytes(), weights=weights.tobytes())
+
+
+def store_job_vector(job):
+    vector = _vector(job)
+    JobVector.objects.update_or_create(
+        job_id=job.pk, defaults={'terms': vector.terms, 'weights': vector.weights},
+    )
+
+
+def store_job_vectors(jobs):
+    return _upsert([_vector(job) for job in jobs])
+
+
+def rebuild_job_vectors(queryset=None, batch_size=1000):
+    """Vectorize ``queryset`` (default: every job) in batches; returns the count."""
+    if queryset is None:
+        queryset = Job.objects.all()
+    jobs = queryset.order_by().only('id', 'title', 'description', 'skills_required')
+    batch, total = [], 0
+    for job in jobs.iterator(chunk_size=batch_size):
+        batch.append(_vector(job))
+        if len(batch) >= batch_size:
+            total += _upsert(batch)
+            batch = []
+    return total + _upsert(batch)
+
+
+def _upsert(vectors):
+    with transaction.atomic():
+        JobVector.objects.bulk_create(
+            vectors, update_conflicts=True, unique_fields=['job'],
+            update_fields=['terms', 'weights', 'updated_at'],
+        )
+    return len(vectors)
+
+
+def _arrays(terms, weights):
+    return np.frombuffer(terms, dtype=np.int32), np.frombuffer(weights, dtype=np.float32)
+
+
+class SimilarJobsIndex:
+    def __init__(self, max_pending=1000):
+        # Changed jobs scored outside the arrays; past this a full reload is cheaper.
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._state = None
+
+    def load(self):
+        synced_at = timezone.now()
+        rebuild_job_vectors(Job.objects.filter(vector__isnull=True))
+        rows = JobVector.objects.filter(job__status='open').order_by('job_id').values_list(
+            'job_id', 'terms', 'weights',
+        )
+        job_ids, terms, weights = [], [], []
+        for job_id, job_terms, job_weights in rows.iterator(chunk_size=5000):
+            job_ids.append(job_id)
+            terms.append(bytes(job_terms))
+            weights.append(bytes(job_weights))
+        job_ids = np.array(job_ids, dtype=np.int64)
+        lengths = np.array([len(t) // 4 for t in terms], dtype=np.int64)
+        terms = np.frombuffer(b''.join(terms), dtype=np.int32)
+        values = np.frombuffer(b''.join(weights), dtype=np.float32)
+        docs = np.repeat(np.arange(len(job_ids), dtype=np.int32), lengths)
+
+        df = np.bincount(terms, minlength=FEATURE_MASK + 1)
+        idf = (np.log((1 + len(job_ids)) / (1 + df)) + 1).astype(np.float32)
+        values = values * idf[terms]
+        norms = np.sqrt(np.bincount(docs, weights=values * values, minlength=len(job_ids)))
+        values /= np.maximum(norms, 1e-12)[docs].astype(np.float32)
+
+        order = np.argsort(terms, kind='quicksort')
+        indptr = np.zeros(FEATURE_MASK + 2, dtype=np.int64)
+        np.cumsum(df, out=indptr[1:])
+        self._state = {
+            'job_ids': job_ids,
+            'indptr': indptr,
+            'docs': docs[order],
+            'values': values[order],
+            'idf': idf,
+            'pending': {},
+            'loaded_at': synced_at,
+            'synced_at': synced_at,
+        }
+
+    def refresh(self):
+        """
+        Sync with changed vectors and return the current state. A state is
+        never modified once published, so callers can read it without the lock.
+        """
+        with self._lock:
+            if self._state is None or len(self._state['pending']) > self.max_pending:
+                self.load()
+                return self._state
+            state = self._state
+            now = timezone.now()
+            changed = JobVector.objects.filter(
+                updated_at__gte=state['synced_at'] - SYNC_MARGIN,
+            ).values_list('job_id', 'job__status', 'terms', 'weights', 'updated_at')
+            pending = dict(state['pending'])
+            for job_id, status, terms, weights, updated_at in changed:
+                if updated_at < state['loaded_at'] and _row(state, job_id) is not None:
+                    continue  # Already in the arrays.
+                pending[job_id] = (
+                    _normalize(state, *_arrays(terms, weights)) if status == 'open' else None
+                )
+            self._state = {**state, 'pending': pending, 'synced_at': now}
+            return self._state
+
+    def similar(self, job_id, k=10):
+        """``[(job_id, score), ...]``: the ``k`` open jobs most like ``job_id``."""
+        vector = JobVector.objects.filter(job_id=job_id).values_list('terms', 'weights').first()
+        if vector is None:
+            job = Job.objects.filter(pk=job_id).first()
+            if job is None:
+                return []
+            store_job_vector(job)
+            vector = job_features(job)
+        else:
+            vector = _arrays(*vector)
+        state = self.refresh()
+        terms, query = _normalize(state, *vector)
+        scores = self._scores(state, terms, query)
+        job_ids = state['job_ids']
+        for other_id in state['pending']:
+            row = _row(state, other_id)
+            if row is not None:
+                scores[row] = 0
+        candidates = [(int(job_ids[row]), float(scores[row])) for row in _top(scores, k + 1)]
+        for other_id, other in state['pending'].items():
+            if other is not None:
+                common, left, right = np.intersect1d(terms, other[0], return_indices=True)
+                if len(common):
+                    candidates.append((other_id, float(query[left] @ other[1][right])))
+        candidates = [(other_id, score) for other_id, score in candidates if other_id != job_id and score > 0]
+        return heapq.nlargest(k, candidates, key=itemgetter(1))
+
+    @staticmethod
+    def _scores(state, terms, query):
+        indptr = state['indptr']
+        starts, ends = indptr[terms], indptr[terms + 1]
+        lengths = ends - starts
+        # Positions of every posting of every query term, without a Python loop.
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        positions = offsets + np.arange(lengths.sum())
+        return np.bincount(
+            state['docs'][positions],
+            weights=state['values'][positions] * np.repeat(query, lengths),
+            minlength=len(state['job_ids']),
+        )
+
+
+def _row(state, job_id):
+    job_ids = state['job_ids']
+    row = int(np.searchsorted(job_ids, job_id))
+    return row if row < len(job_ids) and job_ids[row] == job_id else None
+
+
+def _normalize(state, terms, weights):
+    values = weights * state['idf'][terms]
+    return terms, values / max(float(np.linalg.norm(values)), 1e-12)
+
+
+def _top(scores, k):
+    if len(scores) <= k:
+        return np.argsort(-scores)
+    top = np.argpartition(-scores, k)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+similar_jobs_index = SimilarJobsIndex()
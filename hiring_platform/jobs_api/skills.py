@@ -0,0 +1,130 @@
+"""
+Skill normalization and the candidate skill index.
+
+The vocabulary is every skill named in ``Job.skills_required``. CV text is
+matched against it (single words and phrases of up to ``MAX_SKILL_WORDS``
+words) and the hits are stored as ``ApplicationSkill`` rows, so recruiter
+queries are index lookups rather than scans of CV text.
+"""
+import hashlib
+import re
+
+from django.db import transaction
+from django.db.models import Count, FloatField, Value
+from django.db.models.functions import Cast
+
+from .cv_text import extract_text
+from .models import ApplicationSkill, CVText, Skill
+from .uploads import extension
+
+MAX_SKILL_WORDS = 3
+
+ALIASES = {
+    'js': 'javascript',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'nodejs': 'node.js',
+    'node': 'node.js',
+    'golang': 'go',
+    'postgres': 'postgresql',
+    'k8s': 'kubernetes',
+    'ml': 'machine learning',
+    'py': 'python',
+}
+
+# Keeps the punctuation that is part of skill names: c++, c#, node.js, .net
+_WORD_RE = re.compile(r'[a-z0-9+#.]*[a-z0-9+#]')
+
+
+def normalize_skill(name):
+    words = _WORD_RE.findall((name or '').lower())
+    skill = ' '.join(words)
+    return ALIASES.get(skill, skill)
+
+
+def parse_skill_list(value):
+    """Normalized, de-duplicated skills from a comma-separated string."""
+    seen = []
+    for part in (value or '').split(','):
+        skill = normalize_skill(part)
+        if skill and skill not in seen:
+            seen.append(skill)
+    return seen
+
+
+def sync_job_skills(*jobs):
+    """Add the jobs' skills to the vocabulary."""
+    names = {name for job in jobs for name in parse_skill_list(job.skills_required)}
+    if names:
+        Skill.objects.bulk_create(
+            [Skill(name=name) for name in names], ignore_conflicts=True,
+        )
+
+
+def find_skills(text, vocabulary):
+    words = _WORD_RE.findall((text or '').lower())
+    found = set()
+    for size in range(1, MAX_SKILL_WORDS + 1):
+        for start in range(len(words) - size + 1):
+            phrase = ' '.join(words[start:start + size])
+            phrase = ALIASES.get(phrase, phrase)
+            if phrase in vocabulary:
+                found.add(phrase)
+    return found
+
+
+_HASHED_NAME_RE = re.compile(r'/([0-9a-f]{64})\.\w+$')
+
+
+def cv_text_for(application):
+    """Extracted text for the application's CV, parsing each distinct file once."""
+    # Content-addressed names carry the hash, so a cache hit skips the file.
+    named = _HASHED_NAME_RE.search(application.cv.name or '')
+    if named:
+        cached = CVText.objects.filter(sha256=named.group(1)).values_list('text', flat=True).first()
+        if cached is not None:
+            return cached
+    with application.cv.open('rb') as handle:
+        data = handle.read()
+    digest = hashlib.sha256(data).hexdigest()
+    cached = CVText.objects.filter(sha256=digest).values_list('text', flat=True).first()
+    if cached is not None:
+        return cached
+    text = extract_text(data, extension(application.cv.name))
+    CVText.objects.get_or_create(sha256=digest, defaults={'text': text})
+    return text
+
+
+def index_application(application, vocabulary=None):
+    """Rebuild the application's ``ApplicationSkill`` rows; returns skill names."""
+    if vocabulary is None:
+        vocabulary = dict(Skill.objects.values_list('name', 'id'))
+    names = find_skills(cv_text_for(application), vocabulary)
+    with transaction.atomic():
+        ApplicationSkill.objects.filter(application=application).delete()
+        ApplicationSkill.objects.bulk_create([
+            ApplicationSkill(application=application, skill_id=vocabulary[name])
+            for name in names
+        ])
+    return names
+
+
+def match_applications(queryset, skills, min_score=0):
+    """
+    Applications having any of ``skills``, annotated with ``matched_skills``
+    and ``skill_score`` (fraction of the requested skills found) and ordered
+    best first. Resolved through the (skill, application) index.
+    """
+    names = [normalize_skill(name) for name in skills]
+    names = [name for name in dict.fromkeys(names) if name]
+    if not names:
+        return queryset
+    skill_ids = list(Skill.objects.filter(name__in=names).values_list('id', flat=True))
+    queryset = (
+        queryset.filter(skill_links__skill_id__in=skill_ids)
+        .annotate(matched_skills=Count('skill_links', distinct=True))
+        .annotate(skill_score=Cast('matched_skills', FloatField()) / Value(float(len(names))))
+    )
+    if min_score:
+        queryset = queryset.filter(skill_score__gte=min_score)
+    return queryset.order_by('-matched_skills', '-submitted_at', '-id')
@@ -0,0 +1,112 @@
+"""
+Dashboard statistics.
+
+Every figure comes from one grouped query. By default the queries read
+``ApplicationDailyStat``, a rollup of applications per (job, submission day,
+status) that the ``Application`` signals adjust incrementally, so their cost
+follows the number of jobs and days rather than applications. With
+``STATS_USE_ROLLUPS = False`` the same queries aggregate ``Application`` rows
+directly. ``manage.py rebuild_daily_stats`` repairs the rollup.
+"""
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DateField, F, Q, Sum
+from django.db.models.functions import Coalesce, Trunc, TruncDate
+from django.utils import timezone
+
+from .models import Application, ApplicationDailyStat
+
+BUCKET_CHOICES = [('day', 'Day'), ('week', 'Week'), ('month', 'Month')]
+STATUSES = [status for status, _ in Application.STATUS_CHOICES]
+
+
+def submission_day(application):
+    return timezone.localdate(application.submitted_at)
+
+
+def adjust_daily_stat(job_id, day, status, delta):
+    rows = ApplicationDailyStat.objects.filter(job_id=job_id, day=day, status=status)
+    if rows.update(count=F('count') + delta) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            ApplicationDailyStat.objects.create(job_id=job_id, day=day, status=status, count=delta)
+    except IntegrityError:
+        # Another request created the row first.
+        rows.update(count=F('count') + delta)
+
+
+def rebuild_daily_stats(since=None):
+    """Recompute the rollup (from ``since`` on, if given); returns rows written."""
+    applications = Application.objects.order_by()
+    rollup = ApplicationDailyStat.objects.all()
+    if since is not None:
+        applications = applications.filter(submitted_at__date__gte=since)
+        rollup = rollup.filter(day__gte=since)
+    rows = (
+        applications.annotate(day=TruncDate('submitted_at'))
+        .values('job_id', 'day', 'status')
+        .annotate(count=Count('pk'))
+    )
+    with transaction.atomic():
+        rollup.delete()
+        created = ApplicationDailyStat.objects.bulk_create(
+            [ApplicationDailyStat(**row) for row in rows.iterator()], batch_size=1000,
+        )
+    return len(created)
+
+
+class ApplicationStats:
+    """Grouped application counts, optionally narrowed to a job, company or dates."""
+
+    def __init__(self, job=None, company=None, since=None, until=None, use_rollups=None):
+        if use_rollups is None:
+            use_rollups = getattr(settings, 'STATS_USE_ROLLUPS', True)
+        self.use_rollups = use_rollups
+        if use_rollups:
+            queryset, day = ApplicationDailyStat.objects.all(), 'day'
+            self.date_field = 'day'
+        else:
+            queryset, day = Application.objects.all(), 'submitted_at__date'
+            self.date_field = 'submitted_at'
+        lookups = {
+            'job_id': job,
+            'job__company_id': company,
+            f'{day}__gte': since,
+            f'{day}__lte': until,
+        }
+        self.queryset = queryset.order_by().filter(
+            **{lookup: value for lookup, value in lookups.items() if value is not None}
+        )
+
+    def count(self, **filters):
+        condition = Q(**filters) if filters else None
+        if self.use_rollups:
+            return Coalesce(Sum('count', filter=condition), 0)
+        return Count('pk', filter=condition)
+
+    def status_counts(self):
+        return {'total': self.count(), **{status: self.count(status=status) for status in STATUSES}}
+
+    def breakdown(self):
+        counts = self.queryset.aggregate(**self.status_counts())
+        return {'total': counts.pop('total'), 'by_status': counts}
+
+    def timeline(self, bucket='day'):
+        period = Trunc(self.date_field, bucket, output_field=DateField())
+        rows = (
+            self.queryset.annotate(period=period).values('period')
+            .annotate(count=self.count()).order_by('period')
+        )
+        return [{'period': row['period'], 'count': row['count']} for row in rows]
+
+    def funnels(self):
+        """Per-job application counts in each status, busiest jobs first."""
+        rows = (
+            self.queryset.values('job_id', 'job__title')
+            .annotate(**self.status_counts()).order_by('-total', 'job_id')
+        )
+        return [
+            {'job_id': row.pop('job_id'), 'title': row.pop('job__title'), **row}
+            for row in rows
+        ]
@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.core.mail import send_mail
+
+from .counters import view_counter
+from .models import Application
+from .queue import task
+from .skills import index_application
+
+
+@task(name='notify_company_of_application')
+def notify_company_of_application(application_id):
+    application = (
+        Application.objects.select_related('job__company')
+        .filter(pk=application_id).first()
+    )
+    if application is None:
+        return  # Withdrawn before the worker got to it.
+    job = application.job
+    send_mail(
+        subject=f'New application for {job.title}',
+        message=(
+            f'{application.candidate_name} <{application.candidate_email}> '
+            f'applied for {job.title}.'
+        ),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[job.company.email],
+    )
+
+
+@task(name='extract_cv_skills')
+def extract_cv_skills(application_id):
+    application = Application.objects.filter(pk=application_id).first()
+    if application is not None:
+        index_application(application)
+
+
+@task(name='flush_view_counts', max_attempts=3)
+def flush_view_counts():
+    view_counter.flush()
@@ -1,3 +1,2103 @@
-from django.test import TestCase
+import csv
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+import zipfile
+import zlib
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.db.models import F
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from django.utils.translation import gettext_lazy
+from PIL import Image
+from rest_framework import test
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.test import APIRequestFactory
+
+from hiring_platform.database import database_from_env
+
+from .cv_text import extract_text
+from .models import (
+    Application, ApplicationDailyStat, ApplicationSkill, ArchivedApplication, ArchivedInterview, ArchivedJob,
+    BackgroundTask, Company, Interview, Job, JobCategory, JobVector, SavedJob, Skill,
+)
+from .counters import ViewCounter, recompute_application_counters
+from .metrics import install_query_tracking, registry as metrics_registry
+from .pagination import KeysetPagination
+from .queue import claim, enqueue, retry_delay, run_pending, task
+from .recent import RecentJobsBuffer, RecentJobsStream, recent_jobs
+from .renderers import ORJSONRenderer
+from .scheduling import overlapping
+from .search import SQLiteFTS5Backend, tokenize
+from .serializers import CategorySummarySerializer, JobReadSerializer, JobSerializer
+from .similarity import SimilarJobsIndex
+from .skills import find_skills, normalize_skill, parse_skill_list
+from .stats import ApplicationStats, rebuild_daily_stats
+from .throttling import CacheBucketStore, LocalBucketStore, TokenThrottle, get_throttle_store
+from .uploads import CVUploadHandler
+from .values import ValuesSerializer
+from .views import ApplicationViewSet, JobViewSet
+
+
+class APITestCase(test.APITestCase):
+    def setUp(self):
+        super().setUp()
+        # The response cache and throttle buckets outlive each test's transaction.
+        # (cache.clear() also empties CacheBucketStore buckets on the default alias.)
+        cache.clear()
+        store = get_throttle_store()
+        if isinstance(store, LocalBucketStore):
+            store.clear()
+
+
+def make_company(name='Acme', **kwargs):
+    kwargs.setdefault('email', f'{name.lower()}@example.com')
+    kwargs.setdefault('location', 'Kathmandu')
+    return Company.objects.create(name=name, **kwargs)
+
+
+def make_job(company, title='Engineer', **kwargs):
+    kwargs.setdefault('location', 'Remote')
+    kwargs.setdefault('description', 'Build things.')
+    return Job.objects.create(company=company, title=title, **kwargs)
+
+
+class SearchBackendTests(TestCase):
+    def setUp(self):
+        self.company = make_company()
+        self.backend = SQLiteFTS5Backend()
+
+    def search(self, query):
+        return list(self.backend.search(Job.objects.all(), query))
+
+    def test_tokenize_strips_query_syntax(self):
+        self.assertEqual(tokenize('python" OR "x*'), ['python', 'OR', 'x'])
+        self.assertEqual(self.backend.build_match('NEAR(a b)'), '"NEAR"* "a"* "b"*')
+
+    def test_prefix_match(self):
+        job = make_job(self.company, skills_required='Python, Django')
+        self.assertEqual(self.search('pyth'), [job])
+
+    def test_title_match_ranks_first(self):
+        in_description = make_job(self.company, title='Analyst', description='Some django work')
+        in_title = make_job(self.company, title='Django Developer')
+        self.assertEqual(self.search('django'), [in_title, in_description])
+
+    def test_snippet_highlights_match(self):
+        make_job(self.company, description='We need a kubernetes expert.')
+        job = self.search('kubernetes')[0]
+        self.assertIn('<mark>kubernetes</mark>', job.search_snippet)
+
+    def test_snippet_escapes_job_text(self):
+        make_job(self.company, description='<img src=x onerror="alert(1)"> & kubernetes <b>now</b>')
+        snippet = self.search('kubernetes')[0].search_snippet
+        self.assertEqual(snippet, (
+            '&lt;img src=x onerror=&quot;alert(1)&quot;&gt; &amp; '
+            '<mark>kubernetes</mark> &lt;b&gt;now&lt;/b&gt;'
+        ))
+
+    def test_index_follows_save_and_delete(self):
+        job = make_job(self.company, title='Rust Engineer')
+        job.title = 'Go Engineer'
+        job.save()
+        self.assertEqual(self.search('rust'), [])
+        self.assertEqual(self.search('go'), [job])
+        job.delete()
+        self.assertEqual(self.search('go'), [])
+
+    def test_rebuild(self):
+        job = make_job(self.company, title='Haskell Engineer')
+        self.backend.remove(job.pk)
+        self.assertEqual(self.search('haskell'), [])
+        self.backend.rebuild()
+        self.assertEqual(self.search('haskell'), [job])
+
+
+class JobSearchApiTests(APITestCase):
+    def test_search_param(self):
+        company = make_company()
+        make_job(company, title='Designer')
+        make_job(company, title='Backend Engineer', requirements='PostgreSQL experience')
+        response = self.client.get('/api/jobs/', {'search': 'postgres'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 1)
+        result = response.data['results'][0]
+        self.assertEqual(result['title'], 'Backend Engineer')
+        self.assertIn('<mark>', result['search_snippet'])
+
+    def test_blank_search_lists_everything(self):
+        company = make_company()
+        make_job(company)
+        make_job(company)
+        response = self.client.get('/api/jobs/', {'search': ' "* '})
+        self.assertEqual(response.data['count'], 2)
+
+
+class JobFilterApiTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        company = make_company()
+        self.backend_cat = JobCategory.objects.create(name='Backend')
+        self.design_cat = JobCategory.objects.create(name='Design')
+        make_job(company, title='Senior Django', category=self.backend_cat,
+                 experience_level='Senior', salary_min=90000, salary_max=120000)
+        make_job(company, title='Junior Django', category=self.backend_cat,
+                 salary_min=40000, salary_max=60000, location='Pokhara')
+        make_job(company, title='Contract Designer', category=self.design_cat,
+                 job_type='Contract', status='closed')
+
+    def titles(self, **params):
+        response = self.client.get('/api/jobs/', params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(job['title'] for job in response.data['results'])
+
+    def test_filters(self):
+        self.assertEqual(self.titles(category=self.design_cat.pk), ['Contract Designer'])
+        self.assertEqual(self.titles(status='open', experience_level='Senior'), ['Senior Django'])
+        self.assertEqual(self.titles(location='pokh'), ['Junior Django'])
+        self.assertEqual(self.titles(salary_min=50000), ['Senior Django'])
+        self.assertEqual(self.titles(salary_max=100000), ['Junior Django'])
+
+    def test_invalid_values_are_rejected(self):
+        response = self.client.get('/api/jobs/', {'salary_min': 'lots', 'job_type': 'Gig'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {'salary_min', 'job_type'})
+
+    def test_facets_follow_filters(self):
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/jobs/', {'status': 'open'})
+        self.assertEqual(response.data['facets'], {
+            'job_type': {'Full-time': 2},
+            'experience_level': {'Entry': 1, 'Senior': 1},
+            'category': {self.backend_cat.pk: 2},
+        })
+
+    def test_facets_with_search(self):
+        response = self.client.get('/api/jobs/', {'search': 'designer'})
+        self.assertEqual(response.data['facets']['job_type'], {'Contract': 1})
+
+    def test_listing_filter_uses_composite_index(self):
+        queryset = Job.objects.filter(category=self.backend_cat, status='open')
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+        self.assertIn('job_cat_status_created_idx', plan)
+
+
+class KeysetPaginationTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.company = make_company()
+
+    def bulk_jobs(self, count):
+        Job.objects.bulk_create(
+            Job(company=self.company, title=f'Job {i}', location='Remote', description='x')
+            for i in range(count)
+        )
+
+    def walk(self, url, params):
+        seen = []
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(job['id'] for job in response.data['results'])
+            url, params = response.data['next'], None
+        return seen
+
+    def test_walks_every_row_once_in_keyset_order(self):
+        self.bulk_jobs(25)
+        seen = self.walk('/api/jobs/', {'pagination': 'cursor', 'page_size': 10})
+        expected = list(Job.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_stable_under_concurrent_inserts(self):
+        self.bulk_jobs(6)
+        first = self.client.get('/api/jobs/', {'pagination': 'cursor', 'page_size': 3}).data
+        self.assertNotIn('count', first)
+        make_job(self.company, title='Posted meanwhile')
+        rest = self.walk(first['next'], None)
+        ids = [job['id'] for job in first['results']] + rest
+        self.assertEqual(len(ids), 6)
+        self.assertEqual(len(set(ids)), 6)
+
+    def test_constant_query_cost_at_deep_pages(self):
+        self.bulk_jobs(10_000)
+        ordering = ('-created_at', '-id')
+        # Cursor pointing at the end of page 9,999 when page_size is 1.
+        anchor = Job.objects.order_by(*ordering)[9_998]
+        cursor = KeysetPagination(ordering, 1).encode_cursor(anchor)
+
+        # Just the page query: no COUNT, no OFFSET and no facets aggregate.
+        with self.assertNumQueries(1) as first_page:
+            self.client.get('/api/jobs/', {'pagination': 'cursor', 'page_size': 1})
+        with self.assertNumQueries(1) as deep_page:
+            response = self.client.get('/api/jobs/', {'cursor': cursor, 'page_size': 1})
+        self.assertEqual(response.data['results'][0]['title'], 'Job 0')
+        self.assertNotIn('facets', response.data)
+        for context in (first_page, deep_page):
+            page_sql = context.captured_queries[0]['sql']
+            self.assertNotIn('OFFSET', page_sql)
+            self.assertNotIn('COUNT', page_sql)
+            self.assertNotIn('GROUP BY', page_sql)
+
+    def test_count_opt_in_for_cursor_and_opt_out_for_pages(self):
+        self.bulk_jobs(3)
+        data = self.client.get('/api/jobs/', {'pagination': 'cursor', 'count': 'true'}).data
+        self.assertEqual(data['count'], 3)
+        with self.assertNumQueries(1):
+            data = self.client.get('/api/jobs/', {'count': 'false', 'page_size': 2}).data
+        self.assertNotIn('count', data)
+        self.assertNotIn('facets', data)
+        self.assertIn('page=2', data['next'])
+
+    def test_facets_follow_the_count_unless_asked(self):
+        self.bulk_jobs(3)
+        self.assertIn('facets', self.client.get('/api/jobs/', {'pagination': 'cursor', 'count': 'true'}).data)
+        data = self.client.get('/api/jobs/', {'pagination': 'cursor', 'facets': 'true'}).data
+        self.assertEqual(sum(data['facets']['job_type'].values()), 3)
+        with self.assertNumQueries(2):
+            data = self.client.get('/api/jobs/', {'facets': 'false'}).data
+        self.assertNotIn('facets', data)
+        self.assertEqual(self.client.get('/api/jobs/', {'facets': 'maybe'}).status_code, 400)
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/jobs/', {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_rejects_other_orderings(self):
+        self.bulk_jobs(3)
+        cursor = KeysetPagination(('-created_at', '-id'), 1).encode_cursor(Job.objects.order_by('-created_at', '-id').first())
+        for params in ({'search': 'job', 'cursor': cursor}, {'ordering': 'title', 'pagination': 'cursor'}):
+            response = self.client.get('/api/jobs/', params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn('pagination', response.data)
+        self.assertEqual(self.client.get('/api/jobs/', {'search': 'job', 'page_size': 1}).status_code, 200)
+        response = self.client.get('/api/jobs/', {'ordering': '-created_at', 'cursor': cursor})
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_applications_keyset_on_submitted_at(self):
+        job = make_job(self.company)
+        for i in range(5):
+            Application.objects.create(
+                job=job, candidate_name=f'C{i}', candidate_email=f'c{i}@example.com',
+                phone_number='1', cv='cvs/c.pdf',
+            )
+        seen = self.walk('/api/applications/', {'pagination': 'cursor', 'page_size': 2})
+        expected = list(
+            Application.objects.order_by('-submitted_at', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+
+class ListQueryCountTests(APITestCase):
+    """A 100-row page must cost the same number of queries as a 1-row page."""
+
+    rows = 100
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories = JobCategory.objects.bulk_create(
+            JobCategory(name=f'Category {i}') for i in range(cls.rows)
+        )
+        cls.companies = Company.objects.bulk_create(
+            Company(name=f'Company {i}', email=f'c{i}@example.com', location='Remote')
+            for i in range(cls.rows)
+        )
+        cls.jobs = Job.objects.bulk_create(
+            Job(company=company, category=category, title=f'Job {i}',
+                location='Remote', description='x')
+            for i, (company, category) in enumerate(zip(cls.companies, cls.categories))
+        )
+        Application.objects.bulk_create(
+            Application(job=job, candidate_name='C', candidate_email=f'c{i}@example.com',
+                        phone_number='1', cv='cvs/c.pdf')
+            for i, job in enumerate(cls.jobs)
+        )
+        # Point every job at one company and category for the nested listings.
+        Job.objects.filter(pk__in=[job.pk for job in cls.jobs]).update(
+            company=cls.companies[0], category=cls.categories[0],
+        )
+
+    def assertListQueries(self, url, num, params=None):
+        params = {'page_size': self.rows, **(params or {})}
+        with self.assertNumQueries(num):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data['results']
+
+    def test_categories(self):
+        results = self.assertListQueries('/api/categories/', 2)
+        self.assertEqual(len(results), self.rows)
+        self.assertEqual(results[0]['jobs_count'], self.rows)
+
+    def test_companies(self):
+        results = self.assertListQueries('/api/companies/', 2)
+        self.assertEqual(len(results), self.rows)
+        self.assertEqual(sum(company['active_jobs'] for company in results), self.rows)
+
+    def test_jobs(self):
+        # count, page, facets
+        results = self.assertListQueries('/api/jobs/', 3)
+        self.assertEqual(len(results), self.rows)
+        self.assertEqual(results[0]['company']['name'], 'Company 0')
+        self.assertEqual(results[0]['category']['name'], 'Category 0')
+
+    def test_jobs_keyset(self):
+        self.assertListQueries('/api/jobs/', 1, {'pagination': 'cursor'})
+
+    def test_applications(self):
+        results = self.assertListQueries('/api/applications/', 2)
+        self.assertEqual(len(results), self.rows)
+        self.assertTrue(results[0]['job_title'].startswith('Job '))
+        self.assertEqual(results[0]['company_name'], 'Company 0')
+
+    def test_company_jobs(self):
+        results = self.assertListQueries(f'/api/companies/{self.companies[0].pk}/jobs/', 2)
+        self.assertEqual(len(results), self.rows)
+
+    def test_category_jobs(self):
+        results = self.assertListQueries(f'/api/categories/{self.categories[0].pk}/jobs/', 2)
+        self.assertEqual(len(results), self.rows)
+
+    def test_detail_embeds_relations(self):
+        # The job, and its views_count UPDATE: the test cache is process-local.
+        with self.assertNumQueries(2):
+            data = self.client.get(f'/api/jobs/{self.jobs[0].pk}/').data
+        self.assertEqual(data['company']['id'], self.companies[0].pk)
+
+
+@override_settings(API_CACHE_TIMEOUT=300)
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.company = make_company()
+        self.job = make_job(self.company, title='Cached Engineer')
+
+    def test_second_request_is_served_from_cache(self):
+        first = self.client.get('/api/jobs/', {'page': 1, 'status': 'open'})
+        self.assertEqual(first['X-Cache'], 'MISS')
+        # Param order and empty values don't produce a new key.
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/jobs/?status=open&location=&page=1')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_if_none_match(self):
+        etag = self.client.get(f'/api/jobs/{self.job.pk}/')['ETag']
+        response = self.client.get(f'/api/jobs/{self.job.pk}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get('/api/categories/')['Last-Modified']
+        response = self.client.get('/api/categories/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_job_write_invalidates(self):
+        self.client.get(f'/api/jobs/{self.job.pk}/')
+        self.job.title = 'Renamed'
+        self.job.save()
+        response = self.client.get(f'/api/jobs/{self.job.pk}/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['title'], 'Renamed')
+
+    def test_job_write_invalidates_again_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.job.title = 'Renamed'
+            self.job.save()
+            # Stands in for a reader that cached the row before the commit.
+            self.assertEqual(self.client.get(f'/api/jobs/{self.job.pk}/')['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(f'/api/jobs/{self.job.pk}/')['X-Cache'], 'HIT')
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get(f'/api/jobs/{self.job.pk}/')['X-Cache'], 'MISS')
+
+    def test_company_write_invalidates_embedded_jobs(self):
+        self.client.get('/api/jobs/')
+        self.company.name = 'Acme Renamed'
+        self.company.save()
+        data = self.client.get('/api/jobs/').json()
+        self.assertEqual(data['results'][0]['company']['name'], 'Acme Renamed')
+
+    def test_category_listing_tracks_job_deletes(self):
+        category = JobCategory.objects.create(name='Ops')
+        make_job(self.company, category=category)
+        self.assertEqual(self.client.get('/api/categories/').json()['results'][0]['jobs_count'], 1)
+        Job.objects.filter(category=category).delete()
+        self.assertEqual(self.client.get('/api/categories/').json()['results'][0]['jobs_count'], 0)
+
+    def test_writes_are_not_cached(self):
+        response = self.client.post('/api/categories/', {'name': 'New'})
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('X-Cache', response)
+
+
+class ViewCounterTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        company = make_company()
+        self.job = make_job(company)
+        self.other = make_job(company)
+        self.counter = ViewCounter(cache=cache, threshold=1000, interval=3600, buffered=True)
+
+    def views(self, job):
+        job.refresh_from_db(fields=['views_count'])
+        return job.views_count
+
+    def test_views_are_buffered_then_flushed_in_batches(self):
+        for _ in range(3):
+            self.counter.record(self.job.pk)
+        self.counter.record(self.other.pk)
+        self.assertEqual(self.views(self.job), 0)
+        self.assertEqual(self.counter.pending(), {self.job.pk: 3, self.other.pk: 1})
+        # One UPDATE per distinct increment, inside a transaction.
+        with self.assertNumQueries(4):
+            self.assertEqual(self.counter.flush(), 4)
+        self.assertEqual((self.views(self.job), self.views(self.other)), (3, 1))
+        self.assertEqual(self.counter.pending(), {})
+        self.assertEqual(self.counter.flush(), 0)
+
+    def test_threshold_queues_a_flush(self):
+        counter = ViewCounter(cache=cache, threshold=5, interval=3600, buffered=True)
+        for _ in range(10):
+            counter.record(self.job.pk)
+        self.assertEqual(self.views(self.job), 0)
+        # One per interval, however often the threshold is reached.
+        self.assertEqual(BackgroundTask.objects.filter(name='flush_view_counts').count(), 1)
+        with mock.patch('jobs_api.tasks.view_counter', counter):
+            run_pending()
+        self.assertEqual(self.views(self.job), 10)
+
+    def test_process_local_cache_writes_through(self):
+        counter = ViewCounter(cache=cache, threshold=1000, interval=3600)
+        self.assertFalse(counter.buffered)
+        counter.record(self.job.pk)
+        self.assertEqual(self.views(self.job), 1)
+        self.assertEqual(counter.pending(), {})
+
+    def test_no_lost_views_across_worker_restart(self):
+        for _ in range(7):
+            self.counter.record(self.job.pk)
+        del self.counter  # Worker dies without flushing.
+        restarted = ViewCounter(cache=cache, threshold=1000, interval=3600, buffered=True)
+        restarted.record(self.job.pk)
+        restarted.flush()
+        self.assertEqual(self.views(self.job), 8)
+
+    def test_views_recorded_during_flush_survive(self):
+        self.counter.record(self.job.pk)
+        write = self.counter._write
+
+        def write_while_traffic_arrives(counts):
+            self.counter.record(self.job.pk)
+            self.counter.record(self.other.pk)
+            write(counts)
+
+        with mock.patch.object(self.counter, '_write', write_while_traffic_arrives):
+            self.counter.flush()
+        self.assertEqual(self.counter.pending(), {self.job.pk: 1, self.other.pk: 1})
+        self.counter.flush()
+        self.assertEqual((self.views(self.job), self.views(self.other)), (2, 1))
+
+    def test_failed_write_keeps_views(self):
+        self.counter.record(self.job.pk)
+        with mock.patch.object(self.counter, '_write', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                self.counter.flush()
+        self.assertEqual(self.counter.pending(), {self.job.pk: 1})
+        self.counter.flush()
+        self.assertEqual(self.views(self.job), 1)
+
+    def test_unwritten_slot_holds_back_flush_until_stalled(self):
+        self.counter.record(self.job.pk)
+        cache.incr('job-views:seq')  # A writer claimed a slot but hasn't filled it.
+        self.counter.record(self.other.pk)
+        self.assertEqual(self.counter.flush(), 1)
+        self.assertEqual(self.counter.pending(), {self.other.pk: 1})
+        with mock.patch('jobs_api.counters.time.time', return_value=time.time() + 60):
+            self.assertEqual(self.counter.flush(), 1)
+        self.assertEqual(self.views(self.other), 1)
+
+    def test_evicted_slots_are_swept_together(self):
+        self.counter.record(self.job.pk)
+        self.counter.record(self.other.pk)
+        cache.delete_many(['job-views:slot:1', 'job-views:slot:2'])  # Culled.
+        self.counter.record(self.job.pk)  # Already counted, so not registered again.
+        self.assertEqual(self.counter.flush(), 0)
+        with mock.patch('jobs_api.counters.time.time', return_value=time.time() + 60):
+            self.assertEqual(self.counter.flush(), 3)
+        self.assertEqual((self.views(self.job), self.views(self.other)), (2, 1))
+
+        self.counter.record(self.other.pk)
+        cache.delete('job-views:seq')
+        self.assertEqual(self.counter.flush(), 1)
+        self.assertEqual(self.views(self.other), 2)
+        self.counter.record(self.job.pk)
+        self.assertEqual(self.counter.pending(), {self.job.pk: 1})
+
+    def test_job_detail_records_view_without_updating(self):
+        with mock.patch('jobs_api.views.view_counter', self.counter):
+            with self.assertNumQueries(1):
+                self.client.get(f'/api/jobs/{self.job.pk}/')
+            self.client.get('/api/jobs/999999/')
+        self.assertEqual(self.counter.pending(), {self.job.pk: 1})
+        out = StringIO()
+        call_command('flush_view_counts', stdout=out)
+        self.assertIn('Flushed 1 job views', out.getvalue())
+        self.assertEqual(self.views(self.job), 1)
+
+
+def make_application(job, email='candidate@example.com', **kwargs):
+    kwargs.setdefault('candidate_name', 'Candidate')
+    kwargs.setdefault('phone_number', '9800000000')
+    kwargs.setdefault('cv', 'cvs/cv.pdf')
+    return Application.objects.create(job=job, candidate_email=email, **kwargs)
+
+
+class ApplicationCounterTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        company = make_company()
+        self.job = make_job(company)
+        self.other = make_job(company)
+
+    def counters(self, job):
+        job.refresh_from_db()
+        return (
+            job.applications_count, job.pending_applications_count,
+            job.accepted_applications_count, job.rejected_applications_count,
+        )
+
+    def test_create_status_change_and_delete(self):
+        first = make_application(self.job, 'a@example.com')
+        make_application(self.job, 'b@example.com', status='rejected')
+        self.assertEqual(self.counters(self.job), (2, 1, 0, 1))
+
+        first.status = 'reviewing'
+        first.save()
+        self.assertEqual(self.counters(self.job), (2, 1, 0, 1))
+        first.status = 'accepted'
+        first.save()
+        self.assertEqual(self.counters(self.job), (2, 0, 1, 1))
+
+        first.delete()
+        self.assertEqual(self.counters(self.job), (1, 0, 0, 1))
+        Application.objects.all().delete()
+        self.assertEqual(self.counters(self.job), (0, 0, 0, 0))
+
+    def test_status_change_through_api(self):
+        application = make_application(self.job)
+        response = self.client.patch(
+            f'/api/applications/{application.pk}/', {'status': 'accepted'}, format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.counters(self.job), (1, 0, 1, 0))
+
+    def test_concurrent_status_changes_move_counters_once(self):
+        application = make_application(self.job)
+        stale = Application.objects.get(pk=application.pk)
+        application.status = 'accepted'
+        application.save()  # Another request, after this one loaded the row.
+        with mock.patch.object(ApplicationViewSet, 'get_object', return_value=stale):
+            response = self.client.patch(
+                f'/api/applications/{application.pk}/', {'status': 'rejected'}, format='json',
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.counters(self.job), (1, 0, 0, 1))
+
+    def test_job_edits_keep_concurrent_counter_updates(self):
+        make_application(self.job)
+        original = JobSerializer.update
+
+        def update_during_request(serializer, instance, validated_data):
+            # Lands after get_object() loaded the row, before it is saved.
+            make_application(self.job, 'late@example.com')
+            Job.objects.filter(pk=self.job.pk).update(views_count=F('views_count') + 5)
+            return original(serializer, instance, validated_data)
+
+        with mock.patch.object(JobSerializer, 'update', update_during_request):
+            response = self.client.patch(f'/api/jobs/{self.job.pk}/', {'title': 'Renamed'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.counters(self.job), (2, 2, 0, 0))
+        self.assertEqual((self.job.title, self.job.views_count), ('Renamed', 5))
+
+    def test_moving_to_another_job(self):
+        application = make_application(self.job)
+        application.job = self.other
+        application.save()
+        self.assertEqual(self.counters(self.job), (0, 0, 0, 0))
+        self.assertEqual(self.counters(self.other), (1, 1, 0, 0))
+
+    def test_counters_are_read_only_over_api(self):
+        response = self.client.patch(
+            f'/api/jobs/{self.job.pk}/', {'applications_count': 99}, format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.counters(self.job)[0], 0)
+
+    def test_recompute_fixes_drift_with_one_aggregate(self):
+        make_application(self.job, 'a@example.com')
+        make_application(self.job, 'b@example.com', status='accepted')
+        Application.objects.filter(status='accepted').update(status='rejected')
+        Job.objects.filter(pk=self.other.pk).update(applications_count=5)
+
+        # aggregate, current counters, bulk update (wrapped in a savepoint)
+        with self.assertNumQueries(5):
+            fixed = recompute_application_counters()
+        self.assertEqual(fixed, 2)
+        self.assertEqual(self.counters(self.job), (2, 1, 0, 1))
+        self.assertEqual(self.counters(self.other), (0, 0, 0, 0))
+
+        out = StringIO()
+        call_command('recompute_counters', stdout=out)
+        self.assertIn('Fixed counters on 0 jobs', out.getvalue())
+
+
+class CVUploadTests(APITestCase):
+    pdf = b'%PDF-1.7\n' + b'resume body ' * 100
+
+    def setUp(self):
+        super().setUp()
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.media_root = media.name
+        self.enterContext(override_settings(MEDIA_ROOT=self.media_root))
+        self.job = make_job(make_company())
+
+    def submit(self, content, name='cv.pdf', email='a@example.com'):
+        return self.client.post('/api/applications/', {
+            'job': self.job.pk,
+            'candidate_name': 'Candidate',
+            'candidate_email': email,
+            'phone_number': '9800000000',
+            'cv': SimpleUploadedFile(name, content),
+        }, format='multipart')
+
+    def stored_files(self):
+        return [
+            os.path.relpath(os.path.join(root, name), self.media_root)
+            for root, _, names in os.walk(self.media_root) for name in names
+        ]
+
+    def test_identical_cvs_are_stored_once_by_content_hash(self):
+        first = self.submit(self.pdf)
+        self.assertEqual(first.status_code, 201, first.data)
+        second = self.submit(self.pdf, name='other-name.pdf', email='b@example.com')
+        self.assertEqual(second.status_code, 201, second.data)
+
+        digest = hashlib.sha256(self.pdf).hexdigest()
+        expected = f'cvs/sha256/{digest[:2]}/{digest[2:4]}/{digest}.pdf'
+        self.assertEqual(
+            list(Application.objects.values_list('cv', flat=True)), [expected, expected],
+        )
+        self.assertEqual(self.stored_files(), [expected])
+
+    def test_rejects_unknown_extension(self):
+        response = self.submit(b'MZ\x90\x00', name='cv.exe')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('cv', response.data)
+
+    def test_rejects_content_not_matching_extension(self):
+        response = self.submit(b'\x7fELF binary', name='cv.pdf')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('does not look like', str(response.data['cv']))
+        self.assertEqual(self.stored_files(), [])
+
+    @override_settings(CV_UPLOAD_MAX_BYTES=100 * 1024)
+    def test_rejects_oversized_file_while_streaming(self):
+        # Declared length fits, so the size check must trip mid-stream.
+        with mock.patch('jobs_api.uploads.FORM_OVERHEAD_BYTES', 10 * 1024 * 1024):
+            response = self.submit(b'%PDF-' + b'x' * 200 * 1024)
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(Application.objects.exists())
+
+    @override_settings(CV_UPLOAD_MAX_BYTES=1024)
+    def test_rejects_on_content_length_before_reading(self):
+        with mock.patch.object(CVUploadHandler, 'receive_data_chunk') as receive:
+            response = self.submit(b'%PDF-' + b'x' * 200 * 1024)
+        self.assertEqual(response.status_code, 413)
+        receive.assert_not_called()
+
+
+calls = []
+
+
+@task(name='tests.record', max_attempts=3)
+def record_call(value, fail_times=0):
+    calls.append(value)
+    if calls.count(value) <= fail_times:
+        raise RuntimeError('boom')
+
+
+class BackgroundTaskQueueTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        calls.clear()
+
+    def test_runs_due_tasks(self):
+        enqueue(record_call, {'value': 'a'})
+        enqueue(record_call, {'value': 'later'}, delay=timedelta(hours=1))
+        self.assertEqual(run_pending('w1'), 1)
+        self.assertEqual(calls, ['a'])
+        self.assertEqual(
+            sorted(BackgroundTask.objects.values_list('status', flat=True)), ['done', 'pending'],
+        )
+
+    def test_idempotency_key(self):
+        first = enqueue(record_call, {'value': 'a'}, idempotency_key='k')
+        second = enqueue(record_call, {'value': 'a'}, idempotency_key='k')
+        self.assertEqual(first.pk, second.pk)
+        run_pending('w1')
+        self.assertEqual(calls, ['a'])
+
+    def test_retries_with_backoff_then_fails(self):
+        row = enqueue(record_call, {'value': 'x', 'fail_times': 5})
+        before = timezone.now()
+        run_pending('w1')
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts), ('pending', 1))
+        self.assertGreaterEqual(row.run_at, before + timedelta(seconds=10))
+        self.assertIn('RuntimeError: boom', row.last_error)
+        self.assertEqual(run_pending('w1'), 0)  # Not due yet.
+
+        with self.assertLogs('jobs_api.queue', 'ERROR'):
+            for _ in range(2):
+                BackgroundTask.objects.filter(pk=row.pk).update(run_at=timezone.now())
+                run_pending('w1')
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts), ('failed', 3))
+        self.assertEqual(retry_delay(3), timedelta(seconds=40))
+
+    def test_retry_succeeds(self):
+        row = enqueue(record_call, {'value': 'y', 'fail_times': 1})
+        run_pending('w1')
+        BackgroundTask.objects.filter(pk=row.pk).update(run_at=timezone.now())
+        run_pending('w1')
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts, row.last_error), ('done', 2, None))
+
+    def test_claimed_task_is_not_claimed_twice(self):
+        enqueue(record_call, {'value': 'a'})
+        self.assertEqual(len(claim('w1')), 1)
+        self.assertEqual(claim('w2'), [])
+
+    def test_stale_running_task_is_reclaimed(self):
+        enqueue(record_call, {'value': 'a'})
+        claim('crashed-worker')
+        BackgroundTask.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(run_pending('w2'), 1)
+        self.assertEqual(calls, ['a'])
+
+    def test_unknown_task_fails_without_crashing_worker(self):
+        BackgroundTask.objects.create(name='no.such.task', run_at=timezone.now(), max_attempts=1)
+        with self.assertLogs('jobs_api.queue', 'ERROR'):
+            run_pending('w1')
+        self.assertEqual(BackgroundTask.objects.get().status, 'failed')
+
+    def test_application_create_queues_notification(self):
+        job = make_job(make_company(email='hr@acme.example'))
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        with override_settings(MEDIA_ROOT=media.name):
+            response = self.client.post('/api/applications/', {
+                'job': job.pk, 'candidate_name': 'Ada', 'candidate_email': 'ada@example.com',
+                'phone_number': '1', 'cv': SimpleUploadedFile('cv.txt', b'Python'),
+            }, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(mail.outbox), 0)
+        task_row = BackgroundTask.objects.get(name='notify_company_of_application')
+        self.assertEqual(task_row.idempotency_key, f'application-created:{response.data["id"]}')
+
+        out = StringIO()
+        call_command('run_workers', processes=1, once=True, stdout=out)
+        self.assertIn('Processed 2 tasks', out.getvalue())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['hr@acme.example'])
+
+
+class CVSkillIndexTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        self.job = make_job(make_company(), skills_required='Python, Django, PostgreSQL, Machine Learning')
+
+    def apply(self, email, text, name='cv.txt'):
+        response = self.client.post('/api/applications/', {
+            'job': self.job.pk, 'candidate_name': 'Candidate', 'candidate_email': email,
+            'phone_number': '1', 'cv': SimpleUploadedFile(name, text),
+        }, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def test_extracts_text_from_pdf_and_docx(self):
+        stream = zlib.compress(b'BT (Senior Python) Tj T* [(Dja) -20 (ngo)] TJ ET')
+        pdf = b'%PDF-1.4\n1 0 obj<<>>stream\n' + stream + b'\nendstream\nendobj'
+        self.assertEqual(extract_text(pdf, 'pdf').split(), ['Senior', 'Python', 'Django'])
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            archive.writestr('word/document.xml', (
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                '<w:body><w:p><w:r><w:t>Go</w:t></w:r><w:r><w:t>lang dev</w:t></w:r></w:p></w:body>'
+                '</w:document>'
+            ))
+        self.assertEqual(extract_text(buffer.getvalue(), 'docx'), 'Golang dev')
+        self.assertEqual(extract_text(b'PK broken', 'docx'), '')
+
+    @mock.patch('jobs_api.cv_text.MAX_TEXT_BYTES', 1024)
+    def test_decompression_is_bounded(self):
+        stream = zlib.compress(b'BT (Head) Tj ET' + b' ' * 100_000 + b'BT (Tail) Tj ET')
+        pdf = b'%PDF-1.4\n1 0 obj<<>>stream\n' + stream + b'\nendstream\nendobj'
+        self.assertEqual(extract_text(pdf, 'pdf').split(), ['Head'])
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('word/document.xml', (
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                + ' ' * 100_000 + '<w:body><w:p><w:r><w:t>Padded</w:t></w:r></w:p></w:body></w:document>'
+            ))
+        self.assertEqual(extract_text(buffer.getvalue(), 'docx'), '')
+
+    def test_normalizes_aliases_and_phrases(self):
+        self.assertEqual(parse_skill_list('Postgres, k8s , React.js,react'), ['postgresql', 'kubernetes', 'react'])
+        self.assertEqual(normalize_skill(' C++ '), 'c++')
+        vocabulary = {'python': 1, 'machine learning': 2, 'node.js': 3}
+        self.assertEqual(
+            find_skills('Did Machine\nLearning in Python. Also NodeJS.', vocabulary),
+            {'python', 'machine learning', 'node.js'},
+        )
+
+    def test_job_skills_feed_vocabulary(self):
+        self.assertEqual(
+            set(Skill.objects.values_list('name', flat=True)),
+            {'python', 'django', 'postgresql', 'machine learning'},
+        )
+
+    def test_filter_applications_by_skills(self):
+        both = self.apply('both@example.com', b'Python and Django, some postgres')
+        one = self.apply('one@example.com', b'Mostly Python')
+        self.apply('none@example.com', b'Cobol')
+        run_pending('w1', batch_size=20)
+        self.assertEqual(ApplicationSkill.objects.filter(application_id=both).count(), 3)
+
+        response = self.client.get(f'/api/applications/?job={self.job.pk}&skills=python,django')
+        self.assertEqual(response.status_code, 200)
+        rows = [(row['id'], row['matched_skills'], row['skill_score']) for row in response.data['results']]
+        self.assertEqual(rows, [(both, 2, 1.0), (one, 1, 0.5)])
+
+        response = self.client.get('/api/applications/?skills=py,django&min_score=0.6')
+        self.assertEqual([row['id'] for row in response.data['results']], [both])
+        self.assertEqual(self.client.get('/api/applications/?min_score=x&skills=go').status_code, 400)
+        self.assertEqual(self.client.get('/api/applications/?job=x').status_code, 400)
+
+    def test_identical_cvs_are_parsed_once(self):
+        first = self.apply('a@example.com', b'Python')
+        second = self.apply('b@example.com', b'Python')
+        with mock.patch('jobs_api.skills.extract_text', wraps=extract_text) as extract:
+            run_pending('w1', batch_size=20)
+        self.assertEqual(extract.call_count, 1)
+        self.assertEqual(
+            set(ApplicationSkill.objects.values_list('application_id', flat=True)), {first, second},
+        )
+
+    def test_reindex_command(self):
+        application = self.apply('a@example.com', b'Kubernetes expert')
+        run_pending('w1', batch_size=20)
+        self.assertFalse(ApplicationSkill.objects.filter(application_id=application).exists())
+        make_job(self.job.company, title='Ops', skills_required='k8s')
+        call_command('reindex_cv_skills', stdout=StringIO())
+        self.assertEqual(
+            list(ApplicationSkill.objects.filter(application_id=application).values_list('skill__name', flat=True)),
+            ['kubernetes'],
+        )
+
+
+class ApplicationStatsTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.company = make_company()
+        self.backend = make_job(self.company, title='Backend')
+        self.frontend = make_job(self.company, title='Frontend')
+        other = make_job(make_company(name='Other'))
+        for i, status in enumerate(['submitted', 'reviewing', 'accepted']):
+            make_application(self.backend, f'b{i}@example.com', status=status)
+        make_application(self.frontend, 'f@example.com', status='rejected')
+        make_application(other, 'o@example.com')
+
+    def rollup(self):
+        return sorted(ApplicationDailyStat.objects.filter(count__gt=0).values_list('job_id', 'status', 'count'))
+
+    def test_rollup_follows_application_changes(self):
+        application = Application.objects.get(candidate_email='b0@example.com')
+        application.status = 'interview'
+        application.save()
+        Application.objects.get(candidate_email='f@example.com').delete()
+        expected = self.rollup()
+        rebuild_daily_stats()
+        self.assertEqual(self.rollup(), expected)
+        self.assertIn((self.backend.pk, 'interview', 1), expected)
+        self.assertNotIn(self.frontend.pk, [job_id for job_id, _, _ in expected])
+
+    def test_rollup_and_direct_aggregates_agree(self):
+        day = timezone.now() - timedelta(days=3)
+        Application.objects.filter(candidate_email='b0@example.com').update(submitted_at=day)
+        call_command('rebuild_daily_stats', stdout=StringIO())
+        for use_rollups in (True, False):
+            stats = ApplicationStats(company=self.company.pk, use_rollups=use_rollups)
+            self.assertEqual(stats.breakdown(), {'total': 4, 'by_status': {
+                'submitted': 1, 'reviewing': 1, 'interview': 0, 'rejected': 1, 'accepted': 1,
+            }})
+            self.assertEqual(
+                [row['count'] for row in stats.timeline()], [1, 3],
+            )
+            self.assertEqual(
+                [(row['title'], row['total'], row['accepted']) for row in stats.funnels()],
+                [('Backend', 3, 1), ('Frontend', 1, 0)],
+            )
+            recent = ApplicationStats(since=timezone.localdate(), use_rollups=use_rollups)
+            self.assertEqual(recent.breakdown()['total'], 4)
+
+    def test_application_stats_endpoint(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/applications/stats/?bucket=month')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total'], 5)
+        self.assertEqual(response.data['by_status']['submitted'], 2)
+        self.assertEqual(response.data['timeline'][0]['count'], 5)
+        self.assertEqual(response.data['timeline'][0]['period'], timezone.localdate().replace(day=1))
+        self.assertEqual(self.client.get(f'/api/applications/stats/?job={self.backend.pk}').data['total'], 3)
+        self.assertEqual(self.client.get('/api/applications/stats/?since=yesterday').status_code, 400)
+        self.assertEqual(self.client.get('/api/applications/stats/?bucket=hour').status_code, 400)
+
+    def test_company_stats_endpoint(self):
+        with self.assertNumQueries(4):
+            response = self.client.get(f'/api/companies/{self.company.pk}/stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_jobs'], 2)
+        self.assertEqual(response.data['total_applications'], 4)
+        self.assertEqual(response.data['pending_applications'], 2)
+        self.assertEqual([row['job_id'] for row in response.data['jobs']], [self.backend.pk, self.frontend.pk])
+
+
+class SimilarJobsTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        company = make_company()
+        self.django = make_job(
+            company, title='Python Django Developer', skills_required='Python, Django',
+            description='Build REST APIs with Django and PostgreSQL.',
+        )
+        self.backend = make_job(
+            company, title='Backend Python Engineer', skills_required='Python, PostgreSQL',
+            description='Python services and APIs.',
+        )
+        self.frontend = make_job(
+            company, title='Frontend React Developer', skills_required='React, TypeScript',
+            description='Build UIs with React.',
+        )
+        self.index = SimilarJobsIndex()
+        self.enterContext(mock.patch('jobs_api.views.similar_jobs_index', self.index))
+
+    def ids(self, job):
+        return [job_id for job_id, _ in self.index.similar(job.pk)]
+
+    def test_ranks_by_content_and_excludes_self(self):
+        self.assertEqual(self.ids(self.django), [self.backend.pk, self.frontend.pk])
+        scores = dict(self.index.similar(self.frontend.pk))
+        self.assertGreater(scores[self.django.pk], scores.get(self.backend.pk, 0))
+
+    def test_picks_up_changes_without_reload(self):
+        self.index.similar(self.django.pk)
+        state = self.index._state
+        twin = make_job(
+            self.django.company, title='Python Django Developer', skills_required='Python, Django',
+            description='Build REST APIs with Django and PostgreSQL.',
+        )
+        self.backend.status = 'closed'
+        self.backend.save()
+        self.assertEqual(self.ids(self.django), [twin.pk, self.frontend.pk])
+        # Same arrays: pending changes are scored on the side.
+        self.assertIs(self.index._state['job_ids'], state['job_ids'])
+        self.assertEqual(state['pending'], {})
+
+        self.index.max_pending = 0
+        self.assertEqual(self.ids(self.django), [twin.pk, self.frontend.pk])
+        self.assertIsNot(self.index._state['job_ids'], state['job_ids'])
+        self.assertEqual(self.index._state['pending'], {})
+
+    def test_vectorizes_jobs_created_without_signals(self):
+        Job.objects.bulk_create([Job(
+            company=self.django.company, title='Django Developer', location='Remote',
+            description='Django.', skills_required='Django',
+        )])
+        self.assertEqual(JobVector.objects.count(), 3)
+        self.assertEqual(len(self.index.similar(self.django.pk)), 3)
+        self.assertEqual(JobVector.objects.count(), 4)
+
+    def test_similar_endpoint(self):
+        response = self.client.get(f'/api/jobs/{self.django.pk}/similar/?limit=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([job['id'] for job in response.data], [self.backend.pk])
+        self.assertEqual(response.data[0]['company']['name'], 'Acme')
+        self.assertGreater(response.data[0]['similarity'], 0)
+        self.assertEqual(self.client.get('/api/jobs/999999/similar/').status_code, 404)
+        self.assertEqual(self.client.get(f'/api/jobs/{self.django.pk}/similar/?limit=x').status_code, 400)
+
+
+class BulkImportExportTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.company = make_company()
+        self.existing = make_job(self.company, title='Old title')
+
+    def post(self, body, content_type):
+        return self.client.generic(
+            'POST', '/api/jobs/bulk/?batch_size=2', body.encode(), content_type=content_type,
+        )
+
+    def test_csv_import_creates_updates_and_reports_errors(self):
+        body = (
+            'id,company,title,location,description,skills_required,salary_min\n'
+            f',{self.company.pk},Rust Developer,Remote,"Systems work,\nmulti-line",Rust,\n'
+            f',{self.company.pk},Go Developer,Remote,Services,Golang,90000\n'
+            f'{self.existing.pk},{self.company.pk},New title,Remote,Updated,,\n'
+            f',999,Ghost,Remote,x,,\n'
+            f'123456,{self.company.pk},Missing,Remote,x,,\n'
+            f',{self.company.pk},,Remote,x,,abc\n'
+        )
+        self.client.get('/api/jobs/')  # Warm the response cache.
+        # Fixed per chunk of two rows, plus one lookup per distinct company.
+        with self.assertNumQueries(21):
+            response = self.post(body, 'text/csv; charset=utf-8')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual(response.data['error_count'], 3)
+        self.assertEqual([error['line'] for error in response.data['errors']], [6, 7, 8])
+        self.assertEqual(set(response.data['errors'][2]['errors']), {'title', 'salary_min'})
+
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.title, 'New title')
+        rust = Job.objects.get(title='Rust Developer')
+        self.assertEqual(rust.description, 'Systems work,\nmulti-line')
+        self.assertIsNone(rust.salary_min)
+        self.assertTrue(Skill.objects.filter(name='go').exists())
+        self.assertTrue(JobVector.objects.filter(job=rust).exists())
+        titles = [job['title'] for job in self.client.get('/api/jobs/?search=rust').data['results']]
+        self.assertEqual(titles, ['Rust Developer'])
+        self.assertEqual(self.client.get('/api/jobs/').data['count'], 3)
+
+    def test_failed_batch_is_reported_and_others_are_kept(self):
+        body = 'company,title,location,description\n' + ''.join(
+            f'{self.company.pk},Job {i},Remote,x\n' for i in range(5)
+        )
+        original = Job.objects.bulk_create
+        calls = []
+
+        def bulk_create(objs, *args, **kwargs):
+            calls.append(len(objs))
+            if len(calls) == 2:
+                raise DatabaseError('disk I/O error')
+            return original(objs, *args, **kwargs)
+
+        with mock.patch.object(Job.objects, 'bulk_create', bulk_create):
+            response = self.post(body, 'text/csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['created'], response.data['error_count']), (3, 2))
+        self.assertEqual([error['line'] for error in response.data['errors']], [4, 5])
+        self.assertIn('disk I/O error', response.data['errors'][0]['errors']['non_field_errors'][0])
+        self.assertEqual(
+            sorted(Job.objects.filter(title__startswith='Job ').values_list('title', flat=True)),
+            ['Job 0', 'Job 1', 'Job 4'],
+        )
+
+    def test_undecodable_or_malformed_body_is_reported(self):
+        header = 'company,title,location,description\n'
+        rows = [f'{self.company.pk},Job {i},Remote,x\n' for i in range(3)]
+        for body, line in (
+            ((header + ''.join(rows) + f'{self.company.pk},Café,Remote,x\n').encode('latin-1'), 5),
+            ((header + ''.join(rows) + f'{self.company.pk},{"x" * (csv.field_size_limit() + 1)},Remote,x\n').encode(), 5),
+        ):
+            Job.objects.filter(title__startswith='Job ').delete()
+            response = self.client.generic('POST', '/api/jobs/bulk/?batch_size=2', body, content_type='text/csv')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual((response.data['created'], response.data['error_count']), (3, 1))
+            self.assertEqual(response.data['errors'][0]['line'], line)
+            self.assertIn('stopped reading', response.data['errors'][0]['errors']['non_field_errors'][0])
+
+        body = f'{{"company": {self.company.pk}, "title": "A", "location": "x", "description": "x"}}\n\xff\n'
+        response = self.client.generic(
+            'POST', '/api/jobs/bulk/', body.encode('latin-1'), content_type='application/x-ndjson',
+        )
+        self.assertEqual((response.data['created'], response.data['errors'][0]['line']), (1, 2))
+
+    def test_import_command_reads_json_lines(self):
+        path = os.path.join(self.enterContext(tempfile.TemporaryDirectory()), 'jobs.jsonl')
+        with open(path, 'w') as handle:
+            handle.write(f'{{"company": {self.company.pk}, "title": "A", "location": "x", "description": "x"}}\n')
+            handle.write('\n{not json\n[1]\n')
+        out, err = StringIO(), StringIO()
+        call_command('import_jobs', path, stdout=out, stderr=err)
+        self.assertIn('Created 1, updated 0 jobs; 2 rows rejected.', out.getvalue())
+        self.assertIn('line 3: ', err.getvalue())
+        self.assertIn('line 4: ', err.getvalue())
+        self.assertTrue(Job.objects.filter(title='A').exists())
+
+    def test_rejects_unknown_content_type(self):
+        self.assertEqual(self.post('{}', 'application/json').status_code, 415)
+
+    def test_export_round_trips_through_import(self):
+        make_job(self.company, title='Second', salary_min=5)
+        response = self.client.get('/api/jobs/export/?file_format=csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        body = b''.join(response.streaming_content).decode()
+        self.assertTrue(body.startswith('id,company,category,title,'))
+        response = self.post(body, 'text/csv')
+        self.assertEqual((response.data['created'], response.data['updated']), (0, 2))
+        self.assertEqual(response.data['error_count'], 0)
+
+        response = self.client.get('/api/jobs/export/?file_format=jsonl&search=second')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([(row['title'], row['salary_min']) for row in rows], [('Second', 5)])
+        self.assertEqual(self.client.get('/api/jobs/export/?file_format=xml').status_code, 400)
+
+    def test_application_export_applies_filters(self):
+        other = make_job(self.company, title='Other')
+        make_application(self.existing, 'a@example.com')
+        make_application(other, 'b@example.com', status='accepted')
+        self.assertIn(self.client.get('/api/applications/export/').status_code, (401, 403))
+        self.client.force_authenticate(User.objects.create_user('candidate'))
+        self.assertEqual(self.client.get('/api/applications/export/').status_code, 403)
+        globex = make_company('Globex', user=User.objects.create_user('globex'))
+        self.client.force_authenticate(globex.user)
+        response = self.client.get('/api/applications/export/')
+        self.assertEqual(len(b''.join(response.streaming_content).decode().splitlines()), 1)
+
+        self.client.force_authenticate(User.objects.create_user('ops', is_staff=True))
+        response = self.client.get(f'/api/applications/export/?job={other.pk}')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('b@example.com,9800000000,accepted', lines[1])
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="applications.csv"')
+
+
+class DatabaseConfigTests(SimpleTestCase):
+    base_dir = Path('/srv/app')
+
+    def test_sqlite_defaults_to_tuned_project_database(self):
+        config = database_from_env({}, self.base_dir)
+        self.assertEqual(config['NAME'], self.base_dir / 'db.sqlite3')
+        self.assertEqual(config['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+        self.assertIn('PRAGMA journal_mode=WAL;', config['OPTIONS']['init_command'])
+        self.assertEqual(config['OPTIONS']['timeout'], 20)
+
+    def test_sqlite_paths_and_untuned_profile(self):
+        env = {'DATABASE_URL': 'sqlite:////var/db/jobs.sqlite3', 'DB_SQLITE_TUNED': 'false'}
+        self.assertEqual(database_from_env(env, self.base_dir), {
+            'ENGINE': 'django.db.backends.sqlite3', 'NAME': '/var/db/jobs.sqlite3',
+        })
+        env = {'DATABASE_URL': 'sqlite:///data/jobs.sqlite3'}
+        self.assertEqual(database_from_env(env, self.base_dir)['NAME'], self.base_dir / 'data/jobs.sqlite3')
+
+    def test_postgres_persistent_connections_or_pool(self):
+        env = {'DATABASE_URL': 'postgres://app:p%40ss@db:5433/jobs?sslmode=require'}
+        config = database_from_env(env, self.base_dir)
+        self.assertEqual(
+            (config['NAME'], config['USER'], config['PASSWORD'], config['HOST'], config['PORT']),
+            ('jobs', 'app', 'p@ss', 'db', '5433'),
+        )
+        self.assertEqual(config['CONN_MAX_AGE'], 60)
+        self.assertEqual(config['OPTIONS'], {'sslmode': 'require'})
+
+        config = database_from_env({**env, 'DB_POOL': 'true', 'DB_POOL_MAX_SIZE': '8'}, self.base_dir)
+        self.assertEqual(config['CONN_MAX_AGE'], 0)
+        self.assertEqual(config['OPTIONS']['pool']['max_size'], 8)
+
+    def test_rejects_unknown_scheme(self):
+        with self.assertRaises(ValueError):
+            database_from_env({'DATABASE_URL': 'mysql://db/jobs'}, self.base_dir)
+
+
+@override_settings(API_CACHE_TIMEOUT=0)
+class AsyncReadViewTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = JobCategory.objects.create(name='Engineering')
+        company = make_company()
+        self.jobs = [
+            make_job(company, title=f'Python Engineer {i}', category=self.category, status=status)
+            for i, status in enumerate(['open', 'closed', 'open'])
+        ]
+        make_job(company, title='Designer')
+
+    def test_job_list_matches_drf_endpoint(self):
+        for query in ('', f'?category={self.category.pk}&status=open', '?search=python&page_size=1&page=2'):
+            expected = self.client.get(f'/api/jobs/{query}').content.decode()
+            expected = json.loads(expected.replace('/api/jobs/', '/api/async/jobs/'))
+            expected.pop('facets')
+            self.assertEqual(self.client.get(f'/api/async/jobs/{query}').json(), expected, query)
+
+    async def test_detail_categories_and_recent_jobs(self):
+        job = self.jobs[0]
+        counter = ViewCounter(cache=cache, threshold=1000, interval=3600, buffered=True)
+        with mock.patch('jobs_api.async_views.view_counter', counter):
+            response = await self.async_client.get(f'/api/async/jobs/{job.pk}/')
+        self.assertEqual(response.json()['title'], job.title)
+        self.assertEqual(counter.pending()[job.pk], 1)
+
+        counter.threshold = 2
+        with mock.patch('jobs_api.async_views.view_counter', counter):
+            await self.async_client.get(f'/api/async/jobs/{job.pk}/')
+        self.assertTrue(await BackgroundTask.objects.filter(name='flush_view_counts').aexists())
+
+        response = await self.async_client.get('/api/async/categories/')
+        self.assertEqual(response.json()['results'][0]['jobs_count'], 3)
+
+        response = await self.async_client.get('/api/async/recent-jobs/?limit=2')
+        self.assertEqual([row['title'] for row in response.json()], ['Designer', 'Python Engineer 2'])
+
+    def test_errors_are_json(self):
+        self.assertEqual(self.client.get('/api/async/jobs/999999/').status_code, 404)
+        self.assertEqual(self.client.get('/api/async/jobs/?page=9').status_code, 404)
+        response = self.client.get('/api/async/jobs/?salary_min=abc')
+        self.assertEqual((response.status_code, list(response.json())), (400, ['salary_min']))
+        self.assertEqual(self.client.post('/api/async/jobs/').status_code, 405)
+
+
+class RecentJobsTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.company = make_company()
+        self.jobs = [make_job(self.company, title=f'Job {i}') for i in range(4)]
+        make_job(self.company, title='Closed', status='closed')
+
+    def titles(self, response):
+        return [job['title'] for job in response.json()]
+
+    def committed(self, write, *args, **kwargs):
+        # TestCase never commits, so run the buffer's on_commit callbacks here.
+        with self.captureOnCommitCallbacks(execute=True):
+            return write(*args, **kwargs)
+
+    def test_feed_is_served_from_the_buffer(self):
+        self.assertEqual(self.titles(self.client.get('/api/recent-jobs/?limit=3')), ['Job 3', 'Job 2', 'Job 1'])
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/recent-jobs/')
+        expected = [
+            {**job, 'company': {**job['company'], 'logo': None}}
+            for job in self.client.get('/api/jobs/?status=open').json()['results']
+        ]
+        self.assertEqual(response.json(), expected)
+        self.assertEqual(self.client.get('/api/recent-jobs/?limit=x').status_code, 400)
+
+    def test_local_writes_apply_in_place(self):
+        recent_jobs.jobs()
+        with self.captureOnCommitCallbacks(execute=True):
+            new = make_job(self.company, title='Newest')
+            self.jobs[1].status = 'closed'
+            self.jobs[1].save()
+            self.jobs[2].delete()
+        with self.assertNumQueries(0):
+            titles = self.titles(self.client.get('/api/recent-jobs/'))
+        self.assertEqual(titles, ['Newest', 'Job 3', 'Job 0'])
+        self.assertEqual(self.client.get('/api/recent-jobs/').json()[0]['id'], new.pk)
+
+    def test_writes_elsewhere_trigger_one_reload(self):
+        # A second buffer stands in for another worker sharing the cache.
+        other = RecentJobsBuffer(size=2)
+        self.assertEqual([job['title'] for job in other.jobs()], ['Job 3', 'Job 2'])
+        self.committed(make_job, self.company, title='Newest')
+        with self.assertNumQueries(1):
+            self.assertEqual([job['title'] for job in other.jobs()], ['Newest', 'Job 3'])
+        with self.assertNumQueries(0):
+            other.jobs()
+
+    def test_removing_from_a_full_buffer_refills_it(self):
+        buffer = RecentJobsBuffer(size=2)
+        buffer.jobs()
+        # Apply to this buffer as the signal applies to the shared one.
+        self.jobs[3].delete()
+        buffer._generation = buffer.generation() - 1
+        self.committed(buffer.job_deleted, self.jobs[3].pk)
+        self.assertEqual([job['title'] for job in buffer.jobs()], ['Job 2', 'Job 1'])
+
+    def test_company_changes_reload_the_buffer(self):
+        recent_jobs.jobs()
+        self.company.name = 'Renamed'
+        self.committed(self.company.save)
+        self.assertEqual(self.client.get('/api/recent-jobs/').json()[0]['company']['name'], 'Renamed')
+
+    def test_uncommitted_writes_stay_out_of_the_buffer(self):
+        recent_jobs.jobs()
+        with self.captureOnCommitCallbacks() as callbacks:
+            make_job(self.company, title='Newest')
+            self.jobs[3].delete()
+            self.assertEqual(recent_jobs.jobs()[0]['title'], 'Job 3')
+        for callback in callbacks:
+            callback()
+        self.assertEqual([job['title'] for job in recent_jobs.jobs()[:2]], ['Newest', 'Job 2'])
+
+    @override_settings(RECENT_JOBS_STREAM_POLL=0, RECENT_JOBS_STREAM_TIMEOUT=0)
+    async def test_stream_endpoint(self):
+        response = await self.async_client.get('/api/recent-jobs/stream/')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(b''.join([chunk async for chunk in response.streaming_content]), b'retry: 0\n\n')
+
+    def test_stream_is_asgi_only(self):
+        self.assertEqual(self.client.get('/api/recent-jobs/stream/').status_code, 501)
+
+    @override_settings(RECENT_JOBS_STREAM_POLL=0, RECENT_JOBS_STREAM_HEARTBEAT=0)
+    async def test_stream_sends_new_jobs_and_resumes(self):
+        request = APIRequestFactory().get('/api/recent-jobs/stream/')
+        frames = RecentJobsStream(request).__aiter__()
+        await anext(frames)
+        self.assertEqual(await anext(frames), ': keepalive\n\n')
+        new = await sync_to_async(self.committed)(make_job, self.company, title='Newest')
+        frame = await anext(frames)
+        self.assertTrue(frame.startswith(f'id: {new.pk}\nevent: job\ndata: '))
+        self.assertEqual(json.loads(frame.split('data: ', 1)[1])['title'], 'Newest')
+
+        request = APIRequestFactory().get('/api/recent-jobs/stream/', HTTP_LAST_EVENT_ID=str(self.jobs[2].pk))
+        frames = RecentJobsStream(request).__aiter__()
+        await anext(frames)
+        ids = [int(line[4:]) for line in (await anext(frames)).splitlines() if line.startswith('id: ')]
+        self.assertEqual(ids, [self.jobs[3].pk, new.pk])
+
+
+def throttle_rates(**rates):
+    return override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {**settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'], **rates},
+    })
+
+
+class ThrottlingTests(APITestCase):
+    def check_bucket(self, store):
+        # Two-token burst refilling at one token per second.
+        self.assertEqual([store.consume('k', 2, 1.0, now=100) for _ in range(3)], [0, 0, 1.0])
+        self.assertEqual(store.consume('k', 2, 1.0, now=100.5), 0.5)
+        self.assertEqual(store.consume('k', 2, 1.0, now=101), 0)
+        self.assertEqual(store.consume('other', 2, 1.0, now=101), 0)
+        # Idle time refills the bucket but never past its capacity.
+        self.assertEqual([store.consume('k', 2, 1.0, now=500) for _ in range(3)], [0, 0, 1.0])
+
+    def test_local_store(self):
+        store = LocalBucketStore(max_keys=2)
+        self.check_bucket(store)
+        store.consume('a', 1, 1.0, now=500)
+        store.consume('b', 1, 1.0, now=500)
+        self.assertEqual(store.consume('k', 2, 1.0, now=500), 0)  # Evicted, so full again.
+
+    def test_cache_store(self):
+        self.check_bucket(CacheBucketStore())
+
+    def test_token_keys_are_hashed(self):
+        user = User.objects.create_user('client')
+        request = APIRequestFactory().get('/')
+        request.user, request.auth = user, mock.Mock(key='secret-token')
+        key = TokenThrottle().get_key(request, None)
+        self.assertEqual(key, 'key-' + hashlib.sha256(b'secret-token').hexdigest())
+        request.auth = None
+        self.assertEqual(TokenThrottle().get_key(request, None), f'user-{user.pk}')
+
+    def submit(self, email):
+        return self.client.post('/api/applications/', {
+            'job': self.job.pk, 'candidate_name': 'Candidate', 'candidate_email': email,
+            'phone_number': '9800000000', 'cv': SimpleUploadedFile('cv.txt', b'Python developer'),
+        }, format='multipart')
+
+    @throttle_rates(applications='2/hour')
+    def test_application_submissions_are_throttled_per_client(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        self.job = make_job(make_company())
+        self.assertEqual([self.submit(f'{i}@example.com').status_code for i in range(3)], [201, 201, 429])
+        response = self.submit('x@example.com')
+        self.assertEqual(response['Retry-After'], '1800')
+        self.assertEqual(Application.objects.count(), 2)
+        self.client.defaults['REMOTE_ADDR'] = '10.0.0.2'
+        self.assertEqual(self.submit('y@example.com').status_code, 201)
+
+    @throttle_rates(search='1/min')
+    def test_search_is_throttled_on_both_paths(self):
+        self.assertEqual(self.client.get('/api/jobs/?search=python').status_code, 200)
+        self.assertEqual(self.client.get('/api/jobs/?search=django').status_code, 429)
+        self.assertEqual(self.client.get('/api/jobs/').status_code, 200)
+        response = self.client.get('/api/async/jobs/?search=python')
+        self.assertEqual((response.status_code, response['Retry-After']), (429, '60'))
+
+    @throttle_rates(ip='2/min')
+    def test_async_reads_share_the_ip_bucket(self):
+        self.assertEqual(self.client.get('/api/categories/').status_code, 200)
+        self.assertEqual(self.client.get('/api/async/categories/').status_code, 200)
+        self.assertEqual(self.client.get('/api/async/recent-jobs/').status_code, 429)
+
+    def forwarded_for(self, value):
+        return self.client.get('/api/categories/', HTTP_X_FORWARDED_FOR=value).status_code
+
+    @throttle_rates(ip='2/min')
+    def test_client_address_ignores_forwarded_for_without_proxies(self):
+        # A fresh X-Forwarded-For per request doesn't buy a fresh bucket.
+        self.assertEqual([self.forwarded_for(f'203.0.113.{i}') for i in range(3)], [200, 200, 429])
+
+    def test_client_address_behind_a_proxy(self):
+        with override_settings(REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK, 'NUM_PROXIES': 1,
+            'DEFAULT_THROTTLE_RATES': {**settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'], 'ip': '1/min'},
+        }):
+            # Only the entry the proxy appended counts, not what the client sent before it.
+            self.assertEqual(self.forwarded_for('1.1.1.1, 198.51.100.7'), 200)
+            self.assertEqual(self.forwarded_for('2.2.2.2, 198.51.100.7'), 429)
+            self.assertEqual(self.forwarded_for('198.51.100.8'), 200)
+
+    @throttle_rates(token='1/min')
+    def test_token_scope_follows_the_credentials(self):
+        self.client.force_authenticate(User.objects.create(username='recruiter'))
+        self.assertEqual(self.client.get('/api/categories/').status_code, 200)
+        self.client.defaults['REMOTE_ADDR'] = '10.0.0.2'
+        self.assertEqual(self.client.get('/api/categories/').status_code, 429)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get('/api/categories/').status_code, 200)
+
+    @throttle_rates(ip='1/min')
+    @override_settings(THROTTLE_STORE='jobs_api.throttling.CacheBucketStore')
+    def test_shared_cache_store(self):
+        self.assertEqual(self.client.get('/api/categories/').status_code, 200)
+        self.assertEqual(self.client.get('/api/categories/').status_code, 429)
+        cache.clear()
+        self.assertEqual(self.client.get('/api/categories/').status_code, 200)
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_SERVER_TIMING=True, API_CACHE_TIMEOUT=0)
+class MetricsTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        metrics_registry.reset()
+        make_job(make_company())
+
+    def test_records_route_latency_queries_and_size(self):
+        response = self.client.get('/api/jobs/')
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ queries", app;dur=[\d.]+, '
+                                                    r'render;dur=[\d.]+, total;dur=[\d.]+$')
+        self.client.get('/api/jobs/999999/')
+        body = self.client.get('/metrics').content.decode()
+        self.assertIn('http_request_duration_seconds_count{route="job-list",method="GET",status="200"} 1', body)
+        self.assertIn('http_request_duration_seconds_count{route="job-detail",method="GET",status="404"} 1', body)
+        self.assertIn(f'http_response_size_bytes_sum{{route="job-list",method="GET"}} {len(response.content)}', body)
+        queries = int(response['Server-Timing'].split('desc="')[1].split(' ')[0])
+        self.assertGreater(queries, 0)
+        self.assertIn(f'http_request_db_queries_total{{route="job-list",method="GET"}} {queries}', body)
+        self.assertIn('le="+Inf"', body)
+
+    async def test_async_views_count_queries_from_the_orm_thread(self):
+        # The ORM thread's test connection predates the middleware.
+        await sync_to_async(install_query_tracking)()
+        response = await self.async_client.get('/api/async/jobs/')
+        self.assertRegex(response['Server-Timing'], r'desc="[1-9]\d* queries"')
+
+    @override_settings(METRICS_SLOW_QUERY_MS=0)
+    def test_slow_query_samples(self):
+        with self.assertLogs('jobs_api.metrics', 'WARNING'):
+            self.client.get('/api/categories/')
+        samples = self.client.get('/metrics/slow-queries').json()['results']
+        self.assertTrue(samples)
+        self.assertEqual(samples[0]['route'], 'jobcategory-list')
+        self.assertIn('SELECT', samples[0]['sql'])
+
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_token_protects_endpoint(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer s3cret').status_code, 200)
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_disabled(self):
+        self.assertNotIn('Server-Timing', self.client.get('/api/jobs/'))
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
+        self.assertFalse(metrics_registry.durations)
+
+
+class SeedDataTests(APITestCase):
+    def seed(self, **options):
+        sizes = dict(companies=3, jobs=20, applications=60, saved_jobs=15, interviews=5, seed=7)
+        call_command('seed_data', **{**sizes, **options}, stdout=StringIO())
+
+    def test_creates_rows_and_derived_data(self):
+        self.seed()
+        self.assertEqual(Company.objects.count(), 3)
+        self.assertEqual(Job.objects.count(), 20)
+        self.assertEqual(Application.objects.count(), 60)
+        self.assertEqual(SavedJob.objects.count(), 15)
+        self.assertEqual(Interview.objects.count(), 5)
+        self.assertEqual(recompute_application_counters(), 0)
+        self.assertEqual(JobVector.objects.count(), 20)
+        self.assertTrue(ApplicationDailyStat.objects.exists())
+        # Timestamps are spread out rather than all "now".
+        oldest = Job.objects.order_by('created_at').first().created_at
+        self.assertLess(oldest, timezone.now() - timedelta(days=1))
+        self.assertEqual(self.client.get('/api/jobs/').json()['count'], 20)
+
+    def test_more_applications_than_jobs(self):
+        self.seed(jobs=2, applications=3, saved_jobs=7, interviews=0)
+        self.assertEqual(Application.objects.count(), 3)
+        self.assertEqual(SavedJob.objects.count(), 7)
+        self.assertEqual(len(set(Application.objects.values_list('candidate_email', flat=True))), 2)
+
+    def test_same_seed_same_data(self):
+        def snapshot():
+            return list(Job.objects.order_by('pk').values_list('title', 'salary_min', 'location'))
+        self.seed()
+        first = snapshot()
+        Company.objects.all().delete()
+        JobCategory.objects.all().delete()
+        self.seed()
+        self.assertEqual(snapshot(), first)
+        self.seed(seed=8)
+        self.assertNotEqual(snapshot()[20:], first)
+
+
+class ValuesListTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        design = JobCategory.objects.create(name='Design', icon='🎨')
+        acme = make_company(
+            logo='company_logos/acme.png', logo_thumbnail='company_logos/thumbnails/acme.webp', verified=True,
+        )
+        other = make_company('Globex')
+        self.jobs = [
+            make_job(acme, 'Senior Python Engineer', category=design, salary_min=90000, skills_required='Python'),
+            make_job(other, 'Designer \u2028 "quoted" ünïcode', benefits='Lunch'),
+            make_job(acme, 'Python Data Analyst', status='closed'),
+        ]
+        python, _ = Skill.objects.get_or_create(name='python')
+        for i, job in enumerate(self.jobs):
+            application = Application.objects.create(
+                job=job, candidate_name=f'C{i}', candidate_email=f'c{i}@example.com', phone_number='1',
+                cv=f'cvs/{i}.pdf' if i else '', rating=i or None,
+            )
+            ApplicationSkill.objects.create(application=application, skill=python)
+
+    def assertSameAsSerializer(self, viewset, url):
+        fast = self.client.get(url)
+        slow = {'values_list': False, 'renderer_classes': api_settings.DEFAULT_RENDERER_CLASSES}
+        with mock.patch.multiple(viewset, **slow):
+            expected = self.client.get(url)
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(fast.content, expected.content)
+        return fast.json()
+
+    def test_job_lists_match_serializer(self):
+        data = self.assertSameAsSerializer(JobViewSet, '/api/jobs/')
+        by_title = {job['title']: job for job in data['results']}
+        self.assertEqual(by_title['Senior Python Engineer']['company']['logo'],
+                         'http://testserver/media/company_logos/thumbnails/acme.webp')
+        self.assertIsNone(by_title['Python Data Analyst']['category'])
+        data = self.assertSameAsSerializer(JobViewSet, '/api/jobs/?search=python')
+        self.assertIn('<mark>', data['results'][0]['search_snippet'])
+        data = self.assertSameAsSerializer(JobViewSet, '/api/jobs/?pagination=cursor&page_size=1')
+        self.assertSameAsSerializer(JobViewSet, data['next'])
+        self.assertSameAsSerializer(JobViewSet, '/api/jobs/?ordering=salary_min&count=false')
+
+    def test_application_lists_match_serializer(self):
+        data = self.assertSameAsSerializer(ApplicationViewSet, '/api/applications/')
+        # The permission-checked download, not the unserved MEDIA_URL path.
+        self.assertEqual(
+            sorted((app['cv'] or '') for app in data['results']),
+            ['', *sorted(f'http://testserver/api/applications/{app["id"]}/cv/'
+                         for app in data['results'] if app['candidate_name'] != 'C0')],
+        )
+        data = self.assertSameAsSerializer(ApplicationViewSet, '/api/applications/?skills=python,go')
+        self.assertEqual({app['skill_score'] for app in data['results']}, {0.5})
+        self.assertSameAsSerializer(ApplicationViewSet, f'/api/applications/?job={self.jobs[0].pk}')
+
+    def test_rejects_fields_without_a_column(self):
+        class WithMany(CategorySummarySerializer):
+            jobs = JobReadSerializer(many=True, read_only=True)
+
+            class Meta(CategorySummarySerializer.Meta):
+                fields = ['id', 'jobs']
+
+        with self.assertRaises(ImproperlyConfigured):
+            ValuesSerializer(WithMany)
+
+    def test_orjson_renderer_matches_json_renderer(self):
+        data = {
+            'decimal': Decimal('1.50'), 'when': timezone.now(), 'day': timezone.now().date(),
+            'keys': {1: 'a', None: 'b'}, 'separators': '\u2028\u2029', 'lazy': gettext_lazy('Jobs'),
+            'nested': [(1, 2.5), {'set': frozenset()}],
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        # Beyond orjson's integer range: falls back to JSONRenderer.
+        self.assertEqual(ORJSONRenderer().render({'big': 2 ** 70}), b'{"big":1180591620717411303424}')
+        self.assertEqual(ORJSONRenderer().render(data, 'application/json; indent=2'),
+                         JSONRenderer().render(data, 'application/json; indent=2'))
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+
+class InterviewSchedulingTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        company = make_company()
+        self.first_job, self.second_job = make_job(company), make_job(company, 'Designer')
+        self.alice = self.apply(self.first_job, 'alice@example.com')
+        self.bob = self.apply(self.first_job, 'bob@example.com')
+
+    @staticmethod
+    def apply(job, email):
+        return Application.objects.create(job=job, candidate_name=email, candidate_email=email, phone_number='1')
+
+    def book(self, application, interviewer, at, minutes=60, **extra):
+        return self.client.post('/api/interviews/', {
+            'application': application.pk, 'interviewer_name': interviewer, 'interview_type': 'video',
+            'scheduled_at': at, 'duration_minutes': minutes, **extra,
+        }, format='json')
+
+    def test_books_and_rejects_overlaps(self):
+        response = self.book(self.alice, 'Ravi', '2030-01-07T10:00:00Z')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['ends_at'], '2030-01-07T11:00:00Z')
+        self.assertEqual(response.data['candidate_email'], 'alice@example.com')
+        first = response.data['id']
+
+        # Same interviewer, another candidate.
+        response = self.book(self.bob, 'Ravi', '2030-01-07T10:30:00Z', 15)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual([c['id'] for c in response.data['conflicts']], [first])
+        # Same candidate through another application, another interviewer.
+        response = self.book(self.apply(self.second_job, 'alice@example.com'), 'Maya', '2030-01-07T09:30:00Z')
+        self.assertEqual(response.status_code, 409)
+        # Back to back is fine, as is overlapping a cancelled interview.
+        self.assertEqual(self.book(self.bob, 'Ravi', '2030-01-07T11:00:00Z').status_code, 201)
+        self.client.patch(f'/api/interviews/{first}/', {'status': 'cancelled'}, format='json')
+        second = self.book(self.bob, 'Ravi', '2030-01-07T09:30:00Z')
+        self.assertEqual(second.status_code, 201)
+        response = self.client.patch(f'/api/interviews/{first}/', {'status': 'scheduled'}, format='json')
+        self.assertEqual(response.status_code, 409)
+        # Moving an interview over its own old slot isn't a conflict.
+        response = self.client.patch(
+            f'/api/interviews/{second.data["id"]}/', {'scheduled_at': '2030-01-07T09:15:00Z'}, format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['ends_at'], '2030-01-07T10:15:00Z')
+
+    def test_validates_duration_and_follows_candidate_email(self):
+        response = self.book(self.alice, 'Ravi', '2030-01-07T10:00:00Z', 24 * 60)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('duration_minutes', response.data)
+        self.book(self.alice, 'Ravi', '2030-01-07T10:00:00Z')
+        self.alice.candidate_email = 'alice@new.example.com'
+        self.alice.save()
+        self.assertEqual(Interview.objects.get().candidate_email, 'alice@new.example.com')
+
+    def test_overlap_check_uses_the_index(self):
+        start = timezone.now()
+        plan = overlapping(start, start + timedelta(hours=1)).filter(interviewer_name='Ravi').explain()
+        self.assertIn('interview_interviewer_idx', plan)
+        plan = overlapping(start, start + timedelta(hours=1)).filter(candidate_email='a@example.com').explain()
+        self.assertIn('interview_candidate_idx', plan)
+
+    def test_free_slots(self):
+        self.book(self.alice, 'Ravi', '2030-01-07T10:00:00Z')
+        self.book(self.bob, 'Maya', '2030-01-07T11:30:00Z', 30)
+        self.book(self.alice, 'Leo', '2030-01-07T13:00:00Z', 30)
+
+        def slots(**params):
+            response = self.client.get('/api/interviews/free-slots/', {
+                'interviewers': 'Ravi,Maya', 'start': '2030-01-07T09:00:00Z', 'duration': 60, 'step': 30,
+                'limit': 4, **params,
+            })
+            self.assertEqual(response.status_code, 200, response.data)
+            return [slot['start'] for slot in response.json()['results']]
+
+        self.assertEqual(slots(), [
+            '2030-01-07T09:00:00Z', '2030-01-07T12:00:00Z', '2030-01-07T12:30:00Z', '2030-01-07T13:00:00Z',
+        ])
+        # Alice is busy with Leo at 13:00.
+        self.assertEqual(slots(application=self.alice.pk)[2:], ['2030-01-07T13:30:00Z', '2030-01-07T14:00:00Z'])
+        # Saturday start: the weekend is skipped unless asked for.
+        self.assertEqual(slots(start='2030-01-05', limit=1), ['2030-01-07T09:00:00Z'])
+        self.assertEqual(slots(start='2030-01-05', limit=1, weekends='true'), ['2030-01-05T09:00:00Z'])
+        self.assertEqual(
+            slots(start='2030-01-07', limit=1, timezone='Asia/Kathmandu', day_start='18:00', day_end='20:00'),
+            ['2030-01-07T18:00:00+05:45'],
+        )
+        response = self.client.get('/api/interviews/free-slots/', {'duration': 0, 'timezone': 'Mars/Base'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('timezone', response.data)
+        response = self.client.get('/api/interviews/free-slots/', {'duration': 0})
+        self.assertEqual(set(response.data), {'interviewers', 'duration'})
+
+
+class SavedJobTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        company = make_company()
+        self.jobs = [make_job(company, title=f'Job {i}') for i in range(4)]
+        self.ids = [job.pk for job in self.jobs]
+        self.candidate = User.objects.create_user('candidate', email='A@example.com')
+        self.client.force_authenticate(self.candidate)
+
+    def bulk(self, **data):
+        return self.client.post('/api/saved-jobs/bulk/', {'candidate_email': 'a@example.com', **data}, format='json')
+
+    def test_bulk_save_and_unsave(self):
+        response = self.bulk(save=self.ids[:3])
+        self.assertEqual(response.data, {'saved': self.ids[:3], 'unsaved': 0})
+        # Already saved jobs are skipped, not duplicated.
+        response = self.bulk(save=self.ids[2:], unsave=self.ids[:1])
+        self.assertEqual(response.data, {'saved': self.ids[3:], 'unsaved': 1})
+        self.assertEqual(
+            sorted(SavedJob.objects.values_list('job_id', flat=True)), self.ids[1:],
+        )
+        response = self.bulk(save=[self.ids[0], 999999])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('999999', str(response.data['save']))
+        response = self.client.get('/api/saved-jobs/', {'candidate': 'a@example.com'})
+        self.assertEqual([row['job'] for row in response.json()['results']], sorted(self.ids[1:], reverse=True))
+
+    def test_lookup_is_one_query(self):
+        self.bulk(save=self.ids[1:3])
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/saved-jobs/lookup/', {
+                'candidate': 'a@example.com', 'jobs': ','.join(map(str, self.ids)),
+            })
+        self.assertEqual(response.data, {'saved': self.ids[1:3]})
+        response = self.client.get('/api/saved-jobs/lookup/', {'candidate': 'nope', 'jobs': 'x'})
+        self.assertEqual(set(response.data), {'candidate', 'jobs'})
+
+    def test_job_list_flags_saved_jobs(self):
+        self.bulk(save=self.ids[:2])
+        with CaptureQueriesContext(connection) as anonymous:
+            response = self.client.get('/api/jobs/')
+        self.assertNotIn('saved', response.json()['results'][0])
+        # One extra indexed query for the whole page.
+        with self.assertNumQueries(len(anonymous) + 1):
+            response = self.client.get('/api/jobs/', {'saved_by': 'a@example.com'})
+        flags = {row['id']: row['saved'] for row in response.json()['results']}
+        self.assertEqual(flags, {pk: pk in self.ids[:2] for pk in self.ids})
+        self.assertEqual(self.client.get('/api/jobs/', {'saved_by': 'bad'}).status_code, 400)
+
+    def test_only_the_candidate_or_staff_sees_saved_jobs(self):
+        self.bulk(save=self.ids[:1])
+        SavedJob.objects.create(candidate_email='b@example.com', job=self.jobs[1])
+        response = self.client.get('/api/saved-jobs/')
+        self.assertEqual([row['candidate_email'] for row in response.json()['results']], ['a@example.com'])
+        other = SavedJob.objects.get(candidate_email='b@example.com')
+        self.assertEqual(self.client.delete(f'/api/saved-jobs/{other.pk}/').status_code, 404)
+        for response in (
+            self.client.post('/api/saved-jobs/', {'candidate_email': 'b@example.com', 'job': self.ids[2]}),
+            self.client.post('/api/saved-jobs/bulk/', {'candidate_email': 'b@example.com', 'save': self.ids[2:]}, format='json'),
+            self.client.get('/api/saved-jobs/lookup/', {'candidate': 'b@example.com', 'jobs': self.ids[1]}),
+            self.client.get('/api/jobs/', {'saved_by': 'b@example.com'}),
+        ):
+            self.assertEqual(response.status_code, 403)
+        self.assertEqual(SavedJob.objects.count(), 2)
+
+        self.client.force_authenticate(None)
+        self.assertIn(self.client.get('/api/saved-jobs/').status_code, (401, 403))
+        self.assertIn(self.client.get('/api/jobs/', {'saved_by': 'a@example.com'}).status_code, (401, 403))
+        self.client.force_authenticate(User.objects.create_user('ops', is_staff=True))
+        self.assertEqual(self.client.get('/api/saved-jobs/').json()['count'], 2)
+
+    def test_saving_only_invalidates_the_candidates_pages(self):
+        self.client.force_authenticate(User.objects.create_user('ops', is_staff=True))
+        self.client.get('/api/jobs/')
+        self.client.get('/api/jobs/', {'saved_by': 'a@example.com'})
+        self.client.get('/api/jobs/', {'saved_by': 'b@example.com'})
+        self.bulk(save=self.ids[:1])
+        self.assertEqual(self.client.get('/api/jobs/')['X-Cache'], 'HIT')
+        self.assertEqual(self.client.get('/api/jobs/', {'saved_by': 'b@example.com'})['X-Cache'], 'HIT')
+        response = self.client.get('/api/jobs/', {'saved_by': 'a@example.com'})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertTrue(response.json()['results'][-1]['saved'])
+        # Single deletes go through the post_delete signal.
+        SavedJob.objects.get().delete()
+        response = self.client.get('/api/jobs/', {'saved_by': 'a@example.com'})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertFalse(response.json()['results'][-1]['saved'])
+
+
+class JobArchivalTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        company = make_company()
+        self.old = make_job(company, title='Old Python Role', status='closed', skills_required='python')
+        self.recent = make_job(company, title='Recent Python Role', status='closed')
+        self.open = make_job(company, title='Open Python Role')
+        Job.objects.filter(pk__in=[self.old.pk, self.open.pk]).update(
+            updated_at=timezone.now() - timedelta(days=400),
+        )
+        self.application = make_application(self.old, 'a@example.com', status='interview')
+        make_application(self.old, 'b@example.com')
+        make_application(self.open, 'a@example.com')
+        Interview.objects.create(
+            application=self.application, interview_type='video', interviewer_name='Ravi',
+            scheduled_at=timezone.now() - timedelta(days=300),
+        )
+        SavedJob.objects.create(job=self.old, candidate_email='a@example.com')
+        skill = Skill.objects.get_or_create(name='python')[0]
+        ApplicationSkill.objects.create(application=self.application, skill=skill)
+
+    def archive(self, *args):
+        out = StringIO()
+        call_command('archive_jobs', *args, stdout=out)
+        return out.getvalue()
+
+    def test_moves_old_closed_jobs_and_dependents(self):
+        self.assertEqual(self.client.get('/api/jobs/').json()['count'], 3)
+        output = self.archive('--batch-size', '1')
+        self.assertIn('Archived 1 jobs, 2 applications, 1 interviews.', output)
+        self.assertIn('jobs_api_job: 3 -> 2 rows', output)
+        self.assertEqual(set(Job.objects.values_list('pk', flat=True)), {self.recent.pk, self.open.pk})
+        self.assertEqual(Application.objects.count(), 1)
+        self.assertFalse(Interview.objects.exists())
+        for model in (SavedJob, ApplicationSkill, ApplicationDailyStat, JobVector):
+            self.assertFalse(model.objects.filter(**(
+                {'application__job_id': self.old.pk} if model is ApplicationSkill else {'job_id': self.old.pk}
+            )).exists(), model)
+        # The open job's counters and stats are untouched.
+        self.assertEqual(recompute_application_counters(), 0)
+        self.assertEqual(ArchivedApplication.objects.get(pk=self.application.pk).job_id, self.old.pk)
+        self.assertEqual(ArchivedInterview.objects.get().application_id, self.application.pk)
+        # Cached listings and search drop the archived job.
+        titles = [job['title'] for job in self.client.get('/api/jobs/', {'search': 'python'}).json()['results']]
+        self.assertEqual(sorted(titles), ['Open Python Role', 'Recent Python Role'])
+        self.assertEqual(self.client.get('/api/jobs/').json()['count'], 2)
+
+    def test_archive_endpoints_are_read_only(self):
+        self.archive()
+        response = self.client.get(f'/api/archived-jobs/{self.old.pk}/')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['title'], 'Old Python Role')
+        self.assertEqual(data['company'], self.old.company_id)
+        self.assertIn('archived_at', data)
+        self.assertIn(self.client.get('/api/archived-applications/').status_code, (401, 403))
+        self.client.force_authenticate(User.objects.create_user('globex'))
+        self.assertEqual(self.client.get('/api/archived-applications/').json()['count'], 0)
+        owner = User.objects.create_user('acme')
+        Company.objects.filter(pk=self.old.company_id).update(user=owner)
+        self.client.force_authenticate(owner)
+        response = self.client.get('/api/archived-applications/', {'candidate': 'a@example.com'})
+        [application] = response.json()['results']
+        self.assertEqual(application['status'], 'interview')
+        self.assertEqual([interview['interviewer_name'] for interview in application['interviews']], ['Ravi'])
+        self.assertEqual(self.client.get('/api/archived-applications/', {'job': self.old.pk}).json()['count'], 2)
+        self.assertEqual(self.client.post('/api/archived-jobs/', {}).status_code, 405)
+        self.assertEqual(self.client.delete(f'/api/archived-jobs/{self.old.pk}/').status_code, 405)
+
+    def test_options(self):
+        self.assertIn('1 jobs would be archived.', self.archive('--dry-run'))
+        self.assertEqual(ArchivedJob.objects.count(), 0)
+        self.archive('--status', 'closed', '--status', 'open', '--older-than', '0', '--limit', '2')
+        self.assertEqual(set(ArchivedJob.objects.values_list('pk', flat=True)), {self.old.pk, self.recent.pk})
+
+
+class AdminScalabilityTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.client.force_login(self.admin)
+        self.company = make_company()
+        self.category = JobCategory.objects.create(name='Ops')
+
+    def add_rows(self, count):
+        start = Job.objects.count()
+        for i in range(count):
+            job = make_job(self.company, title=f'Job {start + i}', category=self.category)
+            make_application(job, f'c{start + i}@example.com')
+
+    def changelist_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [query['sql'] for query in queries]
+
+    def test_changelists_are_constant_cost(self):
+        urls = (
+            '/admin/jobs_api/job/', f'/admin/jobs_api/job/?status__exact=open&category__id__exact={self.category.pk}',
+            '/admin/jobs_api/job/?q=engineer', '/admin/jobs_api/application/',
+            '/admin/jobs_api/application/?status__exact=submitted', '/admin/jobs_api/company/',
+        )
+        self.add_rows(2)
+        small = [len(self.changelist_queries(url)) for url in urls]
+        self.add_rows(60)
+        self.assertEqual([len(self.changelist_queries(url)) for url in urls], small)
+
+    def test_unfiltered_count_uses_statistics(self):
+        self.add_rows(3)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        with mock.patch('jobs_api.admin.ESTIMATE_THRESHOLD', 0):
+            queries = self.changelist_queries('/admin/jobs_api/application/')
+            self.assertFalse([sql for sql in queries if 'COUNT(' in sql.upper()], queries)
+            queries = self.changelist_queries('/admin/jobs_api/application/?status__exact=submitted')
+            self.assertTrue([sql for sql in queries if 'COUNT(' in sql.upper()])
+
+    def test_foreign_keys_are_not_dropdowns(self):
+        self.add_rows(3)
+        for url, table in (('/admin/jobs_api/job/add/', 'jobs_api_company'),
+                           ('/admin/jobs_api/application/add/', 'jobs_api_job')):
+            queries = self.changelist_queries(url)
+            self.assertFalse([sql for sql in queries if table in sql], url)
+        response = self.client.get('/admin/autocomplete/', {
+            'term': 'Ac', 'app_label': 'jobs_api', 'model_name': 'job', 'field_name': 'company',
+        })
+        self.assertEqual([item['text'] for item in response.json()['results']], ['Acme'])
+
+    def test_bulk_status_action_keeps_counters_and_stats(self):
+        other = make_job(self.company, title='Other')
+
+        def reject(count):
+            Application.objects.all().delete()
+            applications = [make_application(other, f'x{i}@example.com') for i in range(count)]
+            applications.append(make_application(make_job(self.company), 'y@example.com', status='accepted'))
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post('/admin/jobs_api/application/', {
+                    'action': 'mark_rejected', '_selected_action': [a.pk for a in applications],
+                })
+            self.assertEqual(response.status_code, 302)
+            return len(queries)
+
+        # The first run creates the "rejected" daily stat rows.
+        reject(1)
+        self.assertEqual(reject(2), reject(20))
+        self.assertEqual(set(Application.objects.values_list('status', flat=True)), {'rejected'})
+        self.assertEqual(recompute_application_counters(), 0)
+        self.assertEqual(Job.objects.get(pk=other.pk).rejected_applications_count, 20)
+        stats = set(ApplicationDailyStat.objects.filter(count__gt=0).values_list('job_id', 'day', 'status', 'count'))
+        rebuild_daily_stats()
+        self.assertEqual(
+            set(ApplicationDailyStat.objects.values_list('job_id', 'day', 'status', 'count')), stats,
+        )
+
+
+class MediaDeliveryTests(APITestCase):
+    body = b'%PDF-1.7\n' + bytes(range(256)) * 40
+
+    def setUp(self):
+        super().setUp()
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name, MEDIA_OFFLOAD=None))
+        self.owner = User.objects.create_user('acme', password='pw')
+        self.company = make_company(user=self.owner)
+        application = make_application(make_job(self.company), cv=SimpleUploadedFile('resume.pdf', self.body))
+        self.url = f'/api/applications/{application.pk}/cv/'
+        self.client.force_authenticate(self.owner)
+
+    def png(self, size):
+        out = io.BytesIO()
+        Image.new('RGB', size, 'red').save(out, 'PNG')
+        return SimpleUploadedFile('logo.png', out.getvalue())
+
+    def test_only_staff_and_the_hiring_company_can_download(self):
+        self.client.force_authenticate(None)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json(), {'detail': 'Authentication credentials were not provided.'})
+        self.client.force_authenticate(User.objects.create_user('globex'))
+        response = self.client.get(self.url, HTTP_ACCEPT='application/pdf')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertIn('detail', response.json())
+        self.client.force_authenticate(User.objects.create_user('ops', is_staff=True))
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        cv = self.client.get('/api/applications/').json()['results'][0]['cv']
+        self.assertEqual(cv, f'http://testserver{self.url}')
+        response = self.client.get(self.url.replace(self.url.split('/')[-3], '0'))
+        self.assertEqual((response.status_code, response['Content-Type']), (404, 'application/json'))
+
+    def test_full_and_partial_downloads(self):
+        response = self.client.get(self.url, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.body)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('attachment; filename="cv-', response['Content-Disposition'])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(self.body)}')
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(b''.join(response.streaming_content), self.body[100:200])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-10')
+        self.assertEqual(b''.join(response.streaming_content), self.body[-10:])
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={len(self.body)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.body)}')
+        # A stale If-Range gets the whole, current file.
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_conditional_get(self):
+        first = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], first['ETag'])
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=http_date(0))
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=first['ETag'])
+        self.assertEqual(response.status_code, 206)
+
+    def test_offloading_to_the_web_server(self):
+        with override_settings(MEDIA_OFFLOAD='x-accel-redirect'):
+            response = self.client.get(self.url)
+        self.assertEqual(response.content, b'')
+        self.assertRegex(response['X-Accel-Redirect'], r'^/protected-media/cvs/.+\.pdf$')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        with override_settings(MEDIA_OFFLOAD='x-sendfile'):
+            response = self.client.get(self.url)
+        self.assertTrue(os.path.isfile(response['X-Sendfile']))
+        with override_settings(MEDIA_OFFLOAD='nginx'), self.assertRaises(ImproperlyConfigured):
+            self.client.get(self.url)
+
+    def test_logo_thumbnails(self):
+        self.company.logo = self.png((800, 400))
+        self.company.save()
+        with Image.open(self.company.logo_thumbnail.path) as thumbnail:
+            self.assertEqual((thumbnail.format, thumbnail.size), ('WEBP', (128, 64)))
+        job = self.client.get('/api/jobs/').json()['results'][0]
+        self.assertEqual(job['company']['logo'], f'http://testserver/media/{self.company.logo_thumbnail.name}')
+
+        response = self.client.get(f'/media/{self.company.logo_thumbnail.name}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=86400')
+        self.assertEqual(self.client.get('/media/company_logos/../cvs/x.pdf').status_code, 404)
+        self.assertEqual(self.client.get('/media/company_logos/missing.png').status_code, 404)
+
+        Company.objects.filter(pk=self.company.pk).update(logo_thumbnail=None)
+        call_command('generate_logo_thumbnails', stdout=StringIO())
+        self.company.refresh_from_db()
+        self.assertTrue(self.company.logo_thumbnail.name.endswith('.webp'))
+        self.company.logo = None
+        self.company.save()
+        self.assertFalse(self.company.logo_thumbnail)
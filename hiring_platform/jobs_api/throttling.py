@@ -0,0 +1,193 @@
+"""
+Token-bucket request throttling.
+
+Rates come from ``REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']`` in DRF's
+``'<requests>/<period>'`` form. A bucket holds up to ``<requests>`` tokens and
+refills continuously at ``<requests> / <period>``, so clients can burst up to
+the limit and are then paced rather than locked out until a window resets.
+Throttled requests get 429 with ``Retry-After`` (DRF's ``Throttled``).
+
+Scopes, each its own bucket:
+
+* ``IPThrottle`` (``ip``) - every request, per client address: ``REMOTE_ADDR``,
+  or the ``X-Forwarded-For`` entry added by the last of ``NUM_PROXIES``
+  trusted proxies. The header itself is never trusted when that is 0.
+* ``TokenThrottle`` (``token``) - authenticated requests, per token (or user
+  for session auth).
+* ``EndpointThrottle`` - per client on expensive endpoints; a view names the
+  scope with ``throttle_scope`` or ``get_throttle_scope(request)``.
+
+Buckets live in the ``THROTTLE_STORE`` backend: ``LocalBucketStore`` (process
+memory, the default) or ``CacheBucketStore`` (the cache backend, shared by
+every worker when it is Redis or Memcached).
+"""
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+@lru_cache(maxsize=None)
+def parse_rate(rate):
+    """``'10/min'`` -> ``(capacity, tokens per second)``."""
+    num, period = rate.split('/')
+    capacity = int(num)
+    return capacity, capacity / PERIODS[period[0]]
+
+
+class LocalBucketStore:
+    """Buckets in process memory; limits are per worker."""
+
+    def __init__(self, max_keys=100_000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, rate, now=None):
+        """Take a token; returns seconds until one is available, 0 if taken."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            wait = 0 if tokens >= 1 else (1 - tokens) / rate
+            self._buckets[key] = (tokens - 1 if not wait else tokens, now)
+            if len(self._buckets) > self.max_keys:
+                # Least recently used first; an evicted bucket restarts full.
+                self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBucketStore:
+    """
+    Buckets in a cache backend, using only ``get``/``add``/``set`` and atomic
+    ``incr``/``decr``. It has no ``clear()``: the alias is usually shared
+    with the response cache and buffered view counts, and buckets expire on
+    their own.
+
+    A bucket is a start time and a count of tokens used. By time ``now`` it
+    has earned ``capacity + (now - start) * rate`` tokens; a request
+    increments the count and is allowed if that stays within what was
+    earned, so concurrent requests from other workers serialize on the
+    increment. A bucket idle long enough to refill past ``capacity`` has its
+    start moved forward so unused time doesn't bank extra tokens. That's one
+    ``get`` and one ``incr`` per request (plus a ``decr`` when refused).
+    """
+    prefix = 'throttle'
+
+    def __init__(self, alias=None):
+        self.alias = alias or getattr(settings, 'THROTTLE_CACHE_ALIAS', 'default')
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def consume(self, key, capacity, rate, now=None):
+        now = time.time() if now is None else now
+        cache = self.cache
+        start_key, used_key = f'{self.prefix}:{key}:start', f'{self.prefix}:{key}:used'
+        # incr() doesn't extend the expiry, so a busy bucket restarts full once
+        # per timeout; at least an hour keeps that extra burst negligible.
+        timeout = max(math.ceil(2 * capacity / rate), 3600)
+        start = cache.get(start_key)
+        if start is None:
+            if cache.add(start_key, now, timeout):
+                cache.set(used_key, 0, timeout)
+            start = cache.get(start_key, now)
+        try:
+            used = cache.incr(used_key)
+        except ValueError:
+            # Evicted since the read; start over with a full bucket.
+            cache.set_many({start_key: now, used_key: 1}, timeout)
+            return 0
+        if capacity + (now - start) * rate - (used - 1) > capacity:
+            start = now - (used - 1) / rate
+            cache.set(start_key, start, timeout)
+        earned = capacity + (now - start) * rate
+        if used <= earned:
+            return 0
+        cache.decr(used_key)
+        return (used - earned) / rate
+
+
+@lru_cache(maxsize=None)
+def _load_store(path):
+    return import_string(path)()
+
+
+def get_throttle_store():
+    return _load_store(getattr(settings, 'THROTTLE_STORE', 'jobs_api.throttling.LocalBucketStore'))
+
+
+class TokenBucketThrottle(BaseThrottle):
+    scope = None
+
+    def get_scope(self, request, view):
+        return self.scope
+
+    def get_key(self, request, view):
+        """Bucket key within the scope, or ``None`` to skip throttling."""
+        return self.get_ident(request)
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(request, view)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope) if scope else None
+        key = self.get_key(request, view) if rate else None
+        if key is None:
+            return True
+        capacity, refill = parse_rate(rate)
+        self._wait = get_throttle_store().consume(f'{scope}:{key}', capacity, refill)
+        return not self._wait
+
+    def wait(self):
+        return self._wait
+
+
+class IPThrottle(TokenBucketThrottle):
+    scope = 'ip'
+
+
+class TokenThrottle(TokenBucketThrottle):
+    scope = 'token'
+
+    def get_key(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return None
+        token = getattr(request.auth, 'key', None)
+        if not token:
+            return f'user-{request.user.pk}'
+        # Hashed so the cache (and anything that can read it) never sees a credential.
+        return 'key-' + hashlib.sha256(token.encode()).hexdigest()
+
+
+class EndpointThrottle(TokenBucketThrottle):
+    def get_scope(self, request, view):
+        get_scope = getattr(view, 'get_throttle_scope', None)
+        return get_scope(request) if get_scope else getattr(view, 'throttle_scope', None)
+
+
+def throttle_wait(request, *scopes):
+    """
+    Seconds ``request`` must wait under the first of ``scopes`` that refuses
+    it, or 0; for non-DRF views. Later scopes aren't charged once one refuses,
+    as with a view's throttle classes.
+    """
+    for scope in scopes:
+        throttle = TokenBucketThrottle()
+        throttle.scope = scope
+        if not throttle.allow_request(request, None):
+            return throttle.wait()
+    return 0
@@ -0,0 +1,125 @@
+"""
+Streaming CV uploads.
+
+``CVUploadHandler`` spools each uploaded file to a temporary file chunk by
+chunk (never holding it in memory), rejects oversized or unexpected files as
+soon as the offending bytes arrive, and computes a SHA-256 of the content on
+the way through. ``cv_upload_to`` turns that hash into a content-addressed
+path and ``ContentAddressedStorage`` skips writing files it already has, so
+identical CVs are stored once.
+"""
+import hashlib
+import os
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+# Leading bytes of each allowed format. Plain text has no signature and is
+# instead checked for NUL bytes.
+CV_SIGNATURES = {
+    'pdf': (b'%PDF-',),
+    'docx': (b'PK\x03\x04',),
+    'doc': (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',),
+}
+CV_EXTENSIONS = ('pdf', 'doc', 'docx', 'txt')
+# Room for the non-file form fields in a multipart body.
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+
+def cv_max_bytes():
+    return getattr(settings, 'CV_UPLOAD_MAX_BYTES', 10 * 1024 * 1024)
+
+
+class UploadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = 'Uploaded file is too large.'
+    default_code = 'upload_too_large'
+
+
+def extension(filename):
+    return os.path.splitext(filename or '')[1].lower().lstrip('.')
+
+
+def check_signature(ext, head):
+    if ext == 'txt':
+        return b'\x00' not in head
+    return any(head.startswith(signature) for signature in CV_SIGNATURES.get(ext, ()))
+
+
+class CVUploadHandler(TemporaryFileUploadHandler):
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.max_bytes = cv_max_bytes()
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # Refuse before reading a single byte when the client declares the size.
+        if content_length and content_length > self.max_bytes + FORM_OVERHEAD_BYTES:
+            raise UploadTooLarge(f'Request body exceeds {self.max_bytes} bytes.')
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        ext = extension(file_name)
+        if ext not in CV_EXTENSIONS:
+            raise ValidationError({field_name: [
+                f'Unsupported file type; allowed: {", ".join(CV_EXTENSIONS)}.'
+            ]})
+        self.ext = ext
+        self.hasher = hashlib.sha256()
+        self.received = 0
+        super().new_file(field_name, file_name, *args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        if start == 0 and not check_signature(self.ext, raw_data[:16]):
+            raise ValidationError({self.field_name: [
+                f'File content does not look like a .{self.ext} file.'
+            ]})
+        self.received += len(raw_data)
+        if self.received > self.max_bytes:
+            raise UploadTooLarge(f'File exceeds {self.max_bytes} bytes.')
+        self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        uploaded.sha256 = self.hasher.hexdigest()
+        return uploaded
+
+
+def file_sha256(file):
+    digest = getattr(file, 'sha256', None)
+    if digest:
+        return digest
+    hasher = hashlib.sha256()
+    for chunk in file.chunks():
+        hasher.update(chunk)
+    file.seek(0)
+    return hasher.hexdigest()
+
+
+def cv_upload_to(instance, filename):
+    digest = file_sha256(instance.cv.file)
+    ext = extension(filename)
+    return f'cvs/sha256/{digest[:2]}/{digest[2:4]}/{digest}.{ext}'
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Names are content hashes, so an existing name already holds the bytes."""
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def _save(self, name, content):
+        if self.exists(name):
+            return name
+        # Concurrent uploads of the same CV race to the same name; writing
+        # aside and renaming over is safe because both hold identical bytes.
+        partial = super()._save(f'{name}.{uuid.uuid4().hex}.part', content)
+        os.replace(self.path(partial), self.path(name))
+        return name
+
+
+def cv_storage():
+    return ContentAddressedStorage()
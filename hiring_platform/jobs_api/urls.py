@@ -1,11 +1,24 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import async_views
 from .views import *
 
 router = DefaultRouter()
 router.register('categories', JobCategoryViewSet)
 router.register('companies', CompanyViewSet)
+router.register('jobs', JobViewSet)
+router.register('applications', ApplicationViewSet)
+router.register('interviews', InterviewViewSet)
+router.register('saved-jobs', SavedJobViewSet)
+router.register('archived-jobs', ArchivedJobViewSet)
+router.register('archived-applications', ArchivedApplicationViewSet)
 
 urlpatterns = [
+    path('async/jobs/', async_views.job_list),
+    path('async/jobs/<int:pk>/', async_views.job_detail),
+    path('async/categories/', async_views.category_list),
+    path('async/recent-jobs/', async_views.recent_jobs),
+    path('recent-jobs/', RecentJobsView.as_view()),
+    path('recent-jobs/stream/', recent_jobs_stream),
     path('', include(router.urls)),
 ]
@@ -1,19 +1,615 @@
+import codecs
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.conf import settings
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from django.db.models import Count, Q
 from rest_framework import viewsets
-from .models import JobCategory, Company, Job, Application
+from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter
+from rest_framework.exceptions import (
+    NotAuthenticated, PermissionDenied, Throttled, UnsupportedMediaType, ValidationError,
+)
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import BasePermission
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .models import (
+    JobCategory, Company, Job, Application, Interview, SavedJob, ArchivedApplication, ArchivedJob,
+)
 from .serializers import *
+from .bulk import (
+    APPLICATION_EXPORT_FIELDS, CONTENT_TYPES, FORMATS, JOB_EXPORT_FIELDS, export_rows,
+    format_for, import_jobs,
+)
+from .cache import CachedResponseMixin
+from .counters import view_counter
+from .metrics import registry as metrics_registry
+from .queue import enqueue
+from .recent import RecentJobsStream, recent_jobs, with_request
+from .scheduling import (
+    DAY_END, DAY_START, check_availability, free_slots as find_free_slots, lock_schedules, max_duration,
+)
+from .media import serve_file
+from .renderers import ORJSONRenderer, PassthroughRenderer
+from .saved import (
+    acts_for, cache_namespace as saved_cache_namespace, save_jobs, saved_job_ids, unsave_jobs,
+)
+from .similarity import similar_jobs_index
+from .stats import ApplicationStats
+from .throttling import throttle_wait
+from .uploads import CVUploadHandler
+from .values import ValuesSerializer
+from .filters import (
+    ApplicationFilterBackend, ApplicationSkillFilter, ArchivedApplicationFilterBackend,
+    ArchivedJobFilterBackend, FREE_SLOT_PARAMS, InterviewFilterBackend, JobFilterBackend,
+    JobSearchFilter, STATS_PARAMS, SavedJobFilterBackend, job_facets, parse_bool, parse_email,
+    parse_id_list, parse_int, parse_query_params,
+)
+from .pagination import ListPagination
+
+READ_ACTIONS = ('list', 'retrieve', 'jobs')
+WRITE_ACTIONS = ('create', 'update', 'partial_update', 'destroy', 'bulk')
+
+class ThrottleScopeMixin:
+    """Per-endpoint throttle scopes (see ``jobs_api/throttling.py``) by action."""
+
+    throttle_scopes = {**dict.fromkeys(WRITE_ACTIONS, 'writes'), 'export': 'exports'}
+
+    def get_throttle_scope(self, request):
+        return self.throttle_scopes.get(self.action)
+
+class ReadOptimizedMixin:
+    """
+    Swaps in ``read_serializer_class`` and its eager-loaded queryset for reads.
+    With ``values_list`` set, ``list`` skips model instances and serializes
+    ``values_list()`` rows instead (``jobs_api/values.py``).
+    """
+
+    read_serializer_class = None
+    values_list = False
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in READ_ACTIONS:
+            queryset = self.read_serializer_class.optimize_queryset(queryset)
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action in READ_ACTIONS:
+            return self.read_serializer_class
+        return super().get_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        if not self.values_list:
+            return super().list(request, *args, **kwargs)
+        serializer = ValuesSerializer(self.read_serializer_class, context=self.get_serializer_context())
+        rows = serializer.rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(rows))
+
+class ExportMixin:
+    """
+    ``/<resource>/export/?file_format=csv|jsonl`` streaming the filtered rows.
+    ``export_permission_classes``, when set, replace the view's permissions
+    for the export, and ``get_export_queryset`` can narrow what it covers.
+    """
 
-class JobCategoryViewSet(viewsets.ModelViewSet):
-    queryset = JobCategory.objects.all()
+    export_fields = ()
+    export_permission_classes = None
+
+    def get_permissions(self):
+        if self.action == 'export' and self.export_permission_classes is not None:
+            return [permission() for permission in self.export_permission_classes]
+        return super().get_permissions()
+
+    def get_export_queryset(self):
+        return self.get_queryset()
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        fmt = request.query_params.get('file_format') or 'csv'
+        if fmt not in FORMATS:
+            raise ValidationError({'file_format': [f'must be one of: {", ".join(FORMATS)}']})
+        queryset = self.filter_queryset(self.get_export_queryset())
+        response = StreamingHttpResponse(
+            export_rows(queryset, self.export_fields, fmt), content_type=CONTENT_TYPES[fmt],
+        )
+        response['Content-Disposition'] = f'attachment; filename="{self.basename}s.{fmt}"'
+        return response
+
+class NestedJobsMixin:
+    """``/<parent>/{id}/jobs/`` listing the parent's jobs, paginated and eager-loaded."""
+
+    jobs_lookup = None
+
+    @action(detail=True, methods=['get'])
+    def jobs(self, request, pk=None):
+        queryset = JobReadSerializer.optimize_queryset(Job.objects.filter(**{self.jobs_lookup: pk}))
+        paginator = ListPagination()
+        # Nested job lists share JobViewSet's keyset ordering.
+        page = paginator.paginate_queryset(queryset, request, view=JobViewSet)
+        serializer = JobReadSerializer(page, many=True, context=self.get_serializer_context())
+        return paginator.get_paginated_response(serializer.data)
+
+class JobCategoryViewSet(CachedResponseMixin, ThrottleScopeMixin, NestedJobsMixin, viewsets.ModelViewSet):
+    queryset = JobCategory.objects.annotate(jobs_count=Count('jobs')).order_by('name')
     serializer_class = JobCategorySerializer
+    pagination_class = ListPagination
+    jobs_lookup = 'category_id'
+    cache_namespaces = ('categories', 'jobs')
 
-class CompanyViewSet(viewsets.ModelViewSet):
-    queryset = Company.objects.all()
+class CompanyViewSet(ThrottleScopeMixin, NestedJobsMixin, viewsets.ModelViewSet):
+    queryset = Company.objects.annotate(
+        jobs_count=Count('jobs'),
+        active_jobs=Count('jobs', filter=Q(jobs__status='open')),
+    ).order_by('-created_at')
     serializer_class = CompanySerializer
+    pagination_class = ListPagination
+    jobs_lookup = 'company_id'
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        company = self.get_object()
+        params = parse_query_params(request.query_params, STATS_PARAMS)
+        bucket = params.pop('bucket', 'day')
+        params.pop('company', None)
+        stats = ApplicationStats(company=company.pk, **params)
+        breakdown = stats.breakdown()
+        by_status = breakdown['by_status']
+        return Response({
+            'total_jobs': company.jobs_count,
+            'active_jobs': company.active_jobs,
+            'total_applications': breakdown['total'],
+            'pending_applications': sum(
+                count for status, count in by_status.items()
+                if Application.STATUS_COUNTERS[status] == 'pending_applications_count'
+            ),
+            **breakdown,
+            'jobs': stats.funnels(),
+            'timeline': stats.timeline(bucket),
+        })
 
-class JobViewSet(viewsets.ModelViewSet):
+class JobViewSet(CachedResponseMixin, ThrottleScopeMixin, ReadOptimizedMixin, ExportMixin, viewsets.ModelViewSet):
     queryset = Job.objects.all()
     serializer_class = JobSerializer
+    read_serializer_class = JobReadSerializer
+    values_list = True
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    filter_backends = [JobFilterBackend, JobSearchFilter, OrderingFilter]
+    pagination_class = ListPagination
+    keyset_ordering = ('-created_at', '-id')
+    cache_namespaces = ('jobs', 'companies', 'categories')
+    cached_actions = ('list', 'retrieve', 'similar')
+    export_fields = JOB_EXPORT_FIELDS
+
+    def get_throttle_scope(self, request):
+        if self.action == 'list' and request.query_params.get('search'):
+            return 'search'
+        return super().get_throttle_scope(request)
+
+    def saved_by(self, request):
+        """The candidate email from ``?saved_by=``, whose saved jobs get flagged in lists."""
+        raw = request.query_params.get('saved_by', '').strip()
+        if not raw or self.action != 'list':
+            return None
+        try:
+            email = parse_email(raw)
+        except ValueError as exc:
+            raise ValidationError({'saved_by': [str(exc)]})
+        # Runs before the response cache is consulted (get_cache_namespaces).
+        check_candidate(request, email)
+        return email
 
-class ApplicationViewSet(viewsets.ModelViewSet):
+    def get_cache_namespaces(self, request):
+        email = self.saved_by(request)
+        if email is None:
+            return self.cache_namespaces
+        return (*self.cache_namespaces, saved_cache_namespace(email))
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        # Unknown ids raise 404 above, so only real jobs reach the buffer.
+        view_counter.record(int(kwargs['pk']))
+        return response
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Create (rows without ``id``) or update jobs from a CSV / JSON-lines
+        body. Returns ``created``, ``updated`` and per-line ``errors``.
+        """
+        fmt = format_for(request.content_type)
+        if fmt is None:
+            raise UnsupportedMediaType(request.content_type)
+        try:
+            batch_size = min(max(parse_int(request.query_params.get('batch_size') or '1000'), 1), 5000)
+        except ValueError as exc:
+            raise ValidationError({'batch_size': [str(exc)]})
+        # Read from the body stream line by line; it is never buffered whole.
+        # Each chunk commits on its own, so a failed chunk is reported in the
+        # summary while the others stay written.
+        lines = codecs.iterdecode(request.stream or (), 'utf-8')
+        return Response(import_jobs(lines, fmt, batch_size))
+
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        return self.handle_cached(self.similar_jobs, request, pk=pk)
+
+    def similar_jobs(self, request, pk=None):
+        try:
+            limit = min(max(parse_int(request.query_params.get('limit') or '10'), 1), 50)
+        except ValueError as exc:
+            raise ValidationError({'limit': [str(exc)]})
+        job = get_object_or_404(Job.objects.only('id'), pk=pk)
+        scores = dict(similar_jobs_index.similar(job.pk, limit))
+        # Jobs closed or deleted since the index last synced drop out here.
+        jobs = JobReadSerializer.optimize_queryset(Job.objects.filter(pk__in=scores, status='open'))
+        jobs = sorted(jobs, key=lambda job: -scores[job.pk])
+        data = JobReadSerializer(jobs, many=True, context=self.get_serializer_context()).data
+        for item in data:
+            item['similarity'] = round(scores[item['id']], 4)
+        return Response(data)
+
+    def get_paginated_response(self, data):
+        email = self.saved_by(self.request)
+        if email is not None:
+            # One indexed query for the whole page.
+            saved = saved_job_ids(email, [item['id'] for item in data])
+            for item in data:
+                item['saved'] = item['id'] in saved
+        response = super().get_paginated_response(data)
+        if self.include_facets(response.data):
+            response.data['facets'] = job_facets(self.filter_queryset(self.get_queryset()))
+        return response
+
+    def include_facets(self, page):
+        """
+        Facets are a GROUP BY over the whole filtered set, so by default they
+        come with the count: not on keyset or ``?count=false`` pages, where
+        the point is to skip that O(N) work. ``?facets=true|false`` overrides.
+        """
+        raw = self.request.query_params.get('facets', '').strip()
+        if not raw:
+            return 'count' in page
+        try:
+            return parse_bool(raw)
+        except ValueError as exc:
+            raise ValidationError({'facets': [str(exc)]})
+
+class RecentJobsView(APIView):
+    """Newest open jobs as a plain list, from the in-process buffer."""
+
+    def get(self, request):
+        try:
+            limit = min(max(parse_int(request.query_params.get('limit') or '10'), 1), recent_jobs.size)
+        except ValueError as exc:
+            raise ValidationError({'limit': [str(exc)]})
+        return Response(with_request(recent_jobs.jobs(limit), request))
+
+
+def recent_jobs_stream(request):
+    """Server-Sent Events feed of newly posted jobs (ASGI only)."""
+    if not isinstance(request, ASGIRequest):
+        # Each client would hold a WSGI worker thread for the whole stream.
+        return JsonResponse({'detail': 'The job stream requires an ASGI server.'}, status=501)
+    wait = throttle_wait(request, 'ip')
+    if wait:
+        exc = Throttled(wait)
+        response = JsonResponse({'detail': exc.detail}, status=429)
+        response['Retry-After'] = str(exc.wait)
+        return response
+    response = StreamingHttpResponse(RecentJobsStream(request).__aiter__(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+class IsStaffOrCompanyUser(BasePermission):
+    """Staff, or a user who runs a company."""
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated and (user.is_staff or hasattr(user, 'company')))
+
+
+class CanDownloadCV(BasePermission):
+    """Staff, or the user of the company the application was sent to."""
+
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated)
+
+    def has_object_permission(self, request, view, obj):
+        return request.user.is_staff or obj.job.company.user_id == request.user.pk
+
+
+class ApplicationViewSet(ThrottleScopeMixin, ReadOptimizedMixin, ExportMixin, viewsets.ModelViewSet):
     queryset = Application.objects.all()
     serializer_class = ApplicationSerializer
+    read_serializer_class = ApplicationReadSerializer
+    values_list = True
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    filter_backends = [ApplicationFilterBackend, ApplicationSkillFilter, OrderingFilter]
+    pagination_class = ListPagination
+    keyset_ordering = ('-submitted_at', '-id')
+    upload_handler_classes = [CVUploadHandler]
+    export_fields = APPLICATION_EXPORT_FIELDS
+    # Exports carry every applicant's contact details.
+    export_permission_classes = [IsStaffOrCompanyUser]
+    # Throttled before the multipart body (and its CV) is read.
+    throttle_scopes = {**ThrottleScopeMixin.throttle_scopes, 'create': 'applications'}
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        params = parse_query_params(request.query_params, STATS_PARAMS)
+        bucket = params.pop('bucket', 'day')
+        stats = ApplicationStats(**params)
+        return Response({**stats.breakdown(), 'timeline': stats.timeline(bucket)})
+
+    @action(detail=True, methods=['get'], renderer_classes=[PassthroughRenderer], permission_classes=[CanDownloadCV])
+    def cv(self, request, pk=None):
+        """The application's CV, with range and conditional request support (see ``jobs_api/media.py``)."""
+        application = get_object_or_404(Application.objects.select_related('job__company').only(
+            'cv', 'job__company__user_id',
+        ), pk=pk)
+        self.check_object_permissions(request, application)
+        if not application.cv:
+            raise Http404
+        name = application.cv.name
+        filename = f'cv-{application.pk}.{name.rsplit(".", 1)[-1]}' if '.' in name else f'cv-{application.pk}'
+        return serve_file(request, application.cv.storage, name, filename=filename, attachment=True)
+
+    def get_export_queryset(self):
+        queryset = super().get_export_queryset()
+        if self.request.user.is_staff:
+            return queryset
+        return queryset.filter(job__company__user=self.request.user)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # Errors from the download action (401/403/404) are DRF responses, not files.
+        if getattr(response, 'exception', False) and isinstance(
+            getattr(request, 'accepted_renderer', None), PassthroughRenderer,
+        ):
+            request.accepted_renderer, request.accepted_media_type = ORJSONRenderer(), ORJSONRenderer.media_type
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    def initialize_request(self, request, *args, **kwargs):
+        # Must be swapped in before anything touches request.POST/FILES.
+        request.upload_handlers = [handler(request) for handler in self.upload_handler_classes]
+        return super().initialize_request(request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+        # Side effects are queued with the row, so the response doesn't wait on them.
+        with transaction.atomic():
+            application = serializer.save()
+            enqueue(
+                'notify_company_of_application', {'application_id': application.pk},
+                idempotency_key=f'application-created:{application.pk}',
+            )
+            enqueue(
+                'extract_cv_skills', {'application_id': application.pk},
+                idempotency_key=f'application-skills:{application.pk}',
+            )
+
+    def perform_update(self, serializer):
+        # Counters move from the status being replaced, so take it from the
+        # locked row: two requests working from the same loaded status would
+        # otherwise both decrement its counter.
+        with transaction.atomic():
+            current = Application.objects.select_for_update().only('job_id', 'status').get(
+                pk=serializer.instance.pk,
+            )
+            serializer.instance._loaded_counter_state = (current.job_id, current.status)
+            serializer.save()
+
+
+def check_candidate(request, email):
+    """Refuse unless the request may see or change ``email``'s saved jobs."""
+    if not request.user or not request.user.is_authenticated:
+        raise NotAuthenticated
+    if not acts_for(request.user, email):
+        raise PermissionDenied('You can only use your own saved jobs.')
+
+
+class IsSavingCandidate(BasePermission):
+    """Signed-in users, for their own saved jobs; staff for anyone's."""
+
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated)
+
+    def has_object_permission(self, request, view, obj):
+        return acts_for(request.user, obj.candidate_email)
+
+
+class SavedJobViewSet(ThrottleScopeMixin, viewsets.ModelViewSet):
+    """A candidate's saved jobs; ``bulk`` saves and unsaves many, ``lookup`` checks a page of ids."""
+
+    queryset = SavedJob.objects.order_by('-saved_at', '-id')
+    serializer_class = SavedJobSerializer
+    permission_classes = [IsSavingCandidate]
+    filter_backends = [SavedJobFilterBackend]
+    pagination_class = ListPagination
+    keyset_ordering = ('-saved_at', '-id')
+    http_method_names = ['get', 'post', 'delete', 'head', 'options']
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        user = self.request.user
+        if user.is_staff:
+            return queryset
+        return queryset.filter(candidate_email__iexact=user.email) if user.email else queryset.none()
+
+    def perform_create(self, serializer):
+        check_candidate(self.request, serializer.validated_data['candidate_email'])
+        serializer.save()
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        serializer = SavedJobBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        check_candidate(request, data['candidate_email'])
+        with transaction.atomic():
+            removed = unsave_jobs(data['candidate_email'], data['unsave'])
+            added = save_jobs(data['candidate_email'], data['save'])
+        return Response({'saved': added, 'unsaved': removed})
+
+    @action(detail=False, methods=['get'])
+    def lookup(self, request):
+        """``?candidate=&jobs=1,2,3``: which of the jobs the candidate has saved."""
+        errors = {}
+        params = {}
+        for name, parser in (('candidate', parse_email), ('jobs', parse_id_list)):
+            try:
+                params[name] = parser(request.query_params.get(name, '').strip())
+            except ValueError as exc:
+                errors[name] = [str(exc)]
+        if errors:
+            raise ValidationError(errors)
+        check_candidate(request, params['candidate'])
+        return Response({'saved': sorted(saved_job_ids(params['candidate'], params['jobs']))})
+
+
+class ArchivedJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """Jobs moved out by ``manage.py archive_jobs``, as they were when archived."""
+
+    queryset = ArchivedJob.objects.all()
+    serializer_class = ArchivedJobSerializer
+    filter_backends = [ArchivedJobFilterBackend]
+    pagination_class = ListPagination
+    keyset_ordering = ('-created_at', '-id')
+
+
+class CanViewArchivedApplication(CanDownloadCV):
+    """The snapshots hold candidate details, so the CV policy applies: staff or the job's company."""
+
+
+class ArchivedApplicationViewSet(viewsets.ReadOnlyModelViewSet):
+    """Archived applications with their interviews; ``?job=`` lists one archived job's."""
+
+    queryset = ArchivedApplication.objects.prefetch_related('interviews')
+    serializer_class = ArchivedApplicationSerializer
+    filter_backends = [ArchivedApplicationFilterBackend]
+    pagination_class = ListPagination
+    keyset_ordering = ('-submitted_at', '-id')
+    permission_classes = [CanViewArchivedApplication]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.user.is_staff:
+            return queryset
+        return queryset.filter(job__company__user=self.request.user)
+
+
+class InterviewViewSet(ThrottleScopeMixin, viewsets.ModelViewSet):
+    """Interviews; bookings that overlap the interviewer's or candidate's others get 409."""
+
+    queryset = Interview.objects.all()
+    serializer_class = InterviewSerializer
+    filter_backends = [InterviewFilterBackend, OrderingFilter]
+    pagination_class = ListPagination
+    max_slot_search_days = 90
+
+    def perform_create(self, serializer):
+        self.book(serializer)
+
+    def perform_update(self, serializer):
+        self.book(serializer)
+
+    def book(self, serializer):
+        instance = serializer.instance
+        if instance is None:
+            instance = Interview(duration_minutes=Interview._meta.get_field('duration_minutes').default)
+        data = {
+            name: serializer.validated_data.get(name, getattr(instance, name, None))
+            for name in ('application', 'interviewer_name', 'scheduled_at', 'duration_minutes', 'status')
+        }
+        with transaction.atomic():
+            if data['status'] != 'cancelled':
+                start = data['scheduled_at']
+                end = start + timedelta(minutes=data['duration_minutes'])
+                candidate = data['application'].candidate_email
+                lock_schedules([data['interviewer_name']], [candidate])
+                check_availability(start, end, data['interviewer_name'], candidate, exclude=instance.pk)
+            serializer.save()
+
+    @action(detail=False, methods=['get'], url_path='free-slots')
+    def free_slots(self, request):
+        """
+        ``?interviewers=A,B[&application=]&start=&end=&duration=&step=&limit=``
+        ``&day_start=09:00&day_end=17:00&timezone=&weekends=false``: the next open
+        windows when every interviewer (and the application's candidate) is free.
+        """
+        params = parse_query_params(request.query_params, FREE_SLOT_PARAMS)
+        errors = {}
+        interviewers = params.pop('interviewers', None)
+        if not interviewers:
+            errors['interviewers'] = ['required: comma-separated interviewer names']
+        tz = params.setdefault('tz', timezone.get_current_timezone())
+        for name in ('start', 'end'):
+            if name in params and timezone.is_naive(params[name]):
+                params[name] = timezone.make_aware(params[name], tz)
+        start = params.pop('start', None) or timezone.now()
+        end = params.pop('end', None) or start + timedelta(days=14)
+        if not start < end <= start + timedelta(days=self.max_slot_search_days):
+            errors['end'] = [f'must be after start and at most {self.max_slot_search_days} days later']
+        limit_minutes = int(max_duration().total_seconds() // 60)
+        duration = params.pop('duration', 30)
+        step = params.pop('step', None)
+        if not 1 <= duration <= limit_minutes:
+            errors['duration'] = [f'must be between 1 and {limit_minutes} minutes']
+        if step is not None and step < 1:
+            errors['step'] = ['must be at least 1 minute']
+        if params.get('day_start', DAY_START) >= params.get('day_end', DAY_END):
+            errors['day_end'] = ['must be after day_start']
+        params['limit'] = min(max(params.get('limit', 10), 1), 100)
+        application = params.pop('application', None)
+        candidate = None
+        if application is not None:
+            candidate = (
+                Application.objects.filter(pk=application).values_list('candidate_email', flat=True).first()
+            )
+            if candidate is None:
+                errors['application'] = ['no such application']
+        if errors:
+            raise ValidationError(errors)
+        slots = find_free_slots(
+            interviewers, start, end, timedelta(minutes=duration),
+            step=timedelta(minutes=step) if step else None, candidate_email=candidate, **params,
+        )
+        return Response({'results': slots})
+
+
+def company_logo(request, path):
+    """Public company logos and thumbnails; CVs are only served through ``ApplicationViewSet.cv``."""
+    name = f'company_logos/{path}'
+    if '..' in path.split('/') or '\\' in path:
+        raise Http404
+    return serve_file(request, default_storage, name, cache_control='public, max-age=86400')
+
+
+def _check_metrics_access(request):
+    if not getattr(settings, 'METRICS_ENABLED', False):
+        raise Http404
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token and not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        raise Http404
+
+
+def metrics(request):
+    """Prometheus scrape endpoint for this process."""
+    _check_metrics_access(request)
+    return HttpResponse(metrics_registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def slow_queries(request):
+    _check_metrics_access(request)
+    return JsonResponse({'results': list(reversed(metrics_registry.slow_queries))})